@@ -0,0 +1,286 @@
+# ============================================================================
+# NYZTRADE - BRSR BATCH INGESTION
+# Parse a directory of BRSR PDFs into one table of ESG inputs
+# ============================================================================
+
+"""
+Batch BRSR ingestion
+
+Walks a directory for PDFs, parses them across a process pool with
+EnhancedBRSRParser and writes one row per report (to_esg_input() values,
+the comma-separated fallback_metrics that were not found, plus extraction
+metadata) to Parquet or CSV.
+
+The parser does not classify companies, so the industry (and sector) of
+each row comes from an optional --industry-map CSV with an industry column
+and one of cin / file / company_name to match rows on.
+
+Every finished file is appended to a JSONL manifest as soon as it
+completes, so an interrupted run picks up where it stopped. Files already
+in the manifest with the same size and modification time are not parsed
+again.
+
+Usage:
+    python brsr_batch_ingest.py filings/ -o brsr_inputs.parquet --workers 8 --industry-map industries.csv
+"""
+
+import os
+import sys
+import json
+import time
+import hashlib
+import sqlite3
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from brsr_pdf_parser import EnhancedBRSRParser, ParseCache, PARSER_VERSION, PDF_PARSER_AVAILABLE
+
+
+# ============================================================================
+# MANIFEST
+# ============================================================================
+
+def find_pdfs(root: str) -> List[str]:
+    """All PDF files under root, sorted for a stable processing order"""
+    pdfs = []
+    for dirpath, _, filenames in os.walk(root):
+        for name in filenames:
+            if name.lower().endswith('.pdf'):
+                pdfs.append(os.path.join(dirpath, name))
+    return sorted(pdfs)
+
+
+def file_key(path: str) -> Dict:
+    """Identity of a file for resume checks (path, size, mtime)"""
+    stat = os.stat(path)
+    return {'path': os.path.abspath(path), 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+def load_manifest(manifest_path: str) -> Dict[str, Dict]:
+    """Latest manifest entry per file path (later lines win)"""
+    entries = {}
+    if not os.path.exists(manifest_path):
+        return entries
+    with open(manifest_path, encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # partial line from an interrupted write
+            entries[entry['path']] = entry
+    return entries
+
+
+def is_done(entry: Optional[Dict], key: Dict, retry_failed: bool = True) -> bool:
+    """Whether a manifest entry covers the current version of a file"""
+    if entry is None or entry.get('parser_version') != PARSER_VERSION:
+        return False
+    if entry['size'] != key['size'] or entry['mtime_ns'] != key['mtime_ns']:
+        return False
+    return entry['status'] == 'ok' or not retry_failed
+
+
+# ============================================================================
+# WORKER
+# ============================================================================
+
+_parser: Optional[EnhancedBRSRParser] = None
+
+
+def _init_worker(cache_path: Optional[str], streaming: bool = False):
+    """Process pool initializer: one parser (and parse cache connection) per worker"""
+    global _parser
+    cache = None
+    if cache_path:
+        try:
+            cache = ParseCache(cache_path)
+        except sqlite3.Error as e:
+            print(f"⚠️ Parse cache unavailable in worker {os.getpid()}, parsing without it: {e}")
+    _parser = EnhancedBRSRParser(cache=cache, streaming=streaming)
+
+
+def _ingest_one(key: Dict) -> Dict:
+    """Parse one PDF and return its manifest entry"""
+    entry = dict(key, parser_version=PARSER_VERSION, finished_at=datetime.now().isoformat())
+    start = time.perf_counter()
+    try:
+        with open(key['path'], 'rb') as f:
+            pdf_bytes = f.read()
+        data = _parser.parse_from_bytes(pdf_bytes, os.path.basename(key['path']))
+
+        row = {
+            'file': os.path.basename(key['path']),
+            'sha256': hashlib.sha256(pdf_bytes).hexdigest(),
+            'company_name': data.company_name,
+            'cin': data.cin,
+            'year': data.year,
+            'report_type': data.report_type.value,
+            'turnover': data.turnover,
+            'pages_processed': data.pages_processed,
+            'metrics_found': data.metrics_found,
+            'extraction_confidence': round(data.extraction_confidence, 2),
+        }
+        esg_input, fallbacks = data.to_esg_input_with_fallbacks()
+        row.update(esg_input)
+        # Inputs that were not found in the report and hold a fallback value
+        row['fallback_metrics'] = ','.join(fallbacks)
+        entry.update(status='ok', row=row)
+    except Exception as e:
+        entry.update(status='error', error=f"{type(e).__name__}: {e}")
+    entry['seconds'] = round(time.perf_counter() - start, 3)
+    return entry
+
+
+# ============================================================================
+# BATCH INGESTION
+# ============================================================================
+
+# Industry map columns rows are matched on, in order of preference
+INDUSTRY_MAP_KEYS = ['cin', 'file', 'company_name']
+
+
+def _map_key(value) -> str:
+    return str(value).strip().lower()
+
+
+def load_industry_map(path: str) -> Dict[str, Dict[str, Dict[str, str]]]:
+    """Key column -> normalized key -> {'industry', 'sector'} from an industry map CSV"""
+    df = pd.read_csv(path, dtype=str).fillna('')
+    if 'industry' not in df.columns or not any(key in df.columns for key in INDUSTRY_MAP_KEYS):
+        raise ValueError(f"{path}: needs an industry column and one of {', '.join(INDUSTRY_MAP_KEYS)}")
+    values = [column for column in ('industry', 'sector') if column in df.columns]
+    industry_map = {}
+    for key in INDUSTRY_MAP_KEYS:
+        if key in df.columns:
+            entries = df[df[key].str.strip() != '']
+            industry_map[key] = {_map_key(k): row for k, row in zip(entries[key], entries[values].to_dict('records'))}
+    return industry_map
+
+
+def apply_industry_map(rows: List[Dict], industry_map: Dict[str, Dict[str, Dict[str, str]]]) -> List[Dict]:
+    """Rows with industry (and sector) filled from the first matching map key"""
+    mapped = []
+    for row in rows:
+        for key, entries in industry_map.items():
+            entry = entries.get(_map_key(row.get(key, '')))
+            if entry:
+                row = dict(row, **{column: value for column, value in entry.items() if value})
+                break
+        mapped.append(row)
+    return mapped
+
+
+def write_output(rows: List[Dict], output: str) -> pd.DataFrame:
+    """Write rows to Parquet (.parquet) or CSV (anything else)"""
+    df = pd.DataFrame(rows)
+    if output.lower().endswith('.parquet'):
+        df.to_parquet(output, index=False)
+    else:
+        df.to_csv(output, index=False)
+    return df
+
+
+def ingest_directory(root: str, output: str, manifest_path: Optional[str] = None,
+                     workers: int = 4, cache_path: Optional[str] = None,
+                     retry_failed: bool = True, streaming: bool = False,
+                     industry_map: Optional[str] = None) -> pd.DataFrame:
+    """
+    Parse every PDF under root into `output`, resuming from the manifest
+
+    Args:
+        root: Directory to search (recursively) for PDFs
+        output: .parquet or .csv path for one row per successfully parsed report
+        manifest_path: JSONL progress log (default: <output>.manifest.jsonl)
+        workers: Parser processes
+        cache_path: Optional ParseCache file shared by the workers
+        retry_failed: Re-parse files that failed in an earlier run
+        streaming: Parse page by page with bounded memory (for very large reports)
+        industry_map: Optional CSV giving each company's industry (see
+            load_industry_map); applied when writing, so editing it needs no re-parse
+    """
+    manifest_path = manifest_path or f"{output}.manifest.jsonl"
+    manifest = load_manifest(manifest_path)
+
+    pdfs = find_pdfs(root)
+    pending = []
+    for path in pdfs:
+        key = file_key(path)
+        if not is_done(manifest.get(key['path']), key, retry_failed):
+            pending.append(key)
+
+    print(f"📂 {len(pdfs)} PDF(s) found, {len(pdfs) - len(pending)} already done, {len(pending)} to parse")
+
+    if pending:
+        failed = 0
+        with open(manifest_path, 'a', encoding='utf-8') as log, \
+                ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                    initargs=(cache_path, streaming)) as executor:
+            futures = [executor.submit(_ingest_one, key) for key in pending]
+            for done, future in enumerate(as_completed(futures), 1):
+                entry = future.result()
+                log.write(json.dumps(entry, default=str) + "\n")
+                log.flush()
+                manifest[entry['path']] = entry
+
+                name = os.path.basename(entry['path'])
+                if entry['status'] == 'ok':
+                    print(f"✅ [{done}/{len(pending)}] {name}: "
+                          f"{entry['row']['metrics_found']} metrics in {entry['seconds']:.1f}s")
+                else:
+                    failed += 1
+                    print(f"❌ [{done}/{len(pending)}] {name}: {entry['error']}")
+
+        if failed:
+            print(f"⚠️ {failed} file(s) failed; rerun to retry them")
+
+    # Output covers every file under root that has a successful parse
+    current = {os.path.abspath(path) for path in pdfs}
+    rows = [entry['row'] for path, entry in sorted(manifest.items())
+            if path in current and entry['status'] == 'ok']
+    if industry_map:
+        rows = apply_industry_map(rows, load_industry_map(industry_map))
+        missing = sum(1 for row in rows if not row.get('industry'))
+        if missing:
+            print(f"⚠️ {missing} row(s) not in {industry_map}; they have no industry")
+    df = write_output(rows, output)
+    print(f"💾 Wrote {len(df)} row(s) to {output}")
+    return df
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Batch-parse BRSR PDFs into ESG calculator inputs")
+    parser.add_argument('root', help="Directory containing BRSR PDFs (searched recursively)")
+    parser.add_argument('-o', '--output', default='brsr_inputs.parquet',
+                        help="Output file; .parquet or .csv (default: brsr_inputs.parquet)")
+    parser.add_argument('-m', '--manifest', default=None,
+                        help="Manifest path (default: <output>.manifest.jsonl)")
+    parser.add_argument('-w', '--workers', type=int, default=os.cpu_count() or 1,
+                        help="Parser processes (default: CPU count)")
+    parser.add_argument('--cache', default=None, help="ParseCache SQLite file to reuse parses")
+    parser.add_argument('--skip-failed', action='store_true',
+                        help="Do not retry files that failed in an earlier run")
+    parser.add_argument('--streaming', action='store_true',
+                        help="Parse page by page to keep memory flat on very large reports")
+    parser.add_argument('--industry-map', default=None,
+                        help="CSV with an industry (and optional sector) column per cin, file or company_name")
+    args = parser.parse_args(argv)
+
+    if not PDF_PARSER_AVAILABLE:
+        print("❌ No PDF library available. Install with: pip install PyMuPDF pdfplumber")
+        return 1
+
+    ingest_directory(args.root, args.output, manifest_path=args.manifest, workers=args.workers,
+                     cache_path=args.cache, retry_failed=not args.skip_failed,
+                     streaming=args.streaming, industry_map=args.industry_map)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
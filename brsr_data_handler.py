@@ -21,10 +21,23 @@ import json
 import re
 from bs4 import BeautifulSoup
 import time
+import asyncio
+import threading
 import warnings
 
+from response_cache import ResponseCache, SingleFlight, AsyncSingleFlight
+from nse_session import NSESession, NSE_BASE_URL, NSE_HEADERS
+
 warnings.filterwarnings('ignore')
 
+AIOHTTP_AVAILABLE = False
+
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    pass
+
 
 # ============================================================================
 # BRSR METRICS MAPPING
@@ -163,48 +176,76 @@ class BRSRMetricsMapping:
 class NSEDataFetcher:
     """Fetch company data from NSE India"""
     
-    def __init__(self):
-        self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-            'Accept': 'application/json, text/plain, */*',
-            'Accept-Language': 'en-US,en;q=0.9',
-            'Referer': 'https://www.nseindia.com/',
-        }
-        self.session = requests.Session()
-        self.session.headers.update(self.headers)
-        self.base_url = "https://www.nseindia.com"
-        self._initialize_session()
+    def __init__(self, cache: Optional[ResponseCache] = None,
+                 session: Optional[NSESession] = None):
+        # Cookies are warmed lazily on the first request and shared process-wide
+        self.session = session if session is not None else NSESession.shared()
+        self.headers = dict(self.session.headers)
+        self.base_url = NSE_BASE_URL
+        self.cache = cache
+        self._inflight = SingleFlight()
     
     def _initialize_session(self):
-        """Initialize session with NSE cookies"""
-        try:
-            self.session.get(self.base_url, timeout=10)
-            print("✅ NSE session initialized")
-        except Exception as e:
-            print(f"⚠️ NSE session warning: {e}")
+        """Warm NSE cookies now instead of on the first request"""
+        if self.cache is not None and self.cache.offline:
+            return
+        self.session.ensure_warm()
+    
+    def _get_json(self, url: str):
+        """
+        GET a URL and return parsed JSON (None on non-200), via the cache if set
+        
+        Duplicate requests for the same URL share one in-flight request and
+        one parsed payload (treat returned payloads as read-only).
+        """
+        return self._inflight.do(url, lambda: self._fetch_json(url))
+    
+    def _fetch_json(self, url: str):
+        if self.cache is not None:
+            return self.cache.fetch_json(self.session, url, timeout=10)
+        response = self.session.get(url, timeout=10)
+        if response.status_code == 200:
+            return response.json()
+        return None
+    
+    @staticmethod
+    def _parse_company_info(symbol: str, data: Dict) -> Dict:
+        """Shape a quote-equity payload into the company info dict"""
+        return {
+            'symbol': symbol,
+            'company_name': data.get('info', {}).get('companyName', symbol),
+            'industry': data.get('metadata', {}).get('industry', 'Unknown'),
+            'sector': data.get('metadata', {}).get('sector', 'Unknown'),
+            'series': data.get('metadata', {}).get('series', ''),
+            'market_cap': data.get('securityInfo', {}).get('marketCap', 0),
+            'last_price': data.get('priceInfo', {}).get('lastPrice', 0),
+            'change': data.get('priceInfo', {}).get('change', 0),
+            'pchange': data.get('priceInfo', {}).get('pChange', 0),
+            'pe_ratio': data.get('metadata', {}).get('pdSymbolPe', 0),
+            'isin': data.get('metadata', {}).get('isin', ''),
+            'face_value': data.get('securityInfo', {}).get('faceValue', 0),
+        }
+    
+    @staticmethod
+    def _parse_shareholding(data: Dict) -> Dict:
+        """Shape a trade_info payload into the shareholding dict"""
+        shareholding = data.get('securityWiseDP', {})
+        
+        return {
+            'promoter_holding': shareholding.get('promoterHolding', 0),
+            'public_holding': shareholding.get('publicHolding', 0),
+            'fii_holding': shareholding.get('fii', 0),
+            'dii_holding': shareholding.get('dii', 0),
+        }
     
     def get_company_info(self, symbol: str) -> Optional[Dict]:
         """Fetch basic company information"""
         try:
             url = f"{self.base_url}/api/quote-equity?symbol={symbol}"
-            response = self.session.get(url, timeout=10)
+            data = self._get_json(url)
             
-            if response.status_code == 200:
-                data = response.json()
-                return {
-                    'symbol': symbol,
-                    'company_name': data.get('info', {}).get('companyName', symbol),
-                    'industry': data.get('metadata', {}).get('industry', 'Unknown'),
-                    'sector': data.get('metadata', {}).get('sector', 'Unknown'),
-                    'series': data.get('metadata', {}).get('series', ''),
-                    'market_cap': data.get('securityInfo', {}).get('marketCap', 0),
-                    'last_price': data.get('priceInfo', {}).get('lastPrice', 0),
-                    'change': data.get('priceInfo', {}).get('change', 0),
-                    'pchange': data.get('priceInfo', {}).get('pChange', 0),
-                    'pe_ratio': data.get('metadata', {}).get('pdSymbolPe', 0),
-                    'isin': data.get('metadata', {}).get('isin', ''),
-                    'face_value': data.get('securityInfo', {}).get('faceValue', 0),
-                }
+            if data is not None:
+                return self._parse_company_info(symbol, data)
             return None
         except Exception as e:
             print(f"❌ Error fetching company info: {e}")
@@ -214,11 +255,7 @@ class NSEDataFetcher:
         """Fetch corporate actions for ESG-related activities"""
         try:
             url = f"{self.base_url}/api/corporates-corporateActions?index=equities&symbol={symbol}"
-            response = self.session.get(url, timeout=10)
-            
-            if response.status_code == 200:
-                return response.json()
-            return None
+            return self._get_json(url)
         except Exception as e:
             print(f"❌ Error fetching corporate actions: {e}")
             return None
@@ -227,18 +264,10 @@ class NSEDataFetcher:
         """Fetch shareholding pattern for governance analysis"""
         try:
             url = f"{self.base_url}/api/quote-equity?symbol={symbol}&section=trade_info"
-            response = self.session.get(url, timeout=10)
+            data = self._get_json(url)
             
-            if response.status_code == 200:
-                data = response.json()
-                shareholding = data.get('securityWiseDP', {})
-                
-                return {
-                    'promoter_holding': shareholding.get('promoterHolding', 0),
-                    'public_holding': shareholding.get('publicHolding', 0),
-                    'fii_holding': shareholding.get('fii', 0),
-                    'dii_holding': shareholding.get('dii', 0),
-                }
+            if data is not None:
+                return self._parse_shareholding(data)
             return None
         except Exception as e:
             print(f"❌ Error fetching shareholding pattern: {e}")
@@ -248,11 +277,7 @@ class NSEDataFetcher:
         """Fetch board meeting information"""
         try:
             url = f"{self.base_url}/api/corporates-boardMeetings?index=equities&symbol={symbol}"
-            response = self.session.get(url, timeout=10)
-            
-            if response.status_code == 200:
-                return response.json()
-            return None
+            return self._get_json(url)
         except Exception as e:
             print(f"❌ Error fetching board meetings: {e}")
             return None
@@ -261,10 +286,231 @@ class NSEDataFetcher:
         """Fetch financial results for ESG context"""
         try:
             url = f"{self.base_url}/api/quote-equity?symbol={symbol}&section=trade_info"
-            response = self.session.get(url, timeout=10)
+            data = self._get_json(url)
             
-            if response.status_code == 200:
-                return response.json().get('tradeInfo', {})
+            if data is not None:
+                return data.get('tradeInfo', {})
+            return None
+        except Exception as e:
+            print(f"❌ Error fetching financial results: {e}")
+            return None
+
+
+# ============================================================================
+# RATE LIMITING
+# ============================================================================
+
+class TokenBucket:
+    """
+    Token-bucket rate limiter shared by the sync and async fetch paths
+    
+    Each request takes one token; tokens refill at `rate` per second up to
+    `capacity`, so short bursts go straight through and sustained load is
+    held to `rate` requests per second.
+    """
+    
+    def __init__(self, rate: float = 10.0, capacity: int = 20):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def _reserve(self) -> float:
+        """Take a token and return how long the caller must wait for it"""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+    
+    def wait(self):
+        """Block until a token is available"""
+        delay = self._reserve()
+        if delay > 0:
+            time.sleep(delay)
+    
+    async def acquire(self):
+        """Wait (without blocking the event loop) until a token is available"""
+        delay = self._reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+# ============================================================================
+# ASYNC NSE DATA FETCHER
+# ============================================================================
+
+class AsyncNSEDataFetcher:
+    """
+    Concurrent NSE fetcher built on asyncio + aiohttp
+    
+    Returns the same shapes as NSEDataFetcher. One keep-alive connection
+    pool is shared by all requests, a bounded semaphore caps in-flight
+    requests and a token bucket keeps the request rate within NSE limits.
+    
+    Usage:
+        async with AsyncNSEDataFetcher() as fetcher:
+            info = await fetcher.get_company_info('TCS')
+    """
+    
+    def __init__(self, max_concurrency: int = 8, requests_per_second: float = 10.0,
+                 burst: int = 20, timeout: float = 10, cache: Optional[ResponseCache] = None):
+        if not AIOHTTP_AVAILABLE:
+            raise ImportError("aiohttp not installed")
+        
+        self.headers = dict(NSE_HEADERS)
+        self.base_url = NSE_BASE_URL
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.rate_limiter = TokenBucket(requests_per_second, burst)
+        self.cache = cache
+        self._inflight = AsyncSingleFlight()
+        self.session = None
+        self._semaphore = None
+        self._warm_lock = None
+        self._cookie_generation = 0
+    
+    async def __aenter__(self):
+        await self.open()
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+    
+    async def open(self):
+        """Create the pooled session and pick up NSE cookies"""
+        connector = aiohttp.TCPConnector(limit=self.max_concurrency, keepalive_timeout=30)
+        self.session = aiohttp.ClientSession(
+            headers=self.headers,
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=self.timeout)
+        )
+        self._semaphore = asyncio.BoundedSemaphore(self.max_concurrency)
+        self._warm_lock = asyncio.Lock()
+        
+        if self.cache is not None and self.cache.offline:
+            return
+        # Reuse cookies already warmed by the sync fetchers in this process
+        shared = NSESession.shared(self.base_url)
+        if shared.is_warm():
+            self.session.cookie_jar.update_cookies(shared.session.cookies.get_dict())
+            return
+        await self._warm()
+    
+    async def _warm(self) -> bool:
+        """Visit the home page to pick up fresh NSE cookies; True on success"""
+        try:
+            await self.rate_limiter.acquire()
+            async with self.session.get(self.base_url) as response:
+                await response.read()
+            print("✅ NSE async session initialized")
+            return True
+        except Exception as e:
+            print(f"⚠️ NSE session warning: {e}")
+            return False
+    
+    async def _rewarm(self, generation: int) -> bool:
+        """
+        Drop rejected cookies and warm again, once per expiry
+        
+        Requests rejected with the same cookie generation share one re-warm;
+        True when the caller should retry.
+        """
+        async with self._warm_lock:
+            if generation != self._cookie_generation:
+                return True  # another request already re-warmed
+            self.session.cookie_jar.clear()
+            warmed = await self._warm()
+            self._cookie_generation += 1
+            return warmed
+    
+    async def _request(self, url: str, headers: Dict[str, str]):
+        """One rate-limited GET; returns (status, body, headers)"""
+        await self.rate_limiter.acquire()
+        async with self.session.get(url, headers=headers) as response:
+            return response.status, await response.read(), response.headers
+    
+    async def close(self):
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+    
+    async def _get_json(self, url: str):
+        """GET a URL once per burst of duplicate requests (see AsyncSingleFlight)"""
+        return await self._inflight.do(url, lambda: self._fetch_json(url))
+    
+    async def _fetch_json(self, url: str):
+        """GET a URL under the concurrency and rate limits, via the cache if set"""
+        entry, headers = None, {}
+        if self.cache is not None:
+            entry, servable = self.cache.lookup(url)
+            if servable:
+                return entry.json()
+            if self.cache.offline:
+                return None
+            headers = self.cache.conditional_headers(entry)
+        
+        async with self._semaphore:
+            try:
+                generation = self._cookie_generation
+                status, body, response_headers = await self._request(url, headers)
+                # Expired cookies: re-warm and retry once, as NSESession.get does
+                if status in (401, 403) and await self._rewarm(generation):
+                    status, body, response_headers = await self._request(url, headers)
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                # Serve the stale entry when the network fails, as ResponseCache.fetch_json does
+                if entry is not None:
+                    return entry.json()
+                raise
+        
+        if self.cache is not None:
+            return self.cache.store_response(url, entry, status, body, response_headers)
+        if status == 200:
+            return json.loads(body)
+        return None
+    
+    async def get_company_info(self, symbol: str) -> Optional[Dict]:
+        """Fetch basic company information"""
+        try:
+            data = await self._get_json(f"{self.base_url}/api/quote-equity?symbol={symbol}")
+            if data is not None:
+                return NSEDataFetcher._parse_company_info(symbol, data)
+            return None
+        except Exception as e:
+            print(f"❌ Error fetching company info: {e}")
+            return None
+    
+    async def get_shareholding_pattern(self, symbol: str) -> Optional[Dict]:
+        """Fetch shareholding pattern for governance analysis"""
+        try:
+            data = await self._get_json(f"{self.base_url}/api/quote-equity?symbol={symbol}&section=trade_info")
+            if data is not None:
+                return NSEDataFetcher._parse_shareholding(data)
+            return None
+        except Exception as e:
+            print(f"❌ Error fetching shareholding pattern: {e}")
+            return None
+    
+    async def get_board_meetings(self, symbol: str) -> Optional[List[Dict]]:
+        """Fetch board meeting information"""
+        try:
+            return await self._get_json(
+                f"{self.base_url}/api/corporates-boardMeetings?index=equities&symbol={symbol}"
+            )
+        except Exception as e:
+            print(f"❌ Error fetching board meetings: {e}")
+            return None
+    
+    async def get_financial_results(self, symbol: str) -> Optional[Dict]:
+        """Fetch financial results for ESG context"""
+        try:
+            data = await self._get_json(f"{self.base_url}/api/quote-equity?symbol={symbol}&section=trade_info")
+            if data is not None:
+                return data.get('tradeInfo', {})
             return None
         except Exception as e:
             print(f"❌ Error fetching financial results: {e}")
@@ -278,7 +524,7 @@ class NSEDataFetcher:
 class BSEDataFetcher:
     """Fetch company data from BSE India"""
     
-    def __init__(self):
+    def __init__(self, cache: Optional[ResponseCache] = None):
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
             'Accept': 'application/json',
@@ -286,16 +532,31 @@ class BSEDataFetcher:
         self.session = requests.Session()
         self.session.headers.update(self.headers)
         self.base_url = "https://api.bseindia.com/BseIndiaAPI/api"
+        self.cache = cache
+        self._inflight = SingleFlight()
+    
+    def _get_json(self, url: str):
+        """
+        GET a URL and return parsed JSON (None on non-200), via the cache if set
+        
+        Duplicate requests for the same URL share one in-flight request and
+        one parsed payload (treat returned payloads as read-only).
+        """
+        return self._inflight.do(url, lambda: self._fetch_json(url))
+    
+    def _fetch_json(self, url: str):
+        if self.cache is not None:
+            return self.cache.fetch_json(self.session, url, timeout=10)
+        response = self.session.get(url, timeout=10)
+        if response.status_code == 200:
+            return response.json()
+        return None
     
     def get_company_info(self, scrip_code: str) -> Optional[Dict]:
         """Fetch company information from BSE"""
         try:
             url = f"{self.base_url}/StockReachGraph/w?scripcode={scrip_code}&flag=0&fromdate=&todate=&seriesid="
-            response = self.session.get(url, timeout=10)
-            
-            if response.status_code == 200:
-                return response.json()
-            return None
+            return self._get_json(url)
         except Exception as e:
             print(f"❌ Error fetching BSE data: {e}")
             return None
@@ -424,10 +685,12 @@ class BRSRReportParser:
 class ESGDataAggregator:
     """Aggregate ESG data from multiple sources"""
     
-    def __init__(self):
-        self.nse_fetcher = NSEDataFetcher()
-        self.bse_fetcher = BSEDataFetcher()
+    def __init__(self, cache: Optional[ResponseCache] = None):
+        self.nse_fetcher = NSEDataFetcher(cache=cache)
+        self.bse_fetcher = BSEDataFetcher(cache=cache)
         self.brsr_parser = BRSRReportParser()
+        self.cache = cache
+        self.rate_limiter = TokenBucket(rate=2.0, capacity=1)
     
     def fetch_company_esg_data(self, symbol: str, 
                                brsr_data: Optional[Dict] = None) -> Dict:
@@ -445,8 +708,6 @@ class ESGDataAggregator:
         
         # Fetch company info from NSE
         company_info = self.nse_fetcher.get_company_info(symbol)
-        if company_info is None:
-            company_info = {'symbol': symbol, 'company_name': symbol}
         
         # Fetch shareholding for governance metrics
         shareholding = self.nse_fetcher.get_shareholding_pattern(symbol)
@@ -454,6 +715,29 @@ class ESGDataAggregator:
         # Fetch board meetings for governance metrics
         board_meetings = self.nse_fetcher.get_board_meetings(symbol)
         
+        aggregated_data = self._aggregate(symbol, company_info, shareholding,
+                                          board_meetings, brsr_data)
+        
+        print(f"✅ ESG data aggregated for {symbol}")
+        
+        return aggregated_data
+    
+    async def fetch_company_esg_data_async(self, fetcher: 'AsyncNSEDataFetcher', symbol: str,
+                                           brsr_data: Optional[Dict] = None) -> Dict:
+        """Async variant of fetch_company_esg_data; the three NSE calls run concurrently"""
+        company_info, shareholding, board_meetings = await asyncio.gather(
+            fetcher.get_company_info(symbol),
+            fetcher.get_shareholding_pattern(symbol),
+            fetcher.get_board_meetings(symbol),
+        )
+        return self._aggregate(symbol, company_info, shareholding, board_meetings, brsr_data)
+    
+    def _aggregate(self, symbol: str, company_info: Optional[Dict], shareholding: Optional[Dict],
+                   board_meetings: Optional[List[Dict]], brsr_data: Optional[Dict]) -> Dict:
+        """Combine fetched NSE data and BRSR metrics into one record"""
+        if company_info is None:
+            company_info = {'symbol': symbol, 'company_name': symbol}
+        
         # Process BRSR data if available
         env_metrics = {}
         social_metrics = {}
@@ -476,41 +760,75 @@ class ESGDataAggregator:
             'fetch_timestamp': datetime.now().isoformat()
         }
         
-        print(f"✅ ESG data aggregated for {symbol}")
-        
         return aggregated_data
     
-    def fetch_multiple_companies(self, symbols: List[str]) -> pd.DataFrame:
-        """Fetch ESG data for multiple companies"""
+    @staticmethod
+    def _summary_row(symbol: str, data: Dict) -> Dict:
+        """Flatten an aggregated record into one comparison row"""
+        company_info = data.get('company_info', {})
+        shareholding = data.get('shareholding', {})
+        
+        return {
+            'Symbol': symbol,
+            'Company': company_info.get('company_name', symbol),
+            'Industry': company_info.get('industry', 'Unknown'),
+            'Sector': company_info.get('sector', 'Unknown'),
+            'Market Cap': company_info.get('market_cap', 0),
+            'Promoter Holding': shareholding.get('promoter_holding', 0),
+            'Public Holding': shareholding.get('public_holding', 0),
+            'FII Holding': shareholding.get('fii_holding', 0),
+            'DII Holding': shareholding.get('dii_holding', 0),
+            'Board Meetings': data.get('board_meetings_count', 0),
+            'Data Source': data.get('data_source', ''),
+        }
+    
+    def fetch_multiple_companies(self, symbols: List[str], use_async: bool = True) -> pd.DataFrame:
+        """
+        Fetch ESG data for multiple companies
+        
+        Uses the async fetcher when aiohttp is installed (and no event loop
+        is already running), otherwise fetches one symbol at a time.
+        Both paths are paced by the token-bucket rate limiter.
+        """
+        if use_async and AIOHTTP_AVAILABLE:
+            try:
+                asyncio.get_running_loop()
+            except RuntimeError:
+                return asyncio.run(self.fetch_multiple_companies_async(symbols))
+        
         results = []
         
         for symbol in symbols:
             try:
+                self.rate_limiter.wait()
                 data = self.fetch_company_esg_data(symbol)
-                
-                company_info = data.get('company_info', {})
-                shareholding = data.get('shareholding', {})
-                
-                results.append({
-                    'Symbol': symbol,
-                    'Company': company_info.get('company_name', symbol),
-                    'Industry': company_info.get('industry', 'Unknown'),
-                    'Sector': company_info.get('sector', 'Unknown'),
-                    'Market Cap': company_info.get('market_cap', 0),
-                    'Promoter Holding': shareholding.get('promoter_holding', 0),
-                    'Public Holding': shareholding.get('public_holding', 0),
-                    'FII Holding': shareholding.get('fii_holding', 0),
-                    'DII Holding': shareholding.get('dii_holding', 0),
-                    'Board Meetings': data.get('board_meetings_count', 0),
-                    'Data Source': data.get('data_source', ''),
-                })
-                
-                time.sleep(0.5)  # Rate limiting
-                
+                results.append(self._summary_row(symbol, data))
             except Exception as e:
                 print(f"❌ Error processing {symbol}: {e}")
         
         return pd.DataFrame(results)
+    
+    async def fetch_multiple_companies_async(self, symbols: List[str],
+                                             max_concurrency: int = 8,
+                                             requests_per_second: float = 10.0) -> pd.DataFrame:
+        """Fetch ESG data for many companies concurrently over one connection pool"""
+        async with AsyncNSEDataFetcher(max_concurrency=max_concurrency,
+                                       requests_per_second=requests_per_second,
+                                       cache=self.cache) as fetcher:
+            records = await asyncio.gather(
+                *(self.fetch_company_esg_data_async(fetcher, symbol) for symbol in symbols),
+                return_exceptions=True
+            )
+        
+        results = []
+        for symbol, data in zip(symbols, records):
+            if isinstance(data, Exception):
+                print(f"❌ Error processing {symbol}: {data}")
+                continue
+            results.append(self._summary_row(symbol, data))
+        
+        print(f"✅ ESG data aggregated for {len(results)} companies")
+        return pd.DataFrame(results)
 
 
 # ============================================================================
@@ -594,8 +912,8 @@ def main():
     print("🌿 NYZTRADE - BRSR DATA HANDLER")
     print("=" * 80)
     
-    # Initialize aggregator
-    aggregator = ESGDataAggregator()
+    # Initialize aggregator (responses cached on disk between runs)
+    aggregator = ESGDataAggregator(cache=ResponseCache())
     
     # Sample companies
     symbols = ['RELIANCE', 'TCS', 'HDFCBANK', 'INFY', 'ICICIBANK']
@@ -0,0 +1,230 @@
+# ============================================================================
+# NYZTRADE - DECARBONIZATION PATHWAYS
+# Year-by-year emission projections over target and grid scenarios
+# ============================================================================
+
+"""
+Decarbonization pathway simulator
+
+Extends CarbonFootprintCalculator.calculate_reduction_potential() from one
+set of targets to a grid of them, projected year by year to 2050:
+- Renewable electricity, energy efficiency and fleet electrification
+  targets ramp in linearly from the base year to the target year
+- Grid electricity emissions follow a grid-decarbonization scenario
+  (annual decline of the grid emission factor)
+- Abatement from each lever is costed at a flat marginal abatement cost
+  (Rs per tCO2e), discounted to the base year
+
+Levers compound rather than add up as in calculate_reduction_potential():
+efficiency applies to what is left after renewables and electrification.
+Every term is still linear in a company's footprint components (Scope 1,
+fleet, grid electricity, other Scope 2, Scope 3), so emissions and costs for
+all companies x scenarios are matrix products.
+
+Usage:
+    footprints = CarbonFootprintCalculator().calculate_footprints(activities)
+    simulator = PathwaySimulator(footprints)
+    best = simulator.cheapest_paths(PathwaySimulator.scenario_grid(), reduction=0.45, by_year=2030)
+"""
+
+from itertools import product
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+
+# Footprint components, in the column order of PathwaySimulator.components
+COMPONENTS = ['scope1', 'fleet', 'grid_electricity', 'other_scope2', 'scope3']
+
+# Emission reduction of an electrified vehicle, as in calculate_reduction_potential
+EV_EMISSION_REDUCTION = 0.7
+
+# Annual decline of the grid emission factor (illustrative scenarios)
+GRID_SCENARIOS = {
+    'Current Policies': 0.02,
+    'Announced Pledges': 0.045,
+    'Accelerated Transition': 0.07,
+}
+
+# Marginal abatement cost per lever (Rs per tCO2e, illustrative)
+LEVER_COSTS = {
+    'renewable': 1500.0,
+    'efficiency': 800.0,
+    'fleet': 6000.0,
+}
+
+LEVER_COLUMNS = ['renewable_pct', 'efficiency_pct', 'fleet_electrification_pct']
+
+
+class PathwaySimulator:
+    """
+    Project company emissions to `end_year` over many target scenarios
+
+    Scenarios are a DataFrame with LEVER_COLUMNS (0-100) and grid_scenario /
+    grid_decline columns, e.g. from scenario_grid().
+    """
+
+    def __init__(self, footprints: pd.DataFrame, base_year: int = 2024,
+                 end_year: int = 2050, target_year: int = 2030, growth: float = 0.0,
+                 lever_costs: Optional[Dict[str, float]] = None, discount_rate: float = 0.08):
+        """
+        Args:
+            footprints: One row per company, calculate_footprints() output
+                (scope totals plus fleet and grid electricity breakdowns)
+            base_year: Year of the footprint
+            end_year: Last projected year
+            target_year: Year the lever targets are fully reached
+            growth: Annual activity growth applied to all emissions
+            lever_costs: Rs per tCO2e abated per lever (default LEVER_COSTS)
+            discount_rate: Annual rate for discounting costs to the base year
+        """
+        column = lambda key: (footprints[key].to_numpy(dtype=float) if key in footprints.columns
+                              else np.zeros(len(footprints)))
+        fleet = column('scope1_fleet_diesel') + column('scope1_fleet_petrol')
+        grid = column('scope2_grid_electricity')
+        self.index = footprints.index
+        self.components = np.column_stack([
+            column('scope1_tco2e'), fleet, grid, column('scope2_tco2e') - grid, column('scope3_tco2e'),
+        ]).reshape(len(footprints), len(COMPONENTS))
+        self.base_emissions = self.components @ np.array([1.0, 0.0, 1.0, 1.0, 1.0])
+
+        self.years = np.arange(base_year, end_year + 1)
+        self.base_year = base_year
+        self.target_year = target_year
+        self.lever_costs = {**LEVER_COSTS, **(lever_costs or {})}
+        elapsed = self.years - base_year
+        self._growth = (1 + growth) ** elapsed
+        self._discount = (1 + discount_rate) ** -elapsed.astype(float)
+        self._ramp = np.clip(elapsed / max(target_year - base_year, 1), 0, 1)
+
+    @classmethod
+    def from_footprints(cls, footprints: List[Dict], index: Optional[Sequence] = None,
+                        **kwargs) -> 'PathwaySimulator':
+        """Simulator over calculate_total_footprint() results"""
+        rows = [{
+            'scope1_tco2e': fp['scope1_tco2e'],
+            'scope2_tco2e': fp['scope2_tco2e'],
+            'scope3_tco2e': fp['scope3_tco2e'],
+            'scope1_fleet_diesel': fp['scope1_breakdown'].get('fleet_diesel', 0),
+            'scope1_fleet_petrol': fp['scope1_breakdown'].get('fleet_petrol', 0),
+            'scope2_grid_electricity': fp['scope2_breakdown'].get('grid_electricity', 0),
+        } for fp in footprints]
+        return cls(pd.DataFrame(rows, index=index), **kwargs)
+
+    @staticmethod
+    def scenario_grid(renewable_pct: Sequence[float] = (0, 25, 50, 75, 100),
+                      efficiency_pct: Sequence[float] = (0, 10, 20, 30),
+                      fleet_electrification_pct: Sequence[float] = (0, 30, 60, 100),
+                      grid_scenarios: Optional[Dict[str, float]] = None) -> pd.DataFrame:
+        """Every combination of lever targets and grid scenarios"""
+        grid_scenarios = grid_scenarios or GRID_SCENARIOS
+        rows = product(grid_scenarios.items(), renewable_pct, efficiency_pct, fleet_electrification_pct)
+        return pd.DataFrame([(name, decline, re, eff, fleet) for (name, decline), re, eff, fleet in rows],
+                            columns=['grid_scenario', 'grid_decline'] + LEVER_COLUMNS)
+
+    # -------------------------------------------------------------------------
+    # COEFFICIENTS
+    # -------------------------------------------------------------------------
+
+    def _levers(self, scenarios: pd.DataFrame):
+        """Ramped lever levels and grid factor path, each (scenarios, years)"""
+        ramp = self._ramp[None, :]
+        renewable = scenarios['renewable_pct'].to_numpy(dtype=float)[:, None] / 100 * ramp
+        efficiency = scenarios['efficiency_pct'].to_numpy(dtype=float)[:, None] / 100 * ramp
+        fleet = scenarios['fleet_electrification_pct'].to_numpy(dtype=float)[:, None] / 100 * ramp
+        decline = scenarios['grid_decline'].to_numpy(dtype=float)[:, None]
+        grid = (1 - decline) ** (self.years - self.base_year)[None, :]
+        return renewable, efficiency, fleet, grid
+
+    def emission_coefficients(self, scenarios: pd.DataFrame) -> np.ndarray:
+        """(components, scenarios, years): emissions = components @ coefficients"""
+        renewable, efficiency, fleet, grid = self._levers(scenarios)
+        kept = 1 - efficiency
+        coefficients = np.stack([
+            kept,
+            -EV_EMISSION_REDUCTION * fleet * kept,
+            grid * (1 - renewable) * kept,
+            kept,
+            np.ones_like(kept),
+        ])
+        return coefficients * self._growth
+
+    def cost_coefficients(self, scenarios: pd.DataFrame) -> np.ndarray:
+        """(components, scenarios): discounted abatement cost (Rs) = components @ coefficients"""
+        renewable, efficiency, fleet, grid = self._levers(scenarios)
+        cost = self.lever_costs
+        electrified = EV_EMISSION_REDUCTION * fleet
+        per_year = np.stack([
+            cost['efficiency'] * efficiency,
+            # Electrification pays for all of its cut; the efficiency cut on that
+            # part of the fleet (already costed via Scope 1) is credited back
+            cost['fleet'] * electrified - cost['efficiency'] * efficiency * electrified,
+            grid * (cost['renewable'] * renewable + cost['efficiency'] * efficiency * (1 - renewable)),
+            cost['efficiency'] * efficiency,
+            np.zeros_like(efficiency),
+        ])
+        return per_year @ (self._growth * self._discount)
+
+    # -------------------------------------------------------------------------
+    # PROJECTIONS
+    # -------------------------------------------------------------------------
+
+    def project(self, scenarios: pd.DataFrame) -> np.ndarray:
+        """Emissions (tCO2e) per (company, scenario, year); size grows as C x S x Y"""
+        return np.einsum('ck,ksy->csy', self.components, self.emission_coefficients(scenarios))
+
+    def emissions_in(self, scenarios: pd.DataFrame, year: int) -> np.ndarray:
+        """Emissions (tCO2e) per (company, scenario) in one year"""
+        y = int(np.clip(year - self.base_year, 0, len(self.years) - 1))
+        return self.components @ self.emission_coefficients(scenarios)[:, :, y]
+
+    def costs(self, scenarios: pd.DataFrame) -> np.ndarray:
+        """Discounted abatement cost (Rs Cr) per (company, scenario) through end_year"""
+        return self.components @ self.cost_coefficients(scenarios) / 1e7
+
+    def cheapest_paths(self, scenarios: pd.DataFrame, reduction: float,
+                       by_year: int = 2030) -> pd.DataFrame:
+        """
+        Lowest-cost scenario reaching `reduction` by `by_year`, per company and grid scenario
+
+        Args:
+            scenarios: Scenario table (scenario_grid() output)
+            reduction: Required cut versus base-year emissions (0-1)
+            by_year: Year the cut must be reached
+
+        Returns:
+            One row per company and grid scenario with the chosen levers, its
+            cost and emissions. Where no scenario reaches the cut, the one with
+            the lowest emissions is reported with Feasible = False.
+        """
+        scenarios = scenarios.reset_index(drop=True)
+        emissions = self.emissions_in(scenarios, by_year)
+        final = self.emissions_in(scenarios, self.years[-1])
+        costs = self.costs(scenarios)
+        feasible = emissions <= (1 - reduction) * self.base_emissions[:, None] + 1e-9
+        companies = np.arange(len(self.index))
+
+        frames = []
+        for grid_name in scenarios['grid_scenario'].unique():
+            columns = np.flatnonzero(scenarios['grid_scenario'].to_numpy() == grid_name)
+            ok = feasible[:, columns]
+            choice = np.where(ok.any(axis=1),
+                              np.where(ok, costs[:, columns], np.inf).argmin(axis=1),
+                              emissions[:, columns].argmin(axis=1))
+            chosen = columns[choice]
+
+            frame = scenarios.loc[chosen, ['grid_scenario'] + LEVER_COLUMNS].reset_index(drop=True)
+            frame.insert(0, 'Company', self.index)
+            frame['Scenario'] = chosen
+            frame['Feasible'] = ok.any(axis=1)
+            frame['Base Emissions'] = self.base_emissions
+            frame[f'Emissions {by_year}'] = emissions[companies, chosen]
+            frame[f'Emissions {self.years[-1]}'] = final[companies, chosen]
+            with np.errstate(divide='ignore', invalid='ignore'):
+                frame['Reduction %'] = np.where(self.base_emissions > 0,
+                                                (1 - emissions[companies, chosen] / self.base_emissions) * 100,
+                                                0.0)
+            frame['Cost (Rs Cr)'] = costs[companies, chosen]
+            frames.append(frame)
+        return pd.concat(frames, ignore_index=True)
@@ -62,13 +62,192 @@ class EmissionFactors:
     PAPER: float = 1.84  # per kg
     WATER: float = 0.344  # per kL
     WASTE_LANDFILL: float = 0.58  # per kg
+    PURCHASED_STEAM: float = 66.5  # per GJ (approximate)
+    FREIGHT_ROAD: float = 0.1  # per tonne-km (road average)
+
+
+# Batch footprint activities: (scope, breakdown item, activity column, EmissionFactors field).
+# Activity columns are in the units of the factor; refrigerant_co2e_kg,
+# procurement_co2e_kg and the commute_*_km columns are derived from the
+# dict inputs in CarbonFootprintCalculator._activity_matrix (factor None = kg CO2e already).
+FOOTPRINT_ACTIVITIES = [
+    (EmissionScope.SCOPE_1, 'diesel', 'diesel_litres', 'DIESEL'),
+    (EmissionScope.SCOPE_1, 'petrol', 'petrol_litres', 'PETROL'),
+    (EmissionScope.SCOPE_1, 'lpg', 'lpg_litres', 'LPG'),
+    (EmissionScope.SCOPE_1, 'natural_gas', 'natural_gas_scm', 'NATURAL_GAS'),
+    (EmissionScope.SCOPE_1, 'coal', 'coal_kg', 'COAL'),
+    (EmissionScope.SCOPE_1, 'fleet_diesel', 'fleet_diesel_litres', 'DIESEL'),
+    (EmissionScope.SCOPE_1, 'fleet_petrol', 'fleet_petrol_litres', 'PETROL'),
+    (EmissionScope.SCOPE_1, 'refrigerants', 'refrigerant_co2e_kg', None),
+    (EmissionScope.SCOPE_2, 'grid_electricity', 'grid_electricity_kwh', 'GRID_ELECTRICITY'),
+    (EmissionScope.SCOPE_2, 'renewable_electricity', 'renewable_electricity_kwh', 'RENEWABLE_ELECTRICITY'),
+    (EmissionScope.SCOPE_2, 'purchased_steam', 'purchased_steam_gj', 'PURCHASED_STEAM'),
+    (EmissionScope.SCOPE_3, 'purchased_goods', 'procurement_co2e_kg', None),
+    (EmissionScope.SCOPE_3, 'upstream_transport', 'freight_tonne_km', 'FREIGHT_ROAD'),
+    (EmissionScope.SCOPE_3, 'waste', 'waste_to_landfill_kg', 'WASTE_LANDFILL'),
+    (EmissionScope.SCOPE_3, 'domestic_flights', 'domestic_flight_km', 'DOMESTIC_FLIGHT'),
+    (EmissionScope.SCOPE_3, 'international_flights', 'international_flight_km', 'INTERNATIONAL_FLIGHT'),
+    (EmissionScope.SCOPE_3, 'train_travel', 'train_km', 'TRAIN'),
+    (EmissionScope.SCOPE_3, 'commute_car', 'commute_car_km', 'CAR_PETROL'),
+    (EmissionScope.SCOPE_3, 'commute_two_wheeler', 'commute_two_wheeler_km', 'TWO_WHEELER'),
+    (EmissionScope.SCOPE_3, 'downstream_transport', 'downstream_freight_tkm', 'FREIGHT_ROAD'),
+]
+SCOPES = [EmissionScope.SCOPE_1, EmissionScope.SCOPE_2, EmissionScope.SCOPE_3]
+
+NATIONAL_REGION = 'IN'
+
+
+class EmissionFactorRegistry:
+    """
+    Emission factors by (factor, region, year), e.g. state grid factors per CEA release
+    
+    Loaded from a long table with columns factor (an EmissionFactors field
+    name), region, year and value. Gaps are filled once at load time, so
+    lookups are plain array indexing:
+    - A year without its own value uses the latest earlier year
+    - Years before a region's first value use the national value, then the
+      region's earliest value
+    - Anything still missing uses the `base` EmissionFactors value
+    Years outside the table clamp to its first / last year; unknown or
+    missing regions use the national region.
+    
+    Years may be numbers or fiscal-year strings ('2022-23' -> 2022).
+    """
+    
+    def __init__(self, table: pd.DataFrame, version: str = 'custom',
+                 base: Optional[EmissionFactors] = None,
+                 national_region: str = NATIONAL_REGION):
+        table = table[['factor', 'region', 'year', 'value']].copy()
+        table['region'] = table['region'].astype(str)
+        table['year'] = self._years(table['year'])
+        if table['year'].isna().any():
+            raise ValueError("Emission factor table has rows without a year")
+        if table.duplicated(['factor', 'region', 'year']).any():
+            raise ValueError("Emission factor table has duplicate (factor, region, year) rows")
+        
+        self.table = table.sort_values(['factor', 'region', 'year'], ignore_index=True)
+        self.version = version
+        self.base = base or EmissionFactors()
+        self.national_region = national_region
+        
+        base_values = vars(self.base)
+        self.factor_index = pd.Index(list(base_values) + sorted(set(table['factor']) - set(base_values)))
+        self.region_index = pd.Index(sorted(set(table['region']) | {national_region}))
+        first_year = int(table['year'].min()) if len(table) else datetime.now().year
+        last_year = int(table['year'].max()) if len(table) else first_year
+        self.years = np.arange(first_year, last_year + 1)
+        self._national = self.region_index.get_loc(national_region)
+        
+        values = np.full((len(self.factor_index), len(self.region_index), len(self.years)), np.nan)
+        values[self.factor_index.get_indexer(table['factor']),
+               self.region_index.get_indexer(table['region']),
+               table['year'].to_numpy(dtype=int) - first_year] = table['value'].to_numpy(dtype=float)
+        
+        # Carry values forward through later years; before a region's first year
+        # use the national value, and only then the region's earliest value
+        self._fill(values, forward=True)
+        self._fill(values[:, self._national, :], forward=False)
+        values = np.where(np.isnan(values), values[:, [self._national], :], values)
+        self._fill(values, forward=False)
+        defaults = np.array([base_values.get(name, np.nan) for name in self.factor_index], dtype=float)
+        self.values = np.where(np.isnan(values), defaults[:, None, None], values)
+        self._cache: Dict = {}
+    
+    @staticmethod
+    def _fill(values: np.ndarray, forward: bool):
+        """Fill NaN gaps along the (last) year axis in place"""
+        years = range(1, values.shape[-1]) if forward else range(values.shape[-1] - 2, -1, -1)
+        step = -1 if forward else 1
+        for y in years:
+            values[..., y] = np.where(np.isnan(values[..., y]), values[..., y + step], values[..., y])
+    
+    @classmethod
+    def from_csv(cls, path: str, **kwargs) -> 'EmissionFactorRegistry':
+        """Registry from a CSV with factor, region, year, value columns"""
+        return cls(pd.read_csv(path), **kwargs)
+    
+    @classmethod
+    def from_emission_factors(cls, factors: Optional[EmissionFactors] = None,
+                              **kwargs) -> 'EmissionFactorRegistry':
+        """Registry that returns one fixed set of factors for every region and year"""
+        return cls(pd.DataFrame(columns=['factor', 'region', 'year', 'value']), base=factors, **kwargs)
+    
+    # -------------------------------------------------------------------------
+    # LOOKUP
+    # -------------------------------------------------------------------------
+    
+    @staticmethod
+    def _years(years) -> pd.Series:
+        years = pd.Series(years)
+        numeric = pd.to_numeric(years, errors='coerce')
+        if numeric.isna().any() and years.dtype == object:
+            text_years = years.astype(str).str.extract(r'((?:19|20)\d{2})', expand=False)
+            numeric = numeric.fillna(pd.to_numeric(text_years, errors='coerce'))
+        return numeric
+    
+    def _codes(self, regions, years, n: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Region and year array indices per row; scalars broadcast (to n rows if given)"""
+        regions, years = np.broadcast_arrays(np.atleast_1d(np.asarray(regions, dtype=object)),
+                                             np.atleast_1d(np.asarray(years)))
+        if n is not None:
+            regions, years = np.broadcast_to(regions, (n,)), np.broadcast_to(years, (n,))
+        
+        region_codes = self.region_index.get_indexer(pd.Index(regions, dtype=object).astype(str))
+        region_codes[region_codes < 0] = self._national
+        
+        year_values = self._years(years).to_numpy(dtype=float)
+        year_values = np.where(np.isnan(year_values), self.years[-1], year_values)
+        year_codes = np.clip(year_values.astype(int) - self.years[0], 0, len(self.years) - 1)
+        return region_codes, year_codes
+    
+    def lookup(self, factor: str, regions=None, years=None) -> np.ndarray:
+        """Values of one factor per (region, year) row"""
+        region_codes, year_codes = self._codes(regions, years)
+        return self.values[self.factor_index.get_loc(factor), region_codes, year_codes]
+    
+    def factor_matrix(self, factors: List[Optional[str]], regions=None, years=None,
+                      n: Optional[int] = None) -> np.ndarray:
+        """(rows, factors) values; None entries are 1.0 (inputs already in kg CO2e)"""
+        region_codes, year_codes = self._codes(regions, years, n)
+        factor_codes = np.array([0 if name is None else self.factor_index.get_loc(name) for name in factors])
+        matrix = self.values[factor_codes[None, :], region_codes[:, None], year_codes[:, None]]
+        matrix[:, [name is None for name in factors]] = 1.0
+        return matrix
+    
+    def emission_factors(self, region: Optional[str] = None, year=None) -> EmissionFactors:
+        """EmissionFactors for one region and year"""
+        region_codes, year_codes = self._codes(region, year)
+        key = (int(region_codes[0]), int(year_codes[0]))
+        if key not in self._cache:
+            values = self.values[:, key[0], key[1]]
+            self._cache[key] = EmissionFactors(**{name: float(values[i])
+                                                  for i, name in enumerate(vars(self.base))})
+        return self._cache[key]
+    
+    def to_frame(self) -> pd.DataFrame:
+        """The source table (factor, region, year, value) this registry was loaded from"""
+        return self.table.copy()
 
 
 class CarbonFootprintCalculator:
     """Calculate corporate carbon footprint following GHG Protocol"""
     
-    def __init__(self):
-        self.factors = EmissionFactors()
+    def __init__(self, factors: Optional[EmissionFactors] = None,
+                 registry: Optional[EmissionFactorRegistry] = None):
+        """
+        Args:
+            factors: Emission factors applied to every input (default: EmissionFactors())
+            registry: Region- and year-specific factors; when given, inputs are
+                costed with the factors for their 'region' and 'year' keys
+        """
+        self.factors = factors or EmissionFactors()
+        self.registry = registry
+    
+    def factors_for(self, data: Dict) -> EmissionFactors:
+        """Emission factors for one input (its region and year when a registry is set)"""
+        if self.registry is None:
+            return self.factors
+        return self.registry.emission_factors(data.get('region'), data.get('year'))
     
     def calculate_scope1_emissions(self, data: Dict) -> Tuple[float, Dict]:
         """
@@ -81,6 +260,7 @@ class CarbonFootprintCalculator:
             Total emissions (tCO2e) and breakdown
         """
         breakdown = {}
+        factors = self.factors_for(data)
         
         # Stationary combustion
         diesel_litres = data.get('diesel_litres', 0)
@@ -89,18 +269,18 @@ class CarbonFootprintCalculator:
         natural_gas_scm = data.get('natural_gas_scm', 0)
         coal_kg = data.get('coal_kg', 0)
         
-        breakdown['diesel'] = diesel_litres * self.factors.DIESEL / 1000
-        breakdown['petrol'] = petrol_litres * self.factors.PETROL / 1000
-        breakdown['lpg'] = lpg_litres * self.factors.LPG / 1000
-        breakdown['natural_gas'] = natural_gas_scm * self.factors.NATURAL_GAS / 1000
-        breakdown['coal'] = coal_kg * self.factors.COAL / 1000
+        breakdown['diesel'] = diesel_litres * factors.DIESEL / 1000
+        breakdown['petrol'] = petrol_litres * factors.PETROL / 1000
+        breakdown['lpg'] = lpg_litres * factors.LPG / 1000
+        breakdown['natural_gas'] = natural_gas_scm * factors.NATURAL_GAS / 1000
+        breakdown['coal'] = coal_kg * factors.COAL / 1000
         
         # Mobile combustion (company vehicles)
         fleet_diesel = data.get('fleet_diesel_litres', 0)
         fleet_petrol = data.get('fleet_petrol_litres', 0)
         
-        breakdown['fleet_diesel'] = fleet_diesel * self.factors.DIESEL / 1000
-        breakdown['fleet_petrol'] = fleet_petrol * self.factors.PETROL / 1000
+        breakdown['fleet_diesel'] = fleet_diesel * factors.DIESEL / 1000
+        breakdown['fleet_petrol'] = fleet_petrol * factors.PETROL / 1000
         
         # Fugitive emissions (refrigerants, etc.)
         refrigerant_kg = data.get('refrigerant_kg', 0)
@@ -123,19 +303,19 @@ class CarbonFootprintCalculator:
             Total emissions (tCO2e) and breakdown
         """
         breakdown = {}
+        factors = self.factors_for(data)
         
         # Grid electricity
         grid_kwh = data.get('grid_electricity_kwh', 0)
         renewable_kwh = data.get('renewable_electricity_kwh', 0)
         
         # Location-based method
-        breakdown['grid_electricity'] = grid_kwh * self.factors.GRID_ELECTRICITY / 1000
-        breakdown['renewable_electricity'] = renewable_kwh * self.factors.RENEWABLE_ELECTRICITY / 1000
+        breakdown['grid_electricity'] = grid_kwh * factors.GRID_ELECTRICITY / 1000
+        breakdown['renewable_electricity'] = renewable_kwh * factors.RENEWABLE_ELECTRICITY / 1000
         
         # Purchased steam/heating/cooling
         purchased_steam_gj = data.get('purchased_steam_gj', 0)
-        steam_factor = 66.5  # kg CO2e per GJ (approximate)
-        breakdown['purchased_steam'] = purchased_steam_gj * steam_factor / 1000
+        breakdown['purchased_steam'] = purchased_steam_gj * factors.PURCHASED_STEAM / 1000
         
         total = sum(breakdown.values())
         
@@ -152,6 +332,7 @@ class CarbonFootprintCalculator:
             Total emissions (tCO2e) and breakdown
         """
         breakdown = {}
+        factors = self.factors_for(data)
         
         # Category 1: Purchased goods and services (simplified)
         procurement_spend_cr = data.get('procurement_spend_cr', 0)
@@ -165,21 +346,20 @@ class CarbonFootprintCalculator:
         
         # Category 4: Upstream transportation
         freight_tkm = data.get('freight_tonne_km', 0)
-        freight_ef = 0.1  # kg CO2e per tonne-km (road average)
-        breakdown['upstream_transport'] = freight_tkm * freight_ef / 1000
+        breakdown['upstream_transport'] = freight_tkm * factors.FREIGHT_ROAD / 1000
         
         # Category 5: Waste generated
         waste_kg = data.get('waste_to_landfill_kg', 0)
-        breakdown['waste'] = waste_kg * self.factors.WASTE_LANDFILL / 1000
+        breakdown['waste'] = waste_kg * factors.WASTE_LANDFILL / 1000
         
         # Category 6: Business travel
         domestic_flight_km = data.get('domestic_flight_km', 0)
         intl_flight_km = data.get('international_flight_km', 0)
         train_km = data.get('train_km', 0)
         
-        breakdown['domestic_flights'] = domestic_flight_km * self.factors.DOMESTIC_FLIGHT / 1000
-        breakdown['international_flights'] = intl_flight_km * self.factors.INTERNATIONAL_FLIGHT / 1000
-        breakdown['train_travel'] = train_km * self.factors.TRAIN / 1000
+        breakdown['domestic_flights'] = domestic_flight_km * factors.DOMESTIC_FLIGHT / 1000
+        breakdown['international_flights'] = intl_flight_km * factors.INTERNATIONAL_FLIGHT / 1000
+        breakdown['train_travel'] = train_km * factors.TRAIN / 1000
         
         # Category 7: Employee commuting
         employees = data.get('total_employees', 0)
@@ -189,12 +369,12 @@ class CarbonFootprintCalculator:
         two_wheeler_pct = data.get('two_wheeler_commute_pct', 40) / 100
         
         total_commute_km = employees * avg_commute_km * 2 * working_days
-        breakdown['commute_car'] = total_commute_km * car_pct * self.factors.CAR_PETROL / 1000
-        breakdown['commute_two_wheeler'] = total_commute_km * two_wheeler_pct * self.factors.TWO_WHEELER / 1000
+        breakdown['commute_car'] = total_commute_km * car_pct * factors.CAR_PETROL / 1000
+        breakdown['commute_two_wheeler'] = total_commute_km * two_wheeler_pct * factors.TWO_WHEELER / 1000
         
         # Category 9: Downstream transportation
         downstream_freight_tkm = data.get('downstream_freight_tkm', 0)
-        breakdown['downstream_transport'] = downstream_freight_tkm * freight_ef / 1000
+        breakdown['downstream_transport'] = downstream_freight_tkm * factors.FREIGHT_ROAD / 1000
         
         total = sum(breakdown.values())
         
@@ -238,6 +418,103 @@ class CarbonFootprintCalculator:
             'scope3_pct': round(scope3_total / total_emissions * 100, 1) if total_emissions > 0 else 0,
         }
     
+    # -------------------------------------------------------------------------
+    # BATCH FOOTPRINTS
+    # -------------------------------------------------------------------------
+    
+    @staticmethod
+    def _column(df: pd.DataFrame, key: str, default: float) -> np.ndarray:
+        """Column as float array; missing columns and NaN cells take the default"""
+        if key not in df.columns:
+            return np.full(len(df), default, dtype=float)
+        return pd.to_numeric(df[key], errors='coerce').fillna(default).to_numpy(dtype=float)
+    
+    def _activity_matrix(self, df: pd.DataFrame) -> np.ndarray:
+        """(rows, activities) matrix in FOOTPRINT_ACTIVITIES order, same defaults as the dict path"""
+        col = lambda key, default=0: self._column(df, key, default)
+        
+        commute_km = col('total_employees') * col('avg_commute_km', 15) * 2 * col('working_days', 250)
+        derived = {
+            'refrigerant_co2e_kg': col('refrigerant_kg') * col('refrigerant_gwp', 1430),
+            'procurement_co2e_kg': col('procurement_spend_cr') * col('procurement_ef', 50) * 1000,
+            'commute_car_km': commute_km * col('car_commute_pct', 30) / 100,
+            'commute_two_wheeler_km': commute_km * col('two_wheeler_commute_pct', 40) / 100,
+        }
+        return np.column_stack([derived[column] if column in derived else col(column)
+                                for _, _, column, _ in FOOTPRINT_ACTIVITIES]).reshape(len(df), -1)
+    
+    def factor_vector(self) -> np.ndarray:
+        """kg CO2e per activity unit for each FOOTPRINT_ACTIVITIES entry"""
+        return np.array([1.0 if field_name is None else getattr(self.factors, field_name)
+                         for _, _, _, field_name in FOOTPRINT_ACTIVITIES])
+    
+    def factor_rows(self, df: pd.DataFrame) -> np.ndarray:
+        """
+        Emission factors per FOOTPRINT_ACTIVITIES entry: (activities,) without a
+        registry, else (rows, activities) joined on the region / year columns
+        """
+        if self.registry is None:
+            return self.factor_vector()
+        fields = [field_name for _, _, _, field_name in FOOTPRINT_ACTIVITIES]
+        regions = df['region'].to_numpy() if 'region' in df.columns else None
+        years = df['year'].to_numpy() if 'year' in df.columns else None
+        return self.registry.factor_matrix(fields, regions, years, len(df))
+    
+    def calculate_footprints(self, activities: pd.DataFrame,
+                             group_by: Optional[str] = None) -> pd.DataFrame:
+        """
+        Carbon footprint for many facilities / companies at once
+        
+        Args:
+            activities: One row per facility or company (facility-year), with the
+                same keys calculate_total_footprint() reads; missing columns and
+                NaN cells take the same defaults. With a registry, 'region' and
+                'year' columns pick the factors for each row
+            group_by: Optional column to sum facilities into (e.g. company);
+                revenue_cr and total_employees are summed too before intensities
+        
+        Returns:
+            DataFrame with total_emissions_tco2e, scope1/2/3_tco2e, one
+            scope<N>_<item> column per breakdown item, intensity_per_cr,
+            intensity_per_employee and scope1/2/3_pct (unrounded)
+        """
+        # Emissions (kg) = activity matrix x diagonal emission factor matrix
+        # (one factor row per input when a registry is set)
+        emissions = self._activity_matrix(activities) * self.factor_rows(activities) / 1000
+        scope_matrix = np.array([[scope == s for s in SCOPES] for scope, _, _, _ in FOOTPRINT_ACTIVITIES],
+                                dtype=float)
+        scope_totals = emissions @ scope_matrix
+        
+        # Scope 3 category 3 (upstream fuel) is a share of Scope 1
+        upstream_fuel = scope_totals[:, 0] * self._column(activities, 'fuel_upstream_factor', 0.15)
+        scope_totals[:, 2] += upstream_fuel
+        
+        columns = {}
+        for scope_index, scope in enumerate(SCOPES, 1):
+            columns[f'scope{scope_index}_tco2e'] = scope_totals[:, scope_index - 1]
+        for j, (scope, item, _, _) in enumerate(FOOTPRINT_ACTIVITIES):
+            columns[f'scope{SCOPES.index(scope) + 1}_{item}'] = emissions[:, j]
+            if item == 'purchased_goods':
+                columns['scope3_upstream_fuel'] = upstream_fuel
+        columns['revenue_cr'] = self._column(activities, 'revenue_cr', 1)
+        columns['total_employees'] = self._column(activities, 'total_employees', 1)
+        
+        result = pd.DataFrame(columns, index=activities.index)
+        if group_by is not None:
+            result = result.groupby(activities[group_by].to_numpy()).sum()
+            result.index.name = group_by
+        
+        total = result[['scope1_tco2e', 'scope2_tco2e', 'scope3_tco2e']].sum(axis=1)
+        result.insert(0, 'total_emissions_tco2e', total)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            result['intensity_per_cr'] = np.where(result['revenue_cr'] > 0, total / result['revenue_cr'], np.nan)
+            result['intensity_per_employee'] = np.where(result['total_employees'] > 0,
+                                                        total / result['total_employees'], np.nan)
+            for scope_index in (1, 2, 3):
+                result[f'scope{scope_index}_pct'] = np.where(
+                    total > 0, result[f'scope{scope_index}_tco2e'] / total * 100, 0.0)
+        return result.drop(columns=['revenue_cr', 'total_employees'])
+    
     def calculate_reduction_potential(self, footprint: Dict, targets: Dict) -> Dict:
         """Calculate emission reduction potential"""
         
@@ -332,13 +609,47 @@ class SDGMetricMapping:
         'stakeholder_engagement': [SDGGoal.SDG17],
         'responsible_tax': [SDGGoal.SDG1, SDGGoal.SDG17],
     }
+    
+    # SDG points a metric scoring 100 adds to each goal it maps to
+    METRIC_CONTRIBUTION = 20
+    
+    @classmethod
+    def metric_map(cls) -> Dict[str, List[SDGGoal]]:
+        """Environmental, social and governance maps merged, in that order"""
+        return {**cls.ENVIRONMENTAL_SDG_MAP, **cls.SOCIAL_SDG_MAP, **cls.GOVERNANCE_SDG_MAP}
+    
+    @classmethod
+    def alignment_matrix(cls) -> Tuple[List[str], np.ndarray]:
+        """
+        Metric keys and the (metrics, goals) contribution matrix
+        
+        Goals are columns in SDGGoal order; a 0-1 metric score row times the
+        matrix gives raw SDG points.
+        """
+        metric_map = cls.metric_map()
+        goals = list(SDGGoal)
+        matrix = np.zeros((len(metric_map), len(goals)))
+        for i, sdgs in enumerate(metric_map.values()):
+            for sdg in sdgs:
+                matrix[i, goals.index(sdg)] += cls.METRIC_CONTRIBUTION
+        return list(metric_map), matrix
 
 
 class SDGAlignmentMapper:
     """Map company activities to UN SDGs"""
     
+    PRIMARY_COUNT = 3
+    PRIMARY_THRESHOLD = 50
+    SECONDARY_COUNT = 5
+    SECONDARY_THRESHOLD = 30
+    # Scores are rounded before ranking and thresholds so that summation-order
+    # noise in the matrix product cannot break ties between goals
+    RANK_DECIMALS = 6
+    
     def __init__(self):
         self.mapping = SDGMetricMapping()
+        self.goals = list(SDGGoal)
+        self.metrics, self.matrix = self.mapping.alignment_matrix()
         
         # SDG targets and indicators (simplified)
         self.sdg_targets = {
@@ -370,48 +681,67 @@ class SDGAlignmentMapper:
         Returns:
             SDG alignment assessment
         """
-        sdg_scores = {goal: 0.0 for goal in SDGGoal}
-        sdg_contributions = {goal: [] for goal in SDGGoal}
-        
-        # Assess Environmental contributions
-        for metric, sdgs in self.mapping.ENVIRONMENTAL_SDG_MAP.items():
-            metric_score = esg_data.get(metric, 50) / 100  # Normalize to 0-1
-            for sdg in sdgs:
-                sdg_scores[sdg] += metric_score * 20  # Weight contribution
-                sdg_contributions[sdg].append(metric)
-        
-        # Assess Social contributions
-        for metric, sdgs in self.mapping.SOCIAL_SDG_MAP.items():
-            metric_score = esg_data.get(metric, 50) / 100
-            for sdg in sdgs:
-                sdg_scores[sdg] += metric_score * 20
-                sdg_contributions[sdg].append(metric)
-        
-        # Assess Governance contributions
-        for metric, sdgs in self.mapping.GOVERNANCE_SDG_MAP.items():
-            metric_score = esg_data.get(metric, 50) / 100
-            for sdg in sdgs:
-                sdg_scores[sdg] += metric_score * 20
-                sdg_contributions[sdg].append(metric)
+        row = self.assess_sdg_alignment_batch(pd.DataFrame([esg_data])).iloc[0]
         
-        # Normalize scores
-        max_score = max(sdg_scores.values()) if max(sdg_scores.values()) > 0 else 1
-        sdg_scores = {k: min(100, v / max_score * 100) for k, v in sdg_scores.items()}
-        
-        # Determine primary and secondary SDG focus
-        sorted_sdgs = sorted(sdg_scores.items(), key=lambda x: x[1], reverse=True)
-        primary_sdgs = [sdg for sdg, score in sorted_sdgs[:3] if score > 50]
-        secondary_sdgs = [sdg for sdg, score in sorted_sdgs[3:8] if score > 30]
+        sdg_contributions = {goal: [self.metrics[i] for i in np.flatnonzero(self.matrix[:, j])]
+                             for j, goal in enumerate(self.goals)}
+        ranked = lambda prefix, count: [SDGGoal[row[f'{prefix} SDG {k}']] for k in range(1, count + 1)
+                                        if row[f'{prefix} SDG {k}'] is not None]
         
         return {
-            'sdg_scores': sdg_scores,
+            'sdg_scores': {goal: float(row[goal.name]) for goal in self.goals},
             'sdg_contributions': sdg_contributions,
-            'primary_sdgs': primary_sdgs,
-            'secondary_sdgs': secondary_sdgs,
-            'total_sdgs_aligned': len([s for s, v in sdg_scores.items() if v > 30]),
-            'average_alignment': np.mean(list(sdg_scores.values()))
+            'primary_sdgs': ranked('Primary', self.PRIMARY_COUNT),
+            'secondary_sdgs': ranked('Secondary', self.SECONDARY_COUNT),
+            'total_sdgs_aligned': int(row['SDGs Aligned']),
+            'average_alignment': float(row['Average Alignment'])
         }
     
+    def assess_sdg_alignment_batch(self, esg_data: pd.DataFrame) -> pd.DataFrame:
+        """
+        SDG alignment for many companies at once
+        
+        Args:
+            esg_data: One row per company with 0-100 metric scores
+                (SDGMetricMapping keys); missing columns / NaN count as 50
+        
+        Returns:
+            One row per company (same index): a 0-100 score per goal (SDG1 ...
+            SDG17), Primary SDG 1-3 and Secondary SDG 1-5 (goal names, None
+            when below threshold), SDGs Aligned and Average Alignment
+        """
+        n = len(esg_data)
+        scores = np.column_stack([
+            pd.to_numeric(esg_data[metric], errors='coerce').fillna(50).to_numpy(dtype=float)
+            if metric in esg_data.columns else np.full(n, 50.0)
+            for metric in self.metrics
+        ]).reshape(n, len(self.metrics))
+        
+        # Raw SDG points, normalized so each company's strongest goal is 100
+        points = scores / 100 @ self.matrix
+        max_points = points.max(axis=1, keepdims=True)
+        sdg_scores = np.minimum(100, points / np.where(max_points > 0, max_points, 1) * 100)
+        
+        # Stable sort keeps SDGGoal order among ties
+        rounded = np.round(sdg_scores, self.RANK_DECIMALS)
+        order = np.argsort(-rounded, axis=1, kind='stable')
+        ranked = np.take_along_axis(rounded, order, axis=1)
+        names = np.array([goal.name for goal in self.goals], dtype=object)[order]
+        
+        result = pd.DataFrame(sdg_scores, index=esg_data.index, columns=[goal.name for goal in self.goals])
+        primary_end = self.PRIMARY_COUNT
+        secondary_end = primary_end + self.SECONDARY_COUNT
+        # Object columns so goals below threshold stay None (not NaN under string inference)
+        goal_column = lambda k, threshold: pd.Series(np.where(ranked[:, k] > threshold, names[:, k], None),
+                                                     index=esg_data.index, dtype=object)
+        for k in range(primary_end):
+            result[f'Primary SDG {k + 1}'] = goal_column(k, self.PRIMARY_THRESHOLD)
+        for k in range(primary_end, secondary_end):
+            result[f'Secondary SDG {k - primary_end + 1}'] = goal_column(k, self.SECONDARY_THRESHOLD)
+        result['SDGs Aligned'] = (rounded > self.SECONDARY_THRESHOLD).sum(axis=1)
+        result['Average Alignment'] = sdg_scores.mean(axis=1)
+        return result
+    
     def generate_sdg_report(self, company_name: str, alignment: Dict) -> str:
         """Generate SDG alignment report"""
         
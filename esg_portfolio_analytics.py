@@ -0,0 +1,171 @@
+# ============================================================================
+# NYZTRADE - PORTFOLIO ESG ANALYTICS
+# Carbon and SDG aggregation for many portfolios at once
+# ============================================================================
+
+"""
+Portfolio-level carbon and SDG analytics
+
+Aggregates per-holding data to portfolios:
+- WACI: weighted average carbon intensity (tCO2e per Rs Cr revenue)
+- Carbon footprint: tCO2e per Rs Cr invested (emissions / EVIC, PCAF style),
+  averaged over the holdings with emissions and value data
+- Financed emissions: emissions attributed to the covered holdings only,
+  i.e. carbon footprint x portfolio value x footprint coverage
+- Weighted pillar ESG scores and SDG alignment (SDG1 ... SDG17)
+
+Portfolios are rows of a portfolios x holdings weight matrix, so every
+metric for every portfolio is one matrix product with the per-holding
+metrics. Holdings without data are left out of the weighted averages and
+reported as coverage.
+
+Usage:
+    weights = PortfolioAnalytics.weight_matrix({'ESG Leaders': optimizer_output, 'Core': {'TCS': 40, 'INFY': 60}})
+    analytics = PortfolioAnalytics(esg_df, footprints=footprints, sdg=sdg_alignment)
+    report = analytics.analyze(weights, aum_cr=500)
+"""
+
+from typing import Dict, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from carbon_sdg_tools import SDGGoal
+
+
+SDG_COLUMNS = [goal.name for goal in SDGGoal]
+ESG_COLUMNS = ['Environmental', 'Social', 'Governance', 'Overall ESG']
+
+# Company value columns used to attribute emissions, in order of preference
+VALUE_COLUMNS = ['evic_cr', 'EVIC (Cr)', 'Market Cap (Cr)']
+
+PortfolioWeights = Union[pd.DataFrame, Dict[str, float]]
+
+
+class PortfolioAnalytics:
+    """Weighted carbon and SDG metrics for a portfolios x holdings weight matrix"""
+
+    def __init__(self, holdings: pd.DataFrame, footprints: Optional[pd.DataFrame] = None,
+                 sdg: Optional[pd.DataFrame] = None, scopes: Sequence[int] = (1, 2),
+                 value_column: Optional[str] = None):
+        """
+        Args:
+            holdings: One row per company (Symbol column or index), e.g. the
+                screener / score_universe table; ESG pillar columns, a value
+                column (VALUE_COLUMNS) and revenue_cr are used when present
+            footprints: Per-company footprints indexed by symbol, e.g.
+                calculate_footprints(activities, group_by='Symbol'); scope
+                columns in holdings are used when not given
+            sdg: Per-company SDG scores indexed by symbol
+                (assess_sdg_alignment_batch output)
+            scopes: Scopes counted in WACI and financed emissions
+            value_column: Company value for attribution (default: first of VALUE_COLUMNS)
+        """
+        frame = holdings.set_index('Symbol') if 'Symbol' in holdings.columns else holdings
+        for extra in (footprints, sdg):
+            if extra is not None:
+                frame = frame.join(extra[[c for c in extra.columns if c not in frame.columns]], how='left')
+        frame = frame[~frame.index.duplicated(keep='last')]
+        self.symbols = frame.index
+        column = lambda key: (pd.to_numeric(frame[key], errors='coerce').to_numpy(dtype=float)
+                              if key in frame.columns else np.full(len(frame), np.nan))
+
+        emissions = sum(column(f'scope{scope}_tco2e') for scope in scopes)
+        revenue = column('revenue_cr')
+        if np.isnan(revenue).all() and 'intensity_per_cr' in frame.columns:
+            # calculate_footprints() reports total intensity rather than revenue
+            revenue = column('total_emissions_tco2e') / column('intensity_per_cr')
+        value_column = value_column or next((c for c in VALUE_COLUMNS if c in frame.columns), None)
+        value = column(value_column) if value_column else np.full(len(frame), np.nan)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            self.intensity = np.where(revenue > 0, emissions / revenue, np.nan)
+            self.attribution = np.where(value > 0, emissions / value, np.nan)
+        self.esg_columns = [c for c in ESG_COLUMNS if c in frame.columns]
+        self.esg = (np.column_stack([column(c) for c in self.esg_columns]) if self.esg_columns
+                    else np.empty((len(frame), 0)))
+        self.sdg = np.column_stack([column(c) for c in SDG_COLUMNS]).reshape(len(frame), -1)
+
+    @staticmethod
+    def weight_matrix(portfolios: Dict[str, PortfolioWeights]) -> pd.DataFrame:
+        """
+        Portfolios x symbols weight matrix
+
+        Args:
+            portfolios: Name -> {symbol: weight} (tilt_portfolio_esg output) or a
+                DataFrame with Symbol and Weight columns (optimize_esg_portfolio output)
+        """
+        rows = {}
+        for name, weights in portfolios.items():
+            if isinstance(weights, pd.DataFrame):
+                weights = weights.groupby('Symbol')['Weight'].sum().to_dict()
+            rows[name] = weights
+        return pd.DataFrame.from_dict(rows, orient='index').fillna(0.0)
+
+    # -------------------------------------------------------------------------
+    # AGGREGATION
+    # -------------------------------------------------------------------------
+
+    def _weights(self, weights: pd.DataFrame) -> np.ndarray:
+        """(portfolios, holdings) weights on self.symbols, each row summing to 1 over all its symbols"""
+        totals = weights.sum(axis=1).to_numpy(dtype=float)
+        aligned = weights.reindex(columns=self.symbols, fill_value=0.0).to_numpy(dtype=float)
+        return aligned / np.where(totals > 0, totals, 1.0)[:, None]
+
+    @staticmethod
+    def _weighted_mean(w: np.ndarray, metrics: np.ndarray):
+        """Weighted mean over covered holdings and covered weight, per portfolio and metric"""
+        covered = ~np.isnan(metrics)
+        coverage = w @ covered
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mean = (w @ np.where(covered, metrics, 0.0)) / coverage
+        return np.where(coverage > 0, mean, np.nan), coverage
+
+    def analyze(self, weights: pd.DataFrame,
+                aum_cr: Optional[Union[float, pd.Series, Dict[str, float]]] = None) -> pd.DataFrame:
+        """
+        Carbon, ESG and SDG metrics per portfolio
+
+        Args:
+            weights: Portfolios x symbols weights (weight_matrix() output); rows
+                are normalized, so percentages and fractions both work
+            aum_cr: Portfolio value in Rs Cr (scalar, or per portfolio name)
+                for financed emissions
+
+        Returns:
+            One row per portfolio: Holdings, WACI, Carbon Footprint, Financed
+            Emissions (when aum_cr is given), Carbon Coverage % (of WACI),
+            Footprint Coverage %, weighted ESG pillars, SDG1 ... SDG17, Top SDG
+            and SDG Coverage %. WACI and Carbon Footprint are averages over
+            covered weight; Financed Emissions is not rescaled, so it equals
+            Carbon Footprint x aum_cr x Footprint Coverage % / 100.
+        """
+        w = self._weights(weights)
+        result = pd.DataFrame(index=weights.index)
+        result['Holdings'] = (weights.to_numpy(dtype=float) > 0).sum(axis=1)
+
+        waci, carbon_coverage = self._weighted_mean(w, self.intensity[:, None])
+        footprint, footprint_coverage = self._weighted_mean(w, self.attribution[:, None])
+        result['WACI (tCO2e/Cr revenue)'] = waci[:, 0]
+        result['Carbon Footprint (tCO2e/Cr invested)'] = footprint[:, 0]
+        if aum_cr is not None:
+            aum = (pd.Series(aum_cr).reindex(weights.index).to_numpy(dtype=float)
+                   if isinstance(aum_cr, (pd.Series, dict)) else np.full(len(weights), float(aum_cr)))
+            # Only covered holdings contribute; no extrapolation to the rest
+            result['Financed Emissions (tCO2e)'] = aum * (w @ np.nan_to_num(self.attribution))
+        result['Carbon Coverage %'] = carbon_coverage[:, 0] * 100
+        result['Footprint Coverage %'] = footprint_coverage[:, 0] * 100
+
+        if self.esg_columns:
+            esg, _ = self._weighted_mean(w, self.esg)
+            for j, name in enumerate(self.esg_columns):
+                result[name] = esg[:, j]
+
+        sdg, sdg_coverage = self._weighted_mean(w, self.sdg)
+        for j, name in enumerate(SDG_COLUMNS):
+            result[name] = sdg[:, j]
+        has_sdg = ~np.isnan(sdg).all(axis=1)
+        top = np.nan_to_num(sdg, nan=-1.0).argmax(axis=1)
+        result['Top SDG'] = np.where(has_sdg, np.array(SDG_COLUMNS, dtype=object)[top], None)
+        result['SDG Coverage %'] = sdg_coverage.max(axis=1) * 100
+        return result
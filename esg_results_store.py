@@ -0,0 +1,255 @@
+# ============================================================================
+# NYZTRADE - ESG RESULTS STORE
+# Parquet history of scoring runs with time-travel queries
+# ============================================================================
+
+"""
+Columnar store for ESG scoring runs
+
+Every scoring run is appended as Parquet files under a hive-partitioned
+directory tree (run_date=YYYY-MM-DD/sector=<sector>/), one row per company:
+- Pillar and overall scores, risk level, controversy
+- Per-metric scores (score_<metric key>) and input values (value_<metric key>)
+  for the BRSRDataProcessor.METRIC_SPECS metrics
+
+Queries read only the columns they ask for and skip partitions outside the
+requested dates / sectors, so history stays cheap to read as runs pile up.
+
+Usage:
+    store = ESGResultsStore()
+    calculator.score_universe(symbols, store=store)
+    latest = store.latest()
+    last_quarter = store.as_of('2024-06-30')
+"""
+
+import os
+import uuid
+from datetime import date, datetime
+from typing import List, Optional, Union
+
+import pandas as pd
+
+from esg_score_calculator import BRSRDataProcessor, CompanyESGProfile, ESGCategory
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+
+DEFAULT_RESULTS_PATH = os.path.join(os.path.expanduser('~'), '.local', 'share', 'nyztrade', 'esg_results')
+
+# Pillar/summary columns, in the order compare_companies() and score_universe() produce them
+SCORE_COLUMNS = ['Symbol', 'Company', 'Sector', 'Industry', 'Environmental', 'Social',
+                 'Governance', 'Overall ESG', 'Risk Level', 'Controversy']
+TEXT_COLUMNS = {'run_id', 'Symbol', 'Company', 'Sector', 'Industry', 'Risk Level'}
+
+DateLike = Union[str, date, datetime, pd.Timestamp]
+
+
+def _metric_specs():
+    return [spec for category in ESGCategory for spec in BRSRDataProcessor.METRIC_SPECS[category]]
+
+
+class ESGResultsStore:
+    """
+    Append-only Parquet store of ESG scoring runs
+
+    Rows carry run_id and run_ts (when the run was scored); partitions are
+    run_date and sector. "Latest" and "as of" queries pick, per symbol, the
+    row from the most recent run at or before the requested time.
+
+    Every file is written with the same schema (missing metrics are null),
+    so runs with and without per-metric data read back as one table.
+    """
+
+    PARTITION_FIELDS = ['run_date', 'sector']
+
+    def __init__(self, path: str = DEFAULT_RESULTS_PATH):
+        if not PYARROW_AVAILABLE:
+            raise ImportError("pyarrow not installed. Install with: pip install pyarrow")
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+
+        metric_columns = [f'{prefix}_{spec.key}' for spec in _metric_specs() for prefix in ('score', 'value')]
+        self.columns = ['run_id', 'run_ts'] + SCORE_COLUMNS + ['Data Year'] + metric_columns
+        partition_fields = [pa.field(name, pa.string()) for name in self.PARTITION_FIELDS]
+        self.partitioning = ds.partitioning(pa.schema(partition_fields), flavor='hive')
+        self.schema = pa.schema(
+            [pa.field(name, pa.timestamp('us') if name == 'run_ts' else
+                      pa.string() if name in TEXT_COLUMNS else pa.float64())
+             for name in self.columns] + partition_fields
+        )
+
+    # -------------------------------------------------------------------------
+    # WRITING
+    # -------------------------------------------------------------------------
+
+    def append_run(self, scores: pd.DataFrame, inputs: Optional[pd.DataFrame] = None,
+                   run_ts: Optional[datetime] = None) -> str:
+        """
+        Append one scoring run and return its run_id
+
+        Args:
+            scores: One row per company with SCORE_COLUMNS (score_universe() output)
+            inputs: Scoring inputs row-aligned with scores (same keys as
+                BRSRDataProcessor.score_batch); adds per-metric scores and values
+            run_ts: Time of the run (default: now)
+        """
+        frame = scores.reset_index(drop=True).copy()
+        if inputs is not None:
+            batch = BRSRDataProcessor.score_batch(inputs.reset_index(drop=True))
+            for j, key in enumerate(batch.metric_keys):
+                frame[f'score_{key}'] = batch.metric_scores[:, j]
+                frame[f'value_{key}'] = batch.values[:, j]
+        return self._write(frame, run_ts)
+
+    def append_profiles(self, profiles: List[CompanyESGProfile],
+                        run_ts: Optional[datetime] = None) -> str:
+        """Append CompanyESGProfile results (calculate_company_esg output) as one run"""
+        keys_by_name = {spec.name: spec.key for spec in _metric_specs()}
+        rows = []
+        for profile in profiles:
+            row = {
+                'Symbol': profile.symbol,
+                'Company': profile.company_name,
+                'Sector': profile.sector,
+                'Industry': profile.industry,
+                'Environmental': profile.environmental_score,
+                'Social': profile.social_score,
+                'Governance': profile.governance_score,
+                'Overall ESG': profile.overall_esg_score,
+                'Risk Level': profile.esg_risk_level.value,
+                'Controversy': profile.controversy_score,
+                'Data Year': profile.data_year,
+            }
+            for metric in profile.metrics:
+                key = keys_by_name.get(metric.name)
+                if key is not None:
+                    row[f'score_{key}'] = metric.score
+                    row[f'value_{key}'] = metric.value
+            rows.append(row)
+        return self._write(pd.DataFrame(rows), run_ts)
+
+    def _write(self, frame: pd.DataFrame, run_ts: Optional[datetime]) -> str:
+        if frame.empty:
+            raise ValueError("No rows to store")
+
+        run_ts = run_ts or datetime.now()
+        run_id = f"{run_ts.strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:8]}"
+
+        frame = frame.reindex(columns=self.columns)
+        frame['run_id'] = run_id
+        frame['run_ts'] = pd.Timestamp(run_ts)
+        frame['Sector'] = frame['Sector'].fillna('Unknown').astype(str)
+        frame['run_date'] = run_ts.strftime('%Y-%m-%d')
+        frame['sector'] = frame['Sector']
+
+        ds.write_dataset(
+            pa.Table.from_pandas(frame, schema=self.schema, preserve_index=False),
+            self.path,
+            format='parquet',
+            partitioning=self.partitioning,
+            basename_template=f"part-{run_id}-{{i}}.parquet",
+            existing_data_behavior='overwrite_or_ignore',
+        )
+        return run_id
+
+    # -------------------------------------------------------------------------
+    # QUERIES
+    # -------------------------------------------------------------------------
+
+    def _dataset(self) -> Optional['ds.Dataset']:
+        dataset = ds.dataset(self.path, schema=self.schema, format='parquet',
+                             partitioning=self.partitioning)
+        return dataset if dataset.files else None
+
+    @staticmethod
+    def _day(value: DateLike) -> str:
+        return pd.Timestamp(value).strftime('%Y-%m-%d')
+
+    def read(self, columns: Optional[List[str]] = None,
+             symbols: Optional[List[str]] = None,
+             sectors: Optional[List[str]] = None,
+             start: Optional[DateLike] = None,
+             end: Optional[DateLike] = None) -> pd.DataFrame:
+        """
+        Rows from all runs in [start, end], optionally limited to some columns
+
+        Date bounds and sectors prune partitions; symbols filter rows while
+        reading. run_id and run_ts are always included.
+        """
+        dataset = self._dataset()
+        if dataset is None:
+            return pd.DataFrame(columns=['run_id', 'run_ts'] + (columns or SCORE_COLUMNS))
+
+        condition = None
+
+        def add(expr):
+            nonlocal condition
+            condition = expr if condition is None else condition & expr
+
+        if start is not None:
+            add(ds.field('run_date') >= self._day(start))
+        if end is not None:
+            end_ts = pd.Timestamp(end)
+            add(ds.field('run_date') <= self._day(end_ts))
+            # A bare date means the whole day; a timestamp cuts within the day
+            if end_ts != end_ts.normalize():
+                add(ds.field('run_ts') <= pa.scalar(end_ts.to_pydatetime(), pa.timestamp('us')))
+        if sectors:
+            add(ds.field('sector').isin([str(s) for s in sectors]))
+        if symbols:
+            add(ds.field('Symbol').isin(list(symbols)))
+
+        if columns is not None:
+            available = set(dataset.schema.names)
+            columns = ['run_id', 'run_ts'] + [c for c in columns
+                                              if c in available and c not in ('run_id', 'run_ts')]
+
+        table = dataset.to_table(columns=columns, filter=condition)
+        frame = table.to_pandas()
+        return frame.sort_values(['run_ts', 'Symbol'] if 'Symbol' in frame.columns else ['run_ts'],
+                                 ignore_index=True)
+
+    def as_of(self, when: DateLike, columns: Optional[List[str]] = None,
+              symbols: Optional[List[str]] = None,
+              sectors: Optional[List[str]] = None) -> pd.DataFrame:
+        """Each symbol's row from its most recent run at or before `when`"""
+        return self._latest_rows(self.read(self._with_symbol(columns), symbols, sectors, end=when))
+
+    def latest(self, columns: Optional[List[str]] = None,
+               symbols: Optional[List[str]] = None,
+               sectors: Optional[List[str]] = None) -> pd.DataFrame:
+        """Each symbol's row from its most recent run"""
+        return self._latest_rows(self.read(self._with_symbol(columns), symbols, sectors))
+
+    def history(self, symbols: List[str], columns: Optional[List[str]] = None,
+                start: Optional[DateLike] = None,
+                end: Optional[DateLike] = None) -> pd.DataFrame:
+        """Score time series for some symbols, one row per symbol per run"""
+        return self.read(self._with_symbol(columns), symbols=symbols, start=start, end=end)
+
+    def runs(self) -> pd.DataFrame:
+        """One row per stored run: run_id, run_ts and company count"""
+        frame = self.read(columns=['Symbol'])
+        if frame.empty:
+            return pd.DataFrame(columns=['run_id', 'run_ts', 'companies'])
+        return (frame.groupby(['run_id', 'run_ts'], as_index=False)
+                .agg(companies=('Symbol', 'nunique'))
+                .sort_values('run_ts', ignore_index=True))
+
+    @staticmethod
+    def _with_symbol(columns: Optional[List[str]]) -> Optional[List[str]]:
+        if columns is None or 'Symbol' in columns:
+            return columns
+        return ['Symbol'] + list(columns)
+
+    @staticmethod
+    def _latest_rows(frame: pd.DataFrame) -> pd.DataFrame:
+        if frame.empty:
+            return frame
+        # read() sorts by run_ts, so the last row per symbol is the latest
+        return frame.drop_duplicates('Symbol', keep='last').sort_values('Symbol', ignore_index=True)
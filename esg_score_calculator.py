@@ -11,24 +11,22 @@ Author: NYZTrade
 Version: 1.0
 """
 
-import requests
 import pandas as pd
 import numpy as np
 import json
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple, Any
 import warnings
-import time
 from dataclasses import dataclass, field
 from enum import Enum
 import re
+import copy
+from concurrent.futures import ProcessPoolExecutor
 
-warnings.filterwarnings('ignore')
+from response_cache import ResponseCache, SingleFlight
+from nse_session import NSESession, NSE_BASE_URL
 
-print("=" * 80)
-print("🌿 NYZTRADE - ESG/SUSTAINABILITY SCORE CALCULATOR")
-print("📊 For Indian Listed Companies | BRSR Framework Compliant")
-print("=" * 80)
+warnings.filterwarnings('ignore')
 
 
 # ============================================================================
@@ -93,6 +91,120 @@ class CompanyESGProfile:
     data_year: int = 2024
 
 
+@dataclass(frozen=True)
+class MetricSpec:
+    """
+    Declarative description of a single BRSR metric transform
+
+    transform is one of:
+        'benchmark_ratio' -> clip(100 - value / benchmark * 50, 0, 100)
+        'linear_cap'      -> min(100, value * factor)
+        'linear_decline'  -> clip(offset - value * factor, 0, 100)
+        'penalty'         -> max(0, offset - value * factor)
+        'binary'          -> 100 if value >= 1 else 0
+    A benchmark_ratio metric whose benchmark is 0 or negative (a malformed
+    benchmark_* input, e.g. from the dashboard) scores a neutral 50 rather
+    than failing on division by zero or scoring 100.
+    """
+    key: str
+    name: str
+    category: ESGCategory
+    weight_key: str
+    default: float
+    transform: str
+    factor: float = 1.0
+    offset: float = 100.0
+    benchmark: float = 0.0
+    benchmark_key: str = ""
+    unit: str = ""
+    source: str = ""
+    description: str = ""
+
+
+# Metric transforms, shared by every scoring path. Arguments broadcast, so
+# factor / offset may be per-column arrays when several metrics are scored at once.
+# benchmark_ratio scores 50 wherever the benchmark is not positive (see MetricSpec).
+
+def _benchmark_ratio(values, benchmarks, factor, offset):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        scores = np.clip(100 - (values / benchmarks * 50), 0, 100)
+    return np.where(benchmarks > 0, scores, 50.0)
+
+
+def _linear_cap(values, benchmarks, factor, offset):
+    return np.minimum(100, values * factor)
+
+
+def _linear_decline(values, benchmarks, factor, offset):
+    return np.clip(offset - (values * factor), 0, 100)
+
+
+def _penalty(values, benchmarks, factor, offset):
+    return np.maximum(0, offset - (values * factor))
+
+
+def _binary(values, benchmarks, factor, offset):
+    return np.where(values >= 1, 100.0, 0.0)
+
+
+METRIC_TRANSFORMS = {
+    'benchmark_ratio': _benchmark_ratio,
+    'linear_cap': _linear_cap,
+    'linear_decline': _linear_decline,
+    'penalty': _penalty,
+    'binary': _binary,
+}
+
+
+@dataclass
+class BatchScoreResult:
+    """
+    Pillar and per-metric scores for many companies, held as NumPy arrays
+
+    Row i of every array belongs to row i of the scored DataFrame.
+    ESGMetric objects are only built on request via metrics().
+    """
+    index: pd.Index
+    metric_specs: List[MetricSpec]
+    values: np.ndarray          # (companies, metrics) input values after defaults
+    benchmarks: np.ndarray      # (companies, metrics) benchmark used per metric
+    metric_scores: np.ndarray   # (companies, metrics) 0-100 metric scores
+    environmental: np.ndarray
+    social: np.ndarray
+    governance: np.ndarray
+
+    @property
+    def metric_keys(self) -> List[str]:
+        return [spec.key for spec in self.metric_specs]
+
+    def metrics(self, row: int, weights: Optional[Dict[str, float]] = None) -> List[ESGMetric]:
+        """Build the ESGMetric list for one company, as the per-company path does"""
+        if weights is None:
+            weights = BRSRDataProcessor.category_weights()
+        return [
+            ESGMetric(
+                name=spec.name,
+                category=spec.category,
+                value=self.values[row, j],
+                weight=weights[spec.weight_key],
+                score=self.metric_scores[row, j],
+                benchmark=self.benchmarks[row, j],
+                unit=spec.unit,
+                source=spec.source,
+                description=spec.description
+            )
+            for j, spec in enumerate(self.metric_specs)
+        ]
+
+    def to_frame(self) -> pd.DataFrame:
+        """Pillar scores plus one column per metric score"""
+        df = pd.DataFrame(self.metric_scores, index=self.index, columns=self.metric_keys)
+        df.insert(0, 'Governance', self.governance)
+        df.insert(0, 'Social', self.social)
+        df.insert(0, 'Environmental', self.environmental)
+        return df
+
+
 # ============================================================================
 # ESG WEIGHTS AND BENCHMARKS (BRSR ALIGNED)
 # ============================================================================
@@ -250,6 +362,16 @@ class IndianSectorBenchmarks:
     }
 
 
+# Benchmark input columns filled from the industry's ENVIRONMENTAL_BENCHMARKS
+# entry: column -> (benchmark key, fallback). benchmark_ltifr is sector-independent.
+INDUSTRY_BENCHMARK_COLUMNS = {
+    'benchmark_carbon': ('carbon_emissions_intensity', 50),
+    'benchmark_energy': ('energy_consumption_intensity', 200),
+    'benchmark_water': ('water_consumption_intensity', 300),
+}
+LTIFR_BENCHMARK = 0.5
+
+
 # ============================================================================
 # NSE DATA FETCHER
 # ============================================================================
@@ -257,32 +379,39 @@ class IndianSectorBenchmarks:
 class NSEDataFetcher:
     """Fetch company data from NSE India"""
     
-    def __init__(self):
-        self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-            'Accept': 'application/json, text/plain, */*',
-            'Accept-Language': 'en-US,en;q=0.9',
-            'Referer': 'https://www.nseindia.com/',
-        }
-        self.session = requests.Session()
-        self.session.headers.update(self.headers)
-        self.base_url = "https://www.nseindia.com"
+    def __init__(self, cache: Optional[ResponseCache] = None,
+                 session: Optional[NSESession] = None):
+        # Cookies are warmed lazily on the first request and shared process-wide
+        self.session = session if session is not None else NSESession.shared()
+        self.headers = dict(self.session.headers)
+        self.base_url = NSE_BASE_URL
+        self.cache = cache
+        self._inflight = SingleFlight()
+    
+    def _get_json(self, url: str):
+        """
+        GET a URL and return parsed JSON (None on non-200), via the cache if set
         
-        # Initialize session
-        try:
-            self.session.get(self.base_url, timeout=10)
-            print("✅ Connected to NSE India")
-        except Exception as e:
-            print(f"⚠️ NSE connection warning: {e}")
+        Duplicate requests for the same URL share one in-flight request and
+        one parsed payload (treat returned payloads as read-only).
+        """
+        return self._inflight.do(url, lambda: self._fetch_json(url))
+    
+    def _fetch_json(self, url: str):
+        if self.cache is not None:
+            return self.cache.fetch_json(self.session, url, timeout=10)
+        response = self.session.get(url, timeout=10)
+        if response.status_code == 200:
+            return response.json()
+        return None
     
     def get_company_info(self, symbol: str) -> Optional[Dict]:
         """Fetch basic company information"""
         try:
             url = f"{self.base_url}/api/quote-equity?symbol={symbol}"
-            response = self.session.get(url, timeout=10)
+            data = self._get_json(url)
             
-            if response.status_code == 200:
-                data = response.json()
+            if data is not None:
                 return {
                     'symbol': symbol,
                     'company_name': data.get('info', {}).get('companyName', symbol),
@@ -303,11 +432,7 @@ class NSEDataFetcher:
         """Fetch corporate governance data from NSE"""
         try:
             url = f"{self.base_url}/api/quote-equity?symbol={symbol}&section=trade_info"
-            response = self.session.get(url, timeout=10)
-            
-            if response.status_code == 200:
-                return response.json()
-            return None
+            return self._get_json(url)
         except Exception as e:
             print(f"❌ Error fetching governance data: {e}")
             return None
@@ -316,10 +441,9 @@ class NSEDataFetcher:
         """Fetch shareholding pattern for governance analysis"""
         try:
             url = f"{self.base_url}/api/quote-equity?symbol={symbol}&section=trade_info"
-            response = self.session.get(url, timeout=10)
+            data = self._get_json(url)
             
-            if response.status_code == 200:
-                data = response.json()
+            if data is not None:
                 return data.get('shareholdingPatterns', {})
             return None
         except Exception as e:
@@ -349,479 +473,350 @@ class BRSRDataProcessor:
         'P8': 'Inclusive Growth',
         'P9': 'Customer Value'
     }
-    
+
+    # Metric transforms in the same order as the per-company score functions
+    # (order matters: pillar totals are accumulated left to right)
+    METRIC_SPECS = {
+        ESGCategory.ENVIRONMENTAL: [
+            MetricSpec('carbon_emissions_intensity', 'Carbon Emissions Intensity', ESGCategory.ENVIRONMENTAL,
+                       'carbon_emissions_intensity', 50, 'benchmark_ratio', benchmark=50,
+                       benchmark_key='benchmark_carbon', unit='tCO2e/Cr', source='BRSR - Principle 6',
+                       description='Scope 1 + Scope 2 emissions per crore revenue'),
+            MetricSpec('energy_consumption_intensity', 'Energy Consumption Intensity', ESGCategory.ENVIRONMENTAL,
+                       'energy_consumption_intensity', 200, 'benchmark_ratio', benchmark=200,
+                       benchmark_key='benchmark_energy', unit='GJ/Cr', source='BRSR - Principle 6',
+                       description='Total energy consumption per crore revenue'),
+            MetricSpec('renewable_energy_percentage', 'Renewable Energy Share', ESGCategory.ENVIRONMENTAL,
+                       'renewable_energy_percentage', 25, 'linear_cap', factor=2, benchmark=50,
+                       unit='%', source='BRSR - Principle 6',
+                       description='Percentage of renewable energy in total consumption'),
+            MetricSpec('water_consumption_intensity', 'Water Consumption Intensity', ESGCategory.ENVIRONMENTAL,
+                       'water_consumption_intensity', 300, 'benchmark_ratio', benchmark=300,
+                       benchmark_key='benchmark_water', unit='KL/Cr', source='BRSR - Principle 6',
+                       description='Water withdrawal per crore revenue'),
+            MetricSpec('waste_recycling_rate', 'Waste Recycling Rate', ESGCategory.ENVIRONMENTAL,
+                       'waste_recycling_rate', 65, 'linear_cap', factor=1.25, benchmark=80,
+                       unit='%', source='BRSR - Principle 6',
+                       description='Percentage of waste recycled or reused'),
+            MetricSpec('hazardous_waste_management', 'Hazardous Waste Management', ESGCategory.ENVIRONMENTAL,
+                       'hazardous_waste_management', 90, 'linear_cap', benchmark=100,
+                       unit='% compliance', source='BRSR - Principle 6',
+                       description='Proper disposal of hazardous waste'),
+            MetricSpec('environmental_compliance', 'Environmental Compliance', ESGCategory.ENVIRONMENTAL,
+                       'environmental_compliance', 95, 'linear_cap', benchmark=100,
+                       unit='% compliance', source='BRSR - Principle 6',
+                       description='Compliance with environmental regulations'),
+            MetricSpec('climate_risk_disclosure', 'Climate Risk Disclosure', ESGCategory.ENVIRONMENTAL,
+                       'climate_risk_disclosure', 60, 'linear_cap', benchmark=100,
+                       unit='% disclosure', source='TCFD Framework',
+                       description='TCFD-aligned climate risk disclosure'),
+            MetricSpec('biodiversity_initiatives', 'Biodiversity Initiatives', ESGCategory.ENVIRONMENTAL,
+                       'biodiversity_initiatives', 50, 'linear_cap', benchmark=100,
+                       unit='score', source='BRSR - Principle 6',
+                       description='Conservation and biodiversity efforts'),
+        ],
+        ESGCategory.SOCIAL: [
+            MetricSpec('ltifr', 'Employee Health & Safety', ESGCategory.SOCIAL,
+                       'employee_health_safety', 0.5, 'benchmark_ratio', benchmark=0.5,
+                       benchmark_key='benchmark_ltifr', unit='LTIFR', source='BRSR - Principle 3',
+                       description='Lost Time Injury Frequency Rate'),
+            MetricSpec('employee_turnover_rate', 'Employee Retention', ESGCategory.SOCIAL,
+                       'employee_turnover_rate', 15, 'linear_decline', factor=2, benchmark=10,
+                       unit='%', source='BRSR - Principle 3',
+                       description='Annual employee turnover rate'),
+            MetricSpec('women_workforce_percentage', 'Diversity & Inclusion', ESGCategory.SOCIAL,
+                       'diversity_inclusion', 25, 'linear_cap', factor=2.5, benchmark=40,
+                       unit='% women', source='BRSR - Principle 3',
+                       description='Women in workforce'),
+            MetricSpec('training_hours_per_employee', 'Training & Development', ESGCategory.SOCIAL,
+                       'training_development', 20, 'linear_cap', factor=2.5, benchmark=40,
+                       unit='hours/employee', source='BRSR - Principle 3',
+                       description='Average training hours per employee'),
+            MetricSpec('fair_wages', 'Fair Wages', ESGCategory.SOCIAL,
+                       'fair_wages', 100, 'linear_cap', benchmark=100,
+                       unit='% compliance', source='BRSR - Principle 3',
+                       description='Minimum wage compliance'),
+            MetricSpec('csr_spending_percentage', 'Community Investment', ESGCategory.SOCIAL,
+                       'community_investment', 2, 'linear_cap', factor=40, benchmark=2.5,
+                       unit='% of profit', source='BRSR - Principle 8',
+                       description='CSR spending as % of average net profit'),
+            MetricSpec('human_rights_compliance', 'Human Rights', ESGCategory.SOCIAL,
+                       'human_rights_compliance', 90, 'linear_cap', benchmark=100,
+                       unit='% compliance', source='BRSR - Principle 5',
+                       description='Human rights policy compliance'),
+            MetricSpec('customer_complaints_resolved', 'Customer Satisfaction', ESGCategory.SOCIAL,
+                       'customer_satisfaction', 95, 'linear_cap', benchmark=100,
+                       unit='% resolved', source='BRSR - Principle 9',
+                       description='Customer complaints resolution rate'),
+            MetricSpec('data_breaches', 'Data Privacy & Security', ESGCategory.SOCIAL,
+                       'data_privacy_security', 0, 'penalty', factor=20, benchmark=0,
+                       unit='breaches', source='BRSR - Principle 9',
+                       description='Number of data breach incidents'),
+            MetricSpec('labor_practices', 'Labor Practices', ESGCategory.SOCIAL,
+                       'labor_practices', 100, 'linear_cap', benchmark=100,
+                       unit='% compliance', source='BRSR - Principle 5',
+                       description='Child labor and forced labor compliance'),
+        ],
+        ESGCategory.GOVERNANCE: [
+            MetricSpec('independent_directors_percentage', 'Board Independence', ESGCategory.GOVERNANCE,
+                       'board_independence', 50, 'linear_cap', factor=1.5, benchmark=67,
+                       unit='%', source='SEBI LODR',
+                       description='Independent directors percentage'),
+            MetricSpec('women_directors_percentage', 'Board Diversity', ESGCategory.GOVERNANCE,
+                       'board_diversity', 17, 'linear_cap', factor=4, benchmark=25,
+                       unit='% women', source='SEBI LODR',
+                       description='Women on board'),
+            MetricSpec('audit_committee_meetings', 'Audit Committee', ESGCategory.GOVERNANCE,
+                       'audit_committee_quality', 4, 'linear_cap', factor=16.67, benchmark=6,
+                       unit='meetings/year', source='SEBI LODR',
+                       description='Audit committee meetings'),
+            MetricSpec('ceo_median_pay_ratio', 'Executive Compensation', ESGCategory.GOVERNANCE,
+                       'executive_compensation', 100, 'linear_decline', factor=0.5, offset=150, benchmark=100,
+                       unit='x median', source='BRSR - Principle 1',
+                       description='CEO to median employee pay ratio'),
+            MetricSpec('shareholder_rights', 'Shareholder Rights', ESGCategory.GOVERNANCE,
+                       'shareholder_rights', 80, 'linear_cap', benchmark=100,
+                       unit='score', source='SEBI LODR',
+                       description='Shareholder rights protection'),
+            MetricSpec('ethics_anti_corruption', 'Ethics & Anti-Corruption', ESGCategory.GOVERNANCE,
+                       'ethics_anti_corruption', 90, 'linear_cap', benchmark=100,
+                       unit='% compliance', source='BRSR - Principle 1',
+                       description='Anti-bribery and ethics compliance'),
+            MetricSpec('risk_management', 'Risk Management', ESGCategory.GOVERNANCE,
+                       'risk_management', 80, 'linear_cap', benchmark=100,
+                       unit='score', source='SEBI LODR',
+                       description='Enterprise risk management maturity'),
+            MetricSpec('tax_transparency', 'Tax Transparency', ESGCategory.GOVERNANCE,
+                       'tax_transparency', 70, 'linear_cap', benchmark=100,
+                       unit='% disclosure', source='BRSR - Principle 1',
+                       description='Tax disclosure and transparency'),
+            MetricSpec('related_party_transactions', 'Related Party Transactions', ESGCategory.GOVERNANCE,
+                       'related_party_transactions', 100, 'linear_cap', benchmark=100,
+                       unit='% compliance', source='SEBI LODR',
+                       description='RPT policy compliance'),
+            MetricSpec('sustainability_committee', 'Sustainability Committee', ESGCategory.GOVERNANCE,
+                       'sustainability_committee', 1, 'binary', benchmark=1,
+                       unit='exists', source='BRSR',
+                       description='Board-level ESG oversight'),
+        ],
+    }
+
     @staticmethod
-    def calculate_environmental_score(data: Dict) -> Tuple[float, List[ESGMetric]]:
-        """Calculate Environmental Score from BRSR data"""
-        metrics = []
-        weights = ESGWeightsConfig.ENVIRONMENTAL_WEIGHTS
-        
-        # Carbon Emissions Intensity
-        carbon_intensity = data.get('carbon_emissions_intensity', 50)
-        benchmark = data.get('benchmark_carbon', 50)
-        carbon_score = max(0, min(100, 100 - (carbon_intensity / benchmark * 50)))
-        metrics.append(ESGMetric(
-            name='Carbon Emissions Intensity',
-            category=ESGCategory.ENVIRONMENTAL,
-            value=carbon_intensity,
-            weight=weights['carbon_emissions_intensity'],
-            score=carbon_score,
-            benchmark=benchmark,
-            unit='tCO2e/Cr',
-            source='BRSR - Principle 6',
-            description='Scope 1 + Scope 2 emissions per crore revenue'
-        ))
-        
-        # Energy Consumption Intensity
-        energy_intensity = data.get('energy_consumption_intensity', 200)
-        benchmark_energy = data.get('benchmark_energy', 200)
-        energy_score = max(0, min(100, 100 - (energy_intensity / benchmark_energy * 50)))
-        metrics.append(ESGMetric(
-            name='Energy Consumption Intensity',
-            category=ESGCategory.ENVIRONMENTAL,
-            value=energy_intensity,
-            weight=weights['energy_consumption_intensity'],
-            score=energy_score,
-            benchmark=benchmark_energy,
-            unit='GJ/Cr',
-            source='BRSR - Principle 6',
-            description='Total energy consumption per crore revenue'
-        ))
-        
-        # Renewable Energy Percentage
-        renewable_pct = data.get('renewable_energy_percentage', 25)
-        renewable_score = min(100, renewable_pct * 2)  # 50% renewable = 100 score
-        metrics.append(ESGMetric(
-            name='Renewable Energy Share',
-            category=ESGCategory.ENVIRONMENTAL,
-            value=renewable_pct,
-            weight=weights['renewable_energy_percentage'],
-            score=renewable_score,
-            benchmark=50,
-            unit='%',
-            source='BRSR - Principle 6',
-            description='Percentage of renewable energy in total consumption'
-        ))
-        
-        # Water Consumption Intensity
-        water_intensity = data.get('water_consumption_intensity', 300)
-        benchmark_water = data.get('benchmark_water', 300)
-        water_score = max(0, min(100, 100 - (water_intensity / benchmark_water * 50)))
-        metrics.append(ESGMetric(
-            name='Water Consumption Intensity',
-            category=ESGCategory.ENVIRONMENTAL,
-            value=water_intensity,
-            weight=weights['water_consumption_intensity'],
-            score=water_score,
-            benchmark=benchmark_water,
-            unit='KL/Cr',
-            source='BRSR - Principle 6',
-            description='Water withdrawal per crore revenue'
-        ))
-        
-        # Waste Recycling Rate
-        waste_recycling = data.get('waste_recycling_rate', 65)
-        waste_score = min(100, waste_recycling * 1.25)  # 80% = 100 score
-        metrics.append(ESGMetric(
-            name='Waste Recycling Rate',
-            category=ESGCategory.ENVIRONMENTAL,
-            value=waste_recycling,
-            weight=weights['waste_recycling_rate'],
-            score=waste_score,
-            benchmark=80,
-            unit='%',
-            source='BRSR - Principle 6',
-            description='Percentage of waste recycled or reused'
-        ))
-        
-        # Hazardous Waste Management
-        hazardous_mgmt = data.get('hazardous_waste_management', 90)
-        hazardous_score = min(100, hazardous_mgmt)
-        metrics.append(ESGMetric(
-            name='Hazardous Waste Management',
-            category=ESGCategory.ENVIRONMENTAL,
-            value=hazardous_mgmt,
-            weight=weights['hazardous_waste_management'],
-            score=hazardous_score,
-            benchmark=100,
-            unit='% compliance',
-            source='BRSR - Principle 6',
-            description='Proper disposal of hazardous waste'
-        ))
-        
-        # Environmental Compliance
-        env_compliance = data.get('environmental_compliance', 95)
-        compliance_score = min(100, env_compliance)
-        metrics.append(ESGMetric(
-            name='Environmental Compliance',
-            category=ESGCategory.ENVIRONMENTAL,
-            value=env_compliance,
-            weight=weights['environmental_compliance'],
-            score=compliance_score,
-            benchmark=100,
-            unit='% compliance',
-            source='BRSR - Principle 6',
-            description='Compliance with environmental regulations'
-        ))
-        
-        # Climate Risk Disclosure (TCFD alignment)
-        climate_disclosure = data.get('climate_risk_disclosure', 60)
-        disclosure_score = min(100, climate_disclosure)
-        metrics.append(ESGMetric(
-            name='Climate Risk Disclosure',
-            category=ESGCategory.ENVIRONMENTAL,
-            value=climate_disclosure,
-            weight=weights['climate_risk_disclosure'],
-            score=disclosure_score,
-            benchmark=100,
-            unit='% disclosure',
-            source='TCFD Framework',
-            description='TCFD-aligned climate risk disclosure'
-        ))
-        
-        # Biodiversity Initiatives
-        biodiversity = data.get('biodiversity_initiatives', 50)
-        biodiversity_score = min(100, biodiversity)
-        metrics.append(ESGMetric(
-            name='Biodiversity Initiatives',
-            category=ESGCategory.ENVIRONMENTAL,
-            value=biodiversity,
-            weight=weights['biodiversity_initiatives'],
-            score=biodiversity_score,
-            benchmark=100,
-            unit='score',
-            source='BRSR - Principle 6',
-            description='Conservation and biodiversity efforts'
-        ))
-        
-        # Calculate weighted average
-        total_score = sum(m.score * m.weight for m in metrics)
-        
-        return total_score, metrics
-    
+    def category_weights() -> Dict[str, float]:
+        """Current metric weights from ESGWeightsConfig, keyed by weight key"""
+        weights = {}
+        weights.update(ESGWeightsConfig.ENVIRONMENTAL_WEIGHTS)
+        weights.update(ESGWeightsConfig.SOCIAL_WEIGHTS)
+        weights.update(ESGWeightsConfig.GOVERNANCE_WEIGHTS)
+        return weights
+
     @staticmethod
-    def calculate_social_score(data: Dict) -> Tuple[float, List[ESGMetric]]:
-        """Calculate Social Score from BRSR data"""
-        metrics = []
-        weights = ESGWeightsConfig.SOCIAL_WEIGHTS
-        
-        # Employee Health & Safety (LTIFR)
-        ltifr = data.get('ltifr', 0.5)
-        benchmark_ltifr = data.get('benchmark_ltifr', 0.5)
-        safety_score = max(0, min(100, 100 - (ltifr / benchmark_ltifr * 50)))
-        metrics.append(ESGMetric(
-            name='Employee Health & Safety',
-            category=ESGCategory.SOCIAL,
-            value=ltifr,
-            weight=weights['employee_health_safety'],
-            score=safety_score,
-            benchmark=benchmark_ltifr,
-            unit='LTIFR',
-            source='BRSR - Principle 3',
-            description='Lost Time Injury Frequency Rate'
-        ))
-        
-        # Employee Turnover Rate
-        turnover = data.get('employee_turnover_rate', 15)
-        turnover_score = max(0, min(100, 100 - (turnover * 2)))  # 50% turnover = 0
-        metrics.append(ESGMetric(
-            name='Employee Retention',
-            category=ESGCategory.SOCIAL,
-            value=turnover,
-            weight=weights['employee_turnover_rate'],
-            score=turnover_score,
-            benchmark=10,
-            unit='%',
-            source='BRSR - Principle 3',
-            description='Annual employee turnover rate'
-        ))
-        
-        # Diversity & Inclusion
-        women_workforce = data.get('women_workforce_percentage', 25)
-        diversity_score = min(100, women_workforce * 2.5)  # 40% = 100
-        metrics.append(ESGMetric(
-            name='Diversity & Inclusion',
-            category=ESGCategory.SOCIAL,
-            value=women_workforce,
-            weight=weights['diversity_inclusion'],
-            score=diversity_score,
-            benchmark=40,
-            unit='% women',
-            source='BRSR - Principle 3',
-            description='Women in workforce'
-        ))
-        
-        # Training & Development
-        training_hours = data.get('training_hours_per_employee', 20)
-        training_score = min(100, training_hours * 2.5)  # 40 hours = 100
-        metrics.append(ESGMetric(
-            name='Training & Development',
-            category=ESGCategory.SOCIAL,
-            value=training_hours,
-            weight=weights['training_development'],
-            score=training_score,
-            benchmark=40,
-            unit='hours/employee',
-            source='BRSR - Principle 3',
-            description='Average training hours per employee'
-        ))
-        
-        # Fair Wages
-        fair_wage_compliance = data.get('fair_wages', 100)
-        fair_wage_score = min(100, fair_wage_compliance)
-        metrics.append(ESGMetric(
-            name='Fair Wages',
-            category=ESGCategory.SOCIAL,
-            value=fair_wage_compliance,
-            weight=weights['fair_wages'],
-            score=fair_wage_score,
-            benchmark=100,
-            unit='% compliance',
-            source='BRSR - Principle 3',
-            description='Minimum wage compliance'
-        ))
-        
-        # Community Investment (CSR)
-        csr_spending = data.get('csr_spending_percentage', 2)
-        csr_score = min(100, csr_spending * 40)  # 2.5% = 100
-        metrics.append(ESGMetric(
-            name='Community Investment',
-            category=ESGCategory.SOCIAL,
-            value=csr_spending,
-            weight=weights['community_investment'],
-            score=csr_score,
-            benchmark=2.5,
-            unit='% of profit',
-            source='BRSR - Principle 8',
-            description='CSR spending as % of average net profit'
-        ))
-        
-        # Human Rights Compliance
-        human_rights = data.get('human_rights_compliance', 90)
-        hr_score = min(100, human_rights)
-        metrics.append(ESGMetric(
-            name='Human Rights',
-            category=ESGCategory.SOCIAL,
-            value=human_rights,
-            weight=weights['human_rights_compliance'],
-            score=hr_score,
-            benchmark=100,
-            unit='% compliance',
-            source='BRSR - Principle 5',
-            description='Human rights policy compliance'
-        ))
-        
-        # Customer Satisfaction
-        customer_complaints_resolved = data.get('customer_complaints_resolved', 95)
-        customer_score = min(100, customer_complaints_resolved)
-        metrics.append(ESGMetric(
-            name='Customer Satisfaction',
-            category=ESGCategory.SOCIAL,
-            value=customer_complaints_resolved,
-            weight=weights['customer_satisfaction'],
-            score=customer_score,
-            benchmark=100,
-            unit='% resolved',
-            source='BRSR - Principle 9',
-            description='Customer complaints resolution rate'
-        ))
-        
-        # Data Privacy & Security
-        data_breaches = data.get('data_breaches', 0)
-        privacy_score = max(0, 100 - (data_breaches * 20))  # Each breach -20 points
-        metrics.append(ESGMetric(
-            name='Data Privacy & Security',
-            category=ESGCategory.SOCIAL,
-            value=data_breaches,
-            weight=weights['data_privacy_security'],
-            score=privacy_score,
-            benchmark=0,
-            unit='breaches',
-            source='BRSR - Principle 9',
-            description='Number of data breach incidents'
-        ))
-        
-        # Labor Practices
-        labor_compliance = data.get('labor_practices', 100)
-        labor_score = min(100, labor_compliance)
-        metrics.append(ESGMetric(
-            name='Labor Practices',
-            category=ESGCategory.SOCIAL,
-            value=labor_compliance,
-            weight=weights['labor_practices'],
-            score=labor_score,
-            benchmark=100,
-            unit='% compliance',
-            source='BRSR - Principle 5',
-            description='Child labor and forced labor compliance'
-        ))
-        
-        # Calculate weighted average
-        total_score = sum(m.score * m.weight for m in metrics)
-        
-        return total_score, metrics
-    
+    def apply_transform(spec: MetricSpec, values: np.ndarray, benchmarks: np.ndarray) -> np.ndarray:
+        """Score one metric's values (any shape) with its transform"""
+        transform = METRIC_TRANSFORMS.get(spec.transform)
+        if transform is None:
+            raise ValueError(f"Unknown metric transform: {spec.transform}")
+        return transform(values, benchmarks, spec.factor, spec.offset)
+
     @staticmethod
-    def calculate_governance_score(data: Dict) -> Tuple[float, List[ESGMetric]]:
+    def _column(df: pd.DataFrame, key: str, default: float) -> np.ndarray:
+        """Column as float array; missing columns and NaN cells take the default"""
+        if key not in df.columns:
+            return np.full(len(df), default, dtype=float)
+        return pd.to_numeric(df[key], errors='coerce').fillna(default).to_numpy(dtype=float)
+
+    _compiled: Optional['CompiledScoringSpec'] = None
+
+    @classmethod
+    def compiled_spec(cls) -> 'CompiledScoringSpec':
+        """METRIC_SPECS compiled with the current weights (recompiled when they change)"""
+        weights = cls.category_weights()
+        if cls._compiled is None or cls._compiled.weight_table != weights:
+            cls._compiled = CompiledScoringSpec(cls.METRIC_SPECS, weights)
+        return cls._compiled
+
+    @classmethod
+    def score_batch(cls, df: pd.DataFrame) -> BatchScoreResult:
+        """
+        Score many companies in one vectorized pass
+
+        Args:
+            df: One row per company, one column per BRSR input key
+                (same keys the per-company functions read, including the
+                optional benchmark_* columns). Missing columns or NaN cells
+                fall back to the same defaults as the per-company path.
+
+        Returns:
+            BatchScoreResult with E/S/G pillar scores and the per-metric
+            score matrix. Pillar scores match calculate_*_score exactly.
+        """
+        return cls.compiled_spec().score_frame(df)
+
+    @classmethod
+    def calculate_pillar_scores(cls, data: Dict) -> Dict[ESGCategory, Tuple[float, List[ESGMetric]]]:
+        """Calculate E, S and G scores from BRSR data in one pass"""
+        return cls.compiled_spec().score_record_pillars(data)
+
+    @classmethod
+    def calculate_environmental_score(cls, data: Dict) -> Tuple[float, List[ESGMetric]]:
+        """Calculate Environmental Score from BRSR data"""
+        return cls.compiled_spec().score_record(data, ESGCategory.ENVIRONMENTAL)
+
+    @classmethod
+    def calculate_social_score(cls, data: Dict) -> Tuple[float, List[ESGMetric]]:
+        """Calculate Social Score from BRSR data"""
+        return cls.compiled_spec().score_record(data, ESGCategory.SOCIAL)
+
+    @classmethod
+    def calculate_governance_score(cls, data: Dict) -> Tuple[float, List[ESGMetric]]:
         """Calculate Governance Score from BRSR data"""
-        metrics = []
-        weights = ESGWeightsConfig.GOVERNANCE_WEIGHTS
-        
-        # Board Independence
-        independent_pct = data.get('independent_directors_percentage', 50)
-        independence_score = min(100, independent_pct * 1.5)  # 67% = 100
-        metrics.append(ESGMetric(
-            name='Board Independence',
-            category=ESGCategory.GOVERNANCE,
-            value=independent_pct,
-            weight=weights['board_independence'],
-            score=independence_score,
-            benchmark=67,
-            unit='%',
-            source='SEBI LODR',
-            description='Independent directors percentage'
-        ))
-        
-        # Board Diversity
-        women_board = data.get('women_directors_percentage', 17)
-        board_diversity_score = min(100, women_board * 4)  # 25% = 100
-        metrics.append(ESGMetric(
-            name='Board Diversity',
-            category=ESGCategory.GOVERNANCE,
-            value=women_board,
-            weight=weights['board_diversity'],
-            score=board_diversity_score,
-            benchmark=25,
-            unit='% women',
-            source='SEBI LODR',
-            description='Women on board'
-        ))
-        
-        # Audit Committee Quality
-        audit_meetings = data.get('audit_committee_meetings', 4)
-        audit_score = min(100, audit_meetings * 16.67)  # 6 meetings = 100
-        metrics.append(ESGMetric(
-            name='Audit Committee',
-            category=ESGCategory.GOVERNANCE,
-            value=audit_meetings,
-            weight=weights['audit_committee_quality'],
-            score=audit_score,
-            benchmark=6,
-            unit='meetings/year',
-            source='SEBI LODR',
-            description='Audit committee meetings'
-        ))
-        
-        # Executive Compensation (CEO Pay Ratio)
-        ceo_ratio = data.get('ceo_median_pay_ratio', 100)
-        # Lower ratio is better
-        exec_score = max(0, min(100, 150 - (ceo_ratio * 0.5)))
-        metrics.append(ESGMetric(
-            name='Executive Compensation',
-            category=ESGCategory.GOVERNANCE,
-            value=ceo_ratio,
-            weight=weights['executive_compensation'],
-            score=exec_score,
-            benchmark=100,
-            unit='x median',
-            source='BRSR - Principle 1',
-            description='CEO to median employee pay ratio'
-        ))
-        
-        # Shareholder Rights
-        shareholder_rights = data.get('shareholder_rights', 80)
-        rights_score = min(100, shareholder_rights)
-        metrics.append(ESGMetric(
-            name='Shareholder Rights',
-            category=ESGCategory.GOVERNANCE,
-            value=shareholder_rights,
-            weight=weights['shareholder_rights'],
-            score=rights_score,
-            benchmark=100,
-            unit='score',
-            source='SEBI LODR',
-            description='Shareholder rights protection'
-        ))
-        
-        # Ethics & Anti-Corruption
-        ethics_compliance = data.get('ethics_anti_corruption', 90)
-        ethics_score = min(100, ethics_compliance)
-        metrics.append(ESGMetric(
-            name='Ethics & Anti-Corruption',
-            category=ESGCategory.GOVERNANCE,
-            value=ethics_compliance,
-            weight=weights['ethics_anti_corruption'],
-            score=ethics_score,
-            benchmark=100,
-            unit='% compliance',
-            source='BRSR - Principle 1',
-            description='Anti-bribery and ethics compliance'
-        ))
-        
-        # Risk Management
-        risk_mgmt = data.get('risk_management', 80)
-        risk_score = min(100, risk_mgmt)
-        metrics.append(ESGMetric(
-            name='Risk Management',
-            category=ESGCategory.GOVERNANCE,
-            value=risk_mgmt,
-            weight=weights['risk_management'],
-            score=risk_score,
-            benchmark=100,
-            unit='score',
-            source='SEBI LODR',
-            description='Enterprise risk management maturity'
-        ))
-        
-        # Tax Transparency
-        tax_disclosure = data.get('tax_transparency', 70)
-        tax_score = min(100, tax_disclosure)
-        metrics.append(ESGMetric(
-            name='Tax Transparency',
-            category=ESGCategory.GOVERNANCE,
-            value=tax_disclosure,
-            weight=weights['tax_transparency'],
-            score=tax_score,
-            benchmark=100,
-            unit='% disclosure',
-            source='BRSR - Principle 1',
-            description='Tax disclosure and transparency'
-        ))
-        
-        # Related Party Transactions
-        rpt_compliance = data.get('related_party_transactions', 100)
-        rpt_score = min(100, rpt_compliance)
-        metrics.append(ESGMetric(
-            name='Related Party Transactions',
-            category=ESGCategory.GOVERNANCE,
-            value=rpt_compliance,
-            weight=weights['related_party_transactions'],
-            score=rpt_score,
-            benchmark=100,
-            unit='% compliance',
-            source='SEBI LODR',
-            description='RPT policy compliance'
-        ))
-        
-        # Sustainability Committee
-        sustainability_committee = data.get('sustainability_committee', 1)
-        committee_score = 100 if sustainability_committee >= 1 else 0
-        metrics.append(ESGMetric(
-            name='Sustainability Committee',
-            category=ESGCategory.GOVERNANCE,
-            value=sustainability_committee,
-            weight=weights['sustainability_committee'],
-            score=committee_score,
-            benchmark=1,
-            unit='exists',
-            source='BRSR',
-            description='Board-level ESG oversight'
-        ))
-        
-        # Calculate weighted average
-        total_score = sum(m.score * m.weight for m in metrics)
-        
-        return total_score, metrics
+        return cls.compiled_spec().score_record(data, ESGCategory.GOVERNANCE)
+
+
+# ============================================================================
+# COMPILED SCORING SPEC
+# ============================================================================
+
+def _number(value: Any, default: float) -> float:
+    """Input value as float; missing / non-numeric / NaN values take the default"""
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return default
+    return default if value != value else value
+
+
+class CompiledScoringSpec:
+    """
+    METRIC_SPECS and their weights compiled into flat arrays
+
+    The one scoring path behind BRSRDataProcessor (per company and batch)
+    and the Streamlit dashboard. Metrics sharing a transform are scored
+    together, so a pass is one NumPy expression per transform kind rather
+    than one per metric. Inputs may have any leading shape: (metrics,),
+    (companies, metrics) or (companies, simulations, metrics).
+
+    Usage:
+        spec = BRSRDataProcessor.compiled_spec()
+        pillars = spec.score_record_pillars(data)   # {category: (score, metrics)}
+        env_score, env_metrics = spec.score_record(data, ESGCategory.ENVIRONMENTAL)
+        batch = spec.score_frame(df)
+    """
+
+    def __init__(self, metric_specs: Dict[ESGCategory, List[MetricSpec]], weights: Dict[str, float]):
+        """
+        Args:
+            metric_specs: Per-category metric specs (BRSRDataProcessor.METRIC_SPECS)
+            weights: Metric weights keyed by weight key
+        """
+        self.specs = [spec for category in ESGCategory for spec in metric_specs[category]]
+        self.weight_table = dict(weights)
+        self.keys = [spec.key for spec in self.specs]
+        self.defaults = np.array([spec.default for spec in self.specs], dtype=float)
+        self.benchmarks = np.array([spec.benchmark for spec in self.specs], dtype=float)
+        self.factors = np.array([spec.factor for spec in self.specs], dtype=float)
+        self.offsets = np.array([spec.offset for spec in self.specs], dtype=float)
+        self.weights = np.array([weights[spec.weight_key] for spec in self.specs], dtype=float)
+        self.benchmark_keys = {j: spec.benchmark_key for j, spec in enumerate(self.specs) if spec.benchmark_key}
+        self.columns = {category: np.array([j for j, spec in enumerate(self.specs) if spec.category == category])
+                        for category in ESGCategory}
+
+        unknown = {spec.transform for spec in self.specs} - set(METRIC_TRANSFORMS)
+        if unknown:
+            raise ValueError(f"Unknown metric transform(s): {sorted(unknown)}")
+        self.transforms = [(METRIC_TRANSFORMS[name],
+                            np.array([j for j, spec in enumerate(self.specs) if spec.transform == name]))
+                           for name in METRIC_TRANSFORMS
+                           if any(spec.transform == name for spec in self.specs)]
+
+    # -------------------------------------------------------------------------
+    # INPUTS
+    # -------------------------------------------------------------------------
+
+    def frame_inputs(self, df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+        """(companies, metrics) values and benchmarks from a DataFrame of BRSR inputs"""
+        n = len(df)
+        values = np.column_stack([BRSRDataProcessor._column(df, key, default)
+                                  for key, default in zip(self.keys, self.defaults)]).reshape(n, -1)
+        benchmarks = np.tile(self.benchmarks, (n, 1))
+        for j, key in self.benchmark_keys.items():
+            benchmarks[:, j] = BRSRDataProcessor._column(df, key, self.benchmarks[j])
+        return values, benchmarks
+
+    def record_inputs(self, data: Dict) -> Tuple[np.ndarray, np.ndarray]:
+        """(metrics,) values and benchmarks from one company's input dict"""
+        values = np.array([_number(data.get(key), default)
+                           for key, default in zip(self.keys, self.defaults)])
+        benchmarks = self.benchmarks.copy()
+        for j, key in self.benchmark_keys.items():
+            benchmarks[j] = _number(data.get(key), self.benchmarks[j])
+        return values, benchmarks
+
+    # -------------------------------------------------------------------------
+    # EVALUATION
+    # -------------------------------------------------------------------------
+
+    def evaluate(self, values: np.ndarray, benchmarks: np.ndarray) -> np.ndarray:
+        """0-100 metric scores, same shape as values (metrics on the last axis)"""
+        scores = np.empty(np.broadcast(values, benchmarks).shape)
+        for transform, cols in self.transforms:
+            scores[..., cols] = transform(values[..., cols], benchmarks[..., cols],
+                                          self.factors[cols], self.offsets[cols])
+        return scores
+
+    def pillar_scores(self, scores: np.ndarray) -> Dict[ESGCategory, np.ndarray]:
+        """Weighted E/S/G totals over the last axis"""
+        pillars = {}
+        for category, cols in self.columns.items():
+            total = np.zeros(scores.shape[:-1])
+            # Accumulate in metric order so totals are the same on every path
+            for j in cols:
+                total = total + scores[..., j] * self.weights[j]
+            pillars[category] = total
+        return pillars
+
+    def score_frame(self, df: pd.DataFrame) -> BatchScoreResult:
+        """Score a DataFrame of BRSR inputs (see BRSRDataProcessor.score_batch)"""
+        values, benchmarks = self.frame_inputs(df)
+        scores = self.evaluate(values, benchmarks)
+        pillars = self.pillar_scores(scores)
+        return BatchScoreResult(
+            index=df.index,
+            metric_specs=self.specs,
+            values=values,
+            benchmarks=benchmarks,
+            metric_scores=scores,
+            environmental=pillars[ESGCategory.ENVIRONMENTAL],
+            social=pillars[ESGCategory.SOCIAL],
+            governance=pillars[ESGCategory.GOVERNANCE]
+        )
+
+    def score_record_pillars(self, data: Dict) -> Dict[ESGCategory, Tuple[float, List[ESGMetric]]]:
+        """Every pillar score and its ESGMetric list for one company's input dict, in one pass"""
+        values, benchmarks = self.record_inputs(data)
+        scores = self.evaluate(values, benchmarks)
+        totals = self.pillar_scores(scores)
+        return {
+            category: (float(totals[category]), [
+                ESGMetric(
+                    name=self.specs[j].name,
+                    category=category,
+                    value=float(values[j]),
+                    weight=self.weight_table[self.specs[j].weight_key],
+                    score=float(scores[j]),
+                    benchmark=float(benchmarks[j]),
+                    unit=self.specs[j].unit,
+                    source=self.specs[j].source,
+                    description=self.specs[j].description
+                )
+                for j in cols
+            ])
+            for category, cols in self.columns.items()
+        }
+    
+    def score_record(self, data: Dict, category: ESGCategory) -> Tuple[float, List[ESGMetric]]:
+        """One pillar score and its ESGMetric list for one company's input dict"""
+        return self.score_record_pillars(data)[category]
 
 
 # ============================================================================
@@ -831,13 +826,15 @@ class BRSRDataProcessor:
 class ESGScoreCalculator:
     """Main ESG Score Calculator"""
     
-    def __init__(self):
-        self.nse_fetcher = NSEDataFetcher()
+    def __init__(self, cache: Optional[ResponseCache] = None):
+        self.nse_fetcher = NSEDataFetcher(cache=cache)
         self.brsr_processor = BRSRDataProcessor()
         self.weights_config = ESGWeightsConfig()
         self.benchmarks = IndianSectorBenchmarks()
+        self.universe: Optional['UniverseScores'] = None   # inputs and scores of the last score_universe()
     
-    def get_risk_level(self, score: float) -> RiskLevel:
+    @staticmethod
+    def get_risk_level(score: float) -> RiskLevel:
         """Determine ESG risk level based on score"""
         if score >= 80:
             return RiskLevel.NEGLIGIBLE
@@ -862,75 +859,43 @@ class ESGScoreCalculator:
         return colors.get(risk_level, '#f39c12')
     
     def calculate_company_esg(self, symbol: str, 
-                              custom_data: Optional[Dict] = None) -> CompanyESGProfile:
+                              custom_data: Optional[Dict] = None,
+                              fetch_info: bool = True) -> CompanyESGProfile:
         """
         Calculate comprehensive ESG score for a company
         
         Args:
             symbol: NSE symbol of the company
             custom_data: Optional custom BRSR data (if available)
+            fetch_info: Look up company info on NSE. Skipped (no network
+                access) when False or when custom_data already has industry
+                and sector; company_name / market_cap are then read from
+                custom_data when present.
         
         Returns:
             CompanyESGProfile with complete ESG analysis
         """
         print(f"\n🔄 Calculating ESG Score for {symbol}...")
         
-        # Fetch company info from NSE
-        company_info = self.nse_fetcher.get_company_info(symbol)
-        
-        if company_info is None:
-            company_info = {
-                'symbol': symbol,
-                'company_name': symbol,
-                'industry': 'Unknown',
-                'sector': 'Unknown',
-                'market_cap': 0
-            }
+        # Fetch company info from NSE unless the caller's data already describes the company
+        if fetch_info and not (custom_data and custom_data.get('industry') and custom_data.get('sector')):
+            company_info = self.nse_fetcher.get_company_info(symbol)
+        else:
+            company_info = self._offline_company_info(symbol, custom_data or {})
+        company_info, custom_data = self._prepare_scoring_input(symbol, company_info, custom_data)
         
-        # Get industry-specific benchmarks
         industry = company_info.get('industry', 'Default')
         sector = company_info.get('sector', 'Default')
         
-        env_benchmarks = self.benchmarks.ENVIRONMENTAL_BENCHMARKS.get(
-            industry, self.benchmarks.ENVIRONMENTAL_BENCHMARKS['Default']
-        )
-        
-        # Prepare data for calculation
-        # Use custom data if provided, otherwise use default/simulated data
-        if custom_data is None:
-            # Generate sample data based on industry benchmarks
-            custom_data = self._generate_sample_data(industry, env_benchmarks)
-        
-        # Add benchmarks to data
-        custom_data.update({
-            'benchmark_carbon': env_benchmarks.get('carbon_emissions_intensity', 50),
-            'benchmark_energy': env_benchmarks.get('energy_consumption_intensity', 200),
-            'benchmark_water': env_benchmarks.get('water_consumption_intensity', 300),
-            'benchmark_ltifr': 0.5
-        })
-        
         # Calculate E, S, G scores
-        env_score, env_metrics = self.brsr_processor.calculate_environmental_score(custom_data)
-        social_score, social_metrics = self.brsr_processor.calculate_social_score(custom_data)
-        gov_score, gov_metrics = self.brsr_processor.calculate_governance_score(custom_data)
+        pillars = self.brsr_processor.calculate_pillar_scores(custom_data)
+        env_score, env_metrics = pillars[ESGCategory.ENVIRONMENTAL]
+        social_score, social_metrics = pillars[ESGCategory.SOCIAL]
+        gov_score, gov_metrics = pillars[ESGCategory.GOVERNANCE]
         
         # Apply industry weight adjustments
-        industry_adj = self.weights_config.INDUSTRY_ADJUSTMENTS.get(
-            industry, self.weights_config.INDUSTRY_ADJUSTMENTS['Default']
-        )
-        
-        # Calculate overall ESG score
-        category_weights = self.weights_config.CATEGORY_WEIGHTS
-        
-        adjusted_env_weight = category_weights[ESGCategory.ENVIRONMENTAL] * industry_adj['environmental']
-        adjusted_social_weight = category_weights[ESGCategory.SOCIAL] * industry_adj['social']
-        adjusted_gov_weight = category_weights[ESGCategory.GOVERNANCE] * industry_adj['governance']
-        
-        # Normalize weights
-        total_weight = adjusted_env_weight + adjusted_social_weight + adjusted_gov_weight
-        adjusted_env_weight /= total_weight
-        adjusted_social_weight /= total_weight
-        adjusted_gov_weight /= total_weight
+        adjusted_env_weight, adjusted_social_weight, adjusted_gov_weight = \
+            self._adjusted_category_weights(industry)
         
         overall_score = (
             env_score * adjusted_env_weight +
@@ -964,6 +929,81 @@ class ESGScoreCalculator:
         
         return profile
     
+    @staticmethod
+    def _offline_company_info(symbol: str, custom_data: Dict) -> Dict:
+        """Company info from the caller's data, for scoring without NSE"""
+        return {
+            'symbol': symbol,
+            'company_name': custom_data.get('company_name') or symbol,
+            'industry': custom_data.get('industry') or 'Unknown',
+            'sector': custom_data.get('sector') or 'Unknown',
+            'market_cap': custom_data.get('market_cap', 0)
+        }
+    
+    def _prepare_scoring_input(self, symbol: str, company_info: Optional[Dict],
+                               custom_data: Optional[Dict] = None) -> Tuple[Dict, Dict]:
+        """Fill in fallback company info, sample data and industry benchmarks"""
+        if company_info is None:
+            company_info = {
+                'symbol': symbol,
+                'company_name': symbol,
+                'industry': 'Unknown',
+                'sector': 'Unknown',
+                'market_cap': 0
+            }
+        
+        # Get industry-specific benchmarks
+        industry = company_info.get('industry', 'Default')
+        
+        env_benchmarks = self.benchmarks.ENVIRONMENTAL_BENCHMARKS.get(
+            industry, self.benchmarks.ENVIRONMENTAL_BENCHMARKS['Default']
+        )
+        
+        # Prepare data for calculation
+        # Use custom data if provided, otherwise use default/simulated data
+        if custom_data is None:
+            # Generate sample data based on industry benchmarks
+            custom_data = self._generate_sample_data(industry, env_benchmarks)
+        
+        # Add benchmarks to data
+        custom_data.update({
+            column: env_benchmarks.get(key, fallback)
+            for column, (key, fallback) in INDUSTRY_BENCHMARK_COLUMNS.items()
+        })
+        custom_data['benchmark_ltifr'] = LTIFR_BENCHMARK
+        
+        return company_info, custom_data
+    
+    @classmethod
+    def _adjusted_category_weights(cls, industry: str) -> Tuple[float, float, float]:
+        """Normalized E/S/G category weights after industry adjustment"""
+        industry_adj = ESGWeightsConfig.INDUSTRY_ADJUSTMENTS.get(
+            industry, ESGWeightsConfig.INDUSTRY_ADJUSTMENTS['Default']
+        )
+        return cls.normalized_category_weights(industry_adj)
+    
+    @staticmethod
+    def normalized_category_weights(industry_adj: Dict[str, float]) -> Tuple[float, float, float]:
+        """CATEGORY_WEIGHTS scaled by an industry adjustment entry, normalized to sum to 1"""
+        category_weights = ESGWeightsConfig.CATEGORY_WEIGHTS
+        
+        adjusted_env_weight = category_weights[ESGCategory.ENVIRONMENTAL] * industry_adj['environmental']
+        adjusted_social_weight = category_weights[ESGCategory.SOCIAL] * industry_adj['social']
+        adjusted_gov_weight = category_weights[ESGCategory.GOVERNANCE] * industry_adj['governance']
+        
+        # Normalize weights
+        total_weight = adjusted_env_weight + adjusted_social_weight + adjusted_gov_weight
+        return (adjusted_env_weight / total_weight,
+                adjusted_social_weight / total_weight,
+                adjusted_gov_weight / total_weight)
+    
+    @classmethod
+    def overall_scores(cls, env: np.ndarray, social: np.ndarray, gov: np.ndarray,
+                       industries: List[str]) -> np.ndarray:
+        """Vectorized overall ESG score with per-row industry adjustments"""
+        weights = np.array([cls._adjusted_category_weights(ind) for ind in industries]).reshape(-1, 3)
+        return env * weights[:, 0] + social * weights[:, 1] + gov * weights[:, 2]
+    
     def _generate_sample_data(self, industry: str, benchmarks: Dict) -> Dict:
         """Generate sample ESG data for demonstration"""
         np.random.seed(hash(industry) % 2**32)
@@ -1009,13 +1049,21 @@ class ESGScoreCalculator:
             'data_year': 2024
         }
     
-    def compare_companies(self, symbols: List[str]) -> pd.DataFrame:
-        """Compare ESG scores across multiple companies"""
+    def compare_companies(self, symbols: List[str], store=None) -> pd.DataFrame:
+        """
+        Compare ESG scores across multiple companies
+        
+        Args:
+            symbols: NSE symbols
+            store: Optional ESGResultsStore; the profiles are appended as one run
+        """
         results = []
+        profiles = []
         
         for symbol in symbols:
             try:
                 profile = self.calculate_company_esg(symbol)
+                profiles.append(profile)
                 results.append({
                     'Symbol': profile.symbol,
                     'Company': profile.company_name,
@@ -1031,8 +1079,79 @@ class ESGScoreCalculator:
             except Exception as e:
                 print(f"❌ Error processing {symbol}: {e}")
         
+        if store is not None and profiles:
+            store.append_profiles(profiles)
+        
         return pd.DataFrame(results)
     
+    def score_universe(self, symbols: List[str], workers: int = 4,
+                       chunk_size: int = 250, store=None) -> pd.DataFrame:
+        """
+        Score a whole universe of symbols, splitting fetching from scoring
+        
+        Company info is fetched first, scoring inputs are prepared in this
+        process (sample data is seeded from hash(), which differs between
+        interpreters), then the vectorized scoring runs in chunks across a
+        process pool.
+        
+        Args:
+            symbols: NSE symbols
+            workers: Number of scoring processes (<= 1 scores in-process)
+            chunk_size: Companies per scoring task
+            store: Optional ESGResultsStore; the run (with per-metric scores
+                and inputs) is appended to it
+        
+        Returns:
+            Same columns as compare_companies()
+        """
+        print(f"\n🔄 Fetching company info for {len(symbols)} symbols...")
+        infos = [self.nse_fetcher.get_company_info(symbol) for symbol in symbols]
+        
+        rows = []
+        for symbol, info in zip(symbols, infos):
+            info, data = self._prepare_scoring_input(symbol, info)
+            row = dict(data)
+            row.update({
+                'Symbol': symbol,
+                'Company': info.get('company_name', symbol),
+                'Sector': info.get('sector', 'Default'),
+                'Industry': info.get('industry', 'Default'),
+                'Controversy': data.get('controversy_score', 0),
+            })
+            rows.append(row)
+        
+        if not rows:
+            return pd.DataFrame()
+        
+        frame = pd.DataFrame(rows)
+        chunks = [frame.iloc[i:i + chunk_size] for i in range(0, len(frame), chunk_size)]
+        
+        print(f"⚙️ Scoring {len(frame)} companies in {len(chunks)} chunk(s)...")
+        if workers <= 1 or len(chunks) == 1:
+            batches = [BRSRDataProcessor.score_batch(chunk) for chunk in chunks]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                batches = list(executor.map(BRSRDataProcessor.score_batch, chunks))
+        
+        # The workers' per-metric scores seed the universe; nothing is scored twice
+        self.universe = UniverseScores(frame, batches=batches)
+        result = self.universe.to_frame()
+        if store is not None:
+            store.append_run(result, inputs=frame)
+        return result
+    
+    def rescore_universe(self, universe: Optional['UniverseScores'] = None) -> pd.DataFrame:
+        """
+        Rescore the last score_universe() run against the current weights and
+        benchmarks without refetching (see UniverseScores.rescore)
+        """
+        universe = universe or self.universe
+        if universe is None:
+            raise ValueError("No scored universe yet; run score_universe() first")
+        changes = universe.rescore()
+        print(f"♻️ Rescored {len(universe.industries)} companies: {changes}")
+        return universe.to_frame()
+    
     def generate_esg_report(self, profile: CompanyESGProfile) -> str:
         """Generate detailed ESG report"""
         report = []
@@ -1083,12 +1202,202 @@ class ESGScoreCalculator:
         return "\n".join(report)
 
 
+def _universe_frame(frame: pd.DataFrame, env: np.ndarray, social: np.ndarray,
+                    gov: np.ndarray, overall: np.ndarray) -> pd.DataFrame:
+    """score_universe() output columns for prepared inputs and their scores"""
+    # Python round() per value so results match compare_companies() exactly
+    overall_rounded = [round(x, 2) for x in overall.tolist()]
+    return pd.DataFrame({
+        'Symbol': frame['Symbol'].tolist(),
+        'Company': frame['Company'].tolist(),
+        'Sector': frame['Sector'].tolist(),
+        'Industry': frame['Industry'].tolist(),
+        'Environmental': [round(x, 2) for x in env.tolist()],
+        'Social': [round(x, 2) for x in social.tolist()],
+        'Governance': [round(x, 2) for x in gov.tolist()],
+        'Overall ESG': overall_rounded,
+        'Risk Level': [ESGScoreCalculator.get_risk_level(x).value for x in overall.tolist()],
+        'Controversy': frame['Controversy'].tolist()
+    })
+
+
+# ============================================================================
+# INCREMENTAL RESCORING
+# ============================================================================
+
+def _scoring_config() -> Dict:
+    """Copy of every weight and benchmark table the scores depend on"""
+    return copy.deepcopy({
+        'metric_weights': BRSRDataProcessor.category_weights(),
+        'category_weights': dict(ESGWeightsConfig.CATEGORY_WEIGHTS),
+        'industry_adjustments': ESGWeightsConfig.INDUSTRY_ADJUSTMENTS,
+        'environmental_benchmarks': IndianSectorBenchmarks.ENVIRONMENTAL_BENCHMARKS,
+        'ltifr_benchmark': LTIFR_BENCHMARK,
+    })
+
+
+class UniverseScores:
+    """
+    Raw scoring inputs and scores of a universe, rescored incrementally
+    
+    Keeps the per-metric inputs of a score_universe() run. When
+    ESGWeightsConfig weights or IndianSectorBenchmarks thresholds change,
+    rescore() compares them with the configuration the current scores were
+    built with and recomputes only what depends on the change:
+    - metric weights -> the pillar(s) holding those metrics
+    - industry benchmarks -> benchmark-based metric scores and their pillar,
+      for companies in the affected industries only
+    - category weights / industry adjustments -> overall scores
+    Results are identical to scoring the same inputs from scratch.
+    
+    Usage:
+        calculator.score_universe(symbols)
+        ESGWeightsConfig.ENVIRONMENTAL_WEIGHTS['carbon_emissions_intensity'] = 0.25
+        df = calculator.rescore_universe()
+    """
+    
+    def __init__(self, inputs: pd.DataFrame, batches: Optional[List[BatchScoreResult]] = None):
+        """
+        Args:
+            inputs: Prepared scoring inputs, one row per company (Symbol,
+                Company, Sector, Industry, Controversy and the metric keys)
+            batches: score_batch() results for consecutive row chunks of
+                inputs under the current configuration (score_universe's
+                workers); the inputs are scored here when not given
+        """
+        self.inputs = inputs.reset_index(drop=True)
+        spec = BRSRDataProcessor.compiled_spec()
+        self.specs = spec.specs
+        
+        # Benchmarks and adjustments are per industry: work on the unique industries
+        self.industries = self.inputs['Industry'].astype(str).to_numpy()
+        self._industry_names, self._industry_rows = np.unique(self.industries, return_inverse=True)
+        
+        self.config = _scoring_config()
+        if batches:
+            self.values = np.concatenate([batch.values for batch in batches])
+            self.benchmarks = np.concatenate([batch.benchmarks for batch in batches])
+            self.metric_scores = np.concatenate([batch.metric_scores for batch in batches])
+            self.pillars = {
+                ESGCategory.ENVIRONMENTAL: np.concatenate([batch.environmental for batch in batches]),
+                ESGCategory.SOCIAL: np.concatenate([batch.social for batch in batches]),
+                ESGCategory.GOVERNANCE: np.concatenate([batch.governance for batch in batches]),
+            }
+        else:
+            # Benchmarks come from the current tables, not from benchmark_* columns
+            # that may have been saved with the inputs
+            self.values, _ = spec.frame_inputs(self.inputs)
+            self.benchmarks = np.column_stack([self._benchmarks(j, self.config)
+                                               for j in range(len(self.specs))]).reshape(self.values.shape)
+            self.metric_scores = spec.evaluate(self.values, self.benchmarks)
+            self.pillars = spec.pillar_scores(self.metric_scores)
+        self._score_overall()
+    
+    # -------------------------------------------------------------------------
+    # SCORING STEPS
+    # -------------------------------------------------------------------------
+    
+    def _benchmark_by_industry(self, spec: MetricSpec, config: Dict) -> np.ndarray:
+        """Benchmark of one metric for each unique industry under a configuration"""
+        if spec.benchmark_key == 'benchmark_ltifr':
+            return np.full(len(self._industry_names), config['ltifr_benchmark'], dtype=float)
+        key, fallback = INDUSTRY_BENCHMARK_COLUMNS[spec.benchmark_key]
+        tables = config['environmental_benchmarks']
+        return np.array([tables.get(industry, tables['Default']).get(key, fallback)
+                         for industry in self._industry_names], dtype=float)
+    
+    def _benchmarks(self, j: int, config: Dict) -> np.ndarray:
+        """Benchmark of metric j for every company under a configuration"""
+        spec = self.specs[j]
+        if spec.benchmark_key:
+            return self._benchmark_by_industry(spec, config)[self._industry_rows]
+        return np.full(len(self.inputs), spec.benchmark, dtype=float)
+    
+    def _score_overall(self):
+        weights = np.array([ESGScoreCalculator._adjusted_category_weights(industry)
+                            for industry in self._industry_names]).reshape(-1, 3)[self._industry_rows]
+        self.overall = (self.pillars[ESGCategory.ENVIRONMENTAL] * weights[:, 0] +
+                        self.pillars[ESGCategory.SOCIAL] * weights[:, 1] +
+                        self.pillars[ESGCategory.GOVERNANCE] * weights[:, 2])
+    
+    # -------------------------------------------------------------------------
+    # INCREMENTAL UPDATE
+    # -------------------------------------------------------------------------
+    
+    def rescore(self) -> Dict[str, Any]:
+        """
+        Bring scores up to date with the current weights and benchmarks
+        
+        Returns:
+            What was recomputed: metric score columns, pillars, companies
+            whose benchmarks changed, and whether overall scores changed
+        """
+        old, self.config = self.config, _scoring_config()
+        changes = {'metrics': 0, 'pillars': [], 'companies': 0, 'overall': False}
+        n = len(self.inputs)
+        
+        # Benchmark metrics to rescore, for companies in industries whose benchmark changed
+        stale_rows = {}
+        for j, spec in enumerate(self.specs):
+            if spec.benchmark_key:
+                changed = self._benchmark_by_industry(spec, old) != self._benchmark_by_industry(spec, self.config)
+                rows = changed[self._industry_rows]
+                if rows.any():
+                    self.benchmarks[rows, j] = self._benchmarks(j, self.config)[rows]
+                    stale_rows[spec.category] = stale_rows.get(spec.category, np.zeros(n, dtype=bool)) | rows
+                    changes['metrics'] += 1
+        
+        spec = BRSRDataProcessor.compiled_spec()
+        if stale_rows:
+            stale = np.logical_or.reduce(list(stale_rows.values()))
+            self.metric_scores[stale] = spec.evaluate(self.values[stale], self.benchmarks[stale])
+            changes['companies'] = int(stale.sum())
+        
+        changed_weights = {key for key in set(old['metric_weights']) | set(self.config['metric_weights'])
+                           if old['metric_weights'].get(key) != self.config['metric_weights'].get(key)}
+        for category in ESGCategory:
+            if any(self.specs[j].weight_key in changed_weights for j in spec.columns[category]):
+                rows = np.ones(n, dtype=bool)
+            elif category in stale_rows:
+                rows = stale_rows[category]
+            else:
+                continue
+            self.pillars[category][rows] = spec.pillar_scores(self.metric_scores[rows])[category]
+            changes['pillars'].append(category.value)
+        
+        if (changes['pillars'] or old['category_weights'] != self.config['category_weights'] or
+                old['industry_adjustments'] != self.config['industry_adjustments']):
+            self._score_overall()
+            changes['overall'] = True
+        
+        return changes
+    
+    # -------------------------------------------------------------------------
+    # OUTPUT AND PERSISTENCE
+    # -------------------------------------------------------------------------
+    
+    def to_frame(self) -> pd.DataFrame:
+        """Scores in score_universe() format"""
+        return _universe_frame(self.inputs, self.pillars[ESGCategory.ENVIRONMENTAL],
+                               self.pillars[ESGCategory.SOCIAL],
+                               self.pillars[ESGCategory.GOVERNANCE], self.overall)
+    
+    def save(self, path: str):
+        """Keep the raw inputs so a later process can rescore without refetching"""
+        self.inputs.to_pickle(path)
+    
+    @classmethod
+    def load(cls, path: str) -> 'UniverseScores':
+        """Inputs saved by save(), scored against the current weights and benchmarks"""
+        return cls(pd.read_pickle(path))
+
+
 # ============================================================================
 # MAIN EXECUTION
 # ============================================================================
 
-def run_esg_analysis(symbols: List[str] = None):
-    """Run ESG analysis for given symbols"""
+def run_esg_analysis(symbols: List[str] = None, store=None):
+    """Run ESG analysis for given symbols (appended to `store` if given)"""
     
     if symbols is None:
         # Default NIFTY 50 sample
@@ -1099,10 +1408,10 @@ def run_esg_analysis(symbols: List[str] = None):
     print("🌿 NYZTRADE - ESG SCORE ANALYSIS")
     print("=" * 80)
     
-    calculator = ESGScoreCalculator()
+    calculator = ESGScoreCalculator(cache=ResponseCache())
     
     # Analyze companies
-    comparison_df = calculator.compare_companies(symbols)
+    comparison_df = calculator.compare_companies(symbols, store=store)
     
     if not comparison_df.empty:
         # Sort by Overall ESG score
@@ -1124,6 +1433,11 @@ def run_esg_analysis(symbols: List[str] = None):
 
 
 if __name__ == "__main__":
+    print("=" * 80)
+    print("🌿 NYZTRADE - ESG/SUSTAINABILITY SCORE CALCULATOR")
+    print("📊 For Indian Listed Companies | BRSR Framework Compliant")
+    print("=" * 80)
+    
     # Run analysis
     df, profile = run_esg_analysis()
     
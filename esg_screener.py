@@ -417,6 +417,34 @@ class ESGScreener:
         
         return merged.sort_values('ESG_Momentum', ascending=False)
     
+    def momentum_from_store(self,
+                            store,
+                            as_of: Optional[datetime] = None,
+                            lookback_days: int = 365) -> pd.DataFrame:
+        """
+        ESG momentum from stored scoring runs instead of two supplied frames
+        
+        Args:
+            store: ESGResultsStore with past scoring runs
+            as_of: Compare scores as of this date (default: latest run)
+            lookback_days: Distance back to the previous-period snapshot
+        
+        Returns:
+            DataFrame with momentum metrics (see calculate_esg_momentum)
+        """
+        columns = ['Company', 'Sector', 'Industry', 'Overall ESG',
+                   'Environmental', 'Social', 'Governance', 'Risk Level']
+        as_of = pd.Timestamp(as_of) if as_of is not None else pd.Timestamp(datetime.now())
+        current = store.as_of(as_of, columns=columns)
+        previous = store.as_of(as_of - pd.Timedelta(days=lookback_days), columns=columns)
+        
+        if current.empty or previous.empty:
+            print(f"⚠️ Not enough stored history for {lookback_days}-day momentum")
+            return pd.DataFrame()
+        
+        return self.calculate_esg_momentum(current.drop(columns=['run_id', 'run_ts']),
+                                           previous.drop(columns=['run_id', 'run_ts']))
+    
     def screen_by_risk_level(self,
                              df: pd.DataFrame,
                              max_risk: str = 'Medium') -> pd.DataFrame:
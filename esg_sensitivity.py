@@ -0,0 +1,362 @@
+# ============================================================================
+# NYZTRADE - ESG WEIGHT SENSITIVITY
+# How rankings move when ESGWeightsConfig weights change
+# ============================================================================
+
+"""
+Weight sensitivity analysis for ESG rankings
+
+Per-metric scores do not depend on weights, so a scored universe is
+reduced to its (companies x metrics) score matrix once. Each weight
+scenario is then one column of a weight matrix:
+- metric weights (ENVIRONMENTAL/SOCIAL/GOVERNANCE_WEIGHTS) -> pillar scores
+  via one matrix multiplication per pillar for all scenarios at once
+- CATEGORY_WEIGHTS x INDUSTRY_ADJUSTMENTS -> normalized E/S/G weights per
+  industry per scenario -> overall scores
+
+Scenarios are random perturbations around the current configuration or a
+grid sweep over chosen weights. Every scenario is ranked and compared with
+the baseline ranking: Kendall tau and top-N turnover per scenario, rank
+range, top-N share and a per-company Kendall tau for each company.
+
+Usage:
+    calculator.score_universe(symbols)
+    sensitivity = WeightSensitivity.from_universe(calculator.universe)
+    result = sensitivity.run(sensitivity.perturb(10000, scale=0.25), top_n=20)
+    result.companies.sort_values('Kendall Tau').head()
+"""
+
+import itertools
+from dataclasses import dataclass
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from esg_score_calculator import (
+    BRSRDataProcessor, BatchScoreResult, ESGCategory, ESGWeightsConfig, UniverseScores
+)
+
+
+PILLARS = list(ESGCategory)
+ADJUSTMENT_KEYS = ['environmental', 'social', 'governance']   # INDUSTRY_ADJUSTMENTS keys, pillar order
+
+# Overall scores are rounded before ranking so float noise between the
+# scenario matmul and the baseline cannot reorder tied companies
+RANK_DECIMALS = 6
+
+
+@dataclass
+class WeightScenarios:
+    """
+    A batch of weight configurations, one row per scenario
+
+    metric_weights follows BRSRDataProcessor.METRIC_SPECS order (E, S, G);
+    industry_adjustments follows WeightSensitivity.adjustment_industries.
+    """
+    metric_weights: np.ndarray          # (scenarios, metrics)
+    category_weights: np.ndarray        # (scenarios, 3) E/S/G
+    industry_adjustments: np.ndarray    # (scenarios, industries, 3) E/S/G multipliers
+    labels: pd.DataFrame                # scenario parameters, one row per scenario
+
+    def __len__(self) -> int:
+        return len(self.metric_weights)
+
+    def _slice(self, start: int, stop: int) -> 'WeightScenarios':
+        return WeightScenarios(self.metric_weights[start:stop], self.category_weights[start:stop],
+                               self.industry_adjustments[start:stop], self.labels.iloc[start:stop])
+
+
+@dataclass
+class SensitivityResult:
+    """Rank stability of a universe across weight scenarios"""
+    companies: pd.DataFrame     # one row per company, baseline rank order
+    scenarios: pd.DataFrame     # one row per scenario: parameters, Kendall Tau, Top-N Turnover
+    top_n: int
+
+
+class WeightSensitivity:
+    """
+    Evaluate many weight scenarios against a fixed per-metric score matrix
+
+    Ranks are 1 = highest overall score. Companies tied on score keep their
+    baseline order, so ties never count as rank changes.
+    """
+
+    def __init__(self, metric_scores: np.ndarray, industries: Sequence[str],
+                 symbols: Optional[Sequence[str]] = None):
+        """
+        Args:
+            metric_scores: (companies, metrics) 0-100 scores in
+                BRSRDataProcessor.METRIC_SPECS order
+            industries: Industry of each company (INDUSTRY_ADJUSTMENTS key;
+                unknown industries use 'Default')
+            symbols: Optional company labels for the result
+        """
+        self.specs = [spec for category in PILLARS for spec in BRSRDataProcessor.METRIC_SPECS[category]]
+        self.metric_scores = np.asarray(metric_scores, dtype=float)
+        if self.metric_scores.shape[1] != len(self.specs):
+            raise ValueError(f"Expected {len(self.specs)} metric columns, got {self.metric_scores.shape[1]}")
+
+        n = len(self.metric_scores)
+        self.industries = np.asarray(industries, dtype=str)
+        self.symbols = list(symbols) if symbols is not None else [str(i) for i in range(n)]
+        self.columns = [np.array([j for j, spec in enumerate(self.specs) if spec.category == category])
+                        for category in PILLARS]
+
+        # Base configuration as arrays
+        weights = BRSRDataProcessor.category_weights()
+        self.weight_keys = [spec.weight_key for spec in self.specs]
+        self.base_metric_weights = np.array([weights[key] for key in self.weight_keys], dtype=float)
+        self.base_category_weights = np.array([ESGWeightsConfig.CATEGORY_WEIGHTS[c] for c in PILLARS],
+                                              dtype=float)
+        self.adjustment_industries = list(ESGWeightsConfig.INDUSTRY_ADJUSTMENTS)
+        self.base_industry_adjustments = np.array(
+            [[ESGWeightsConfig.INDUSTRY_ADJUSTMENTS[industry][key] for key in ADJUSTMENT_KEYS]
+             for industry in self.adjustment_industries], dtype=float)
+        default = self.adjustment_industries.index('Default')
+        positions = {industry: i for i, industry in enumerate(self.adjustment_industries)}
+        self._adjustment_rows = np.array([positions.get(industry, default) for industry in self.industries],
+                                         dtype=np.intp)
+
+        # Work in baseline rank order: row i is the company ranked i + 1
+        base_overall = self._overall_scores(self.baseline())[:, 0]
+        self.order = np.argsort(-np.round(base_overall, RANK_DECIMALS), kind='stable')
+        self.base_overall = base_overall[self.order]
+        self._scores = self.metric_scores[self.order]
+        self._rows = self._adjustment_rows[self.order]
+
+    @classmethod
+    def from_universe(cls, universe: UniverseScores) -> 'WeightSensitivity':
+        """Sensitivity engine over a scored universe (score_universe / UniverseScores)"""
+        return cls(universe.metric_scores, universe.industries, universe.inputs['Symbol'].tolist())
+
+    @classmethod
+    def from_batch(cls, batch: BatchScoreResult, industries: Sequence[str],
+                   symbols: Optional[Sequence[str]] = None) -> 'WeightSensitivity':
+        """Sensitivity engine over a BRSRDataProcessor.score_batch() result"""
+        return cls(batch.metric_scores, industries, symbols)
+
+    # -------------------------------------------------------------------------
+    # SCENARIOS
+    # -------------------------------------------------------------------------
+
+    def _scenarios(self, count: int) -> WeightScenarios:
+        """`count` copies of the base configuration"""
+        return WeightScenarios(
+            metric_weights=np.tile(self.base_metric_weights, (count, 1)),
+            category_weights=np.tile(self.base_category_weights, (count, 1)),
+            industry_adjustments=np.tile(self.base_industry_adjustments, (count, 1, 1)),
+            labels=pd.DataFrame(index=pd.RangeIndex(count)),
+        )
+
+    def baseline(self) -> WeightScenarios:
+        """The current ESGWeightsConfig as a single scenario"""
+        return self._scenarios(1)
+
+    def perturb(self, count: int, scale: float = 0.2,
+                tables: Sequence[str] = ('category', 'metric', 'industry'),
+                seed: Optional[int] = None) -> WeightScenarios:
+        """
+        Random scenarios around the current weights
+
+        Every weight in the chosen tables is multiplied by an independent
+        factor drawn from U(1 - scale, 1 + scale). Metric weights are then
+        rescaled so each pillar keeps its base total (pillars stay 0-100).
+
+        Args:
+            count: Number of scenarios
+            scale: Relative perturbation size
+            tables: Any of 'category' (CATEGORY_WEIGHTS), 'metric'
+                (E/S/G metric weights) and 'industry' (INDUSTRY_ADJUSTMENTS)
+            seed: Random seed for reproducible scenarios
+        """
+        unknown = set(tables) - {'category', 'metric', 'industry'}
+        if unknown:
+            raise ValueError(f"Unknown weight tables: {sorted(unknown)}")
+
+        rng = np.random.default_rng(seed)
+        scenarios = self._scenarios(count)
+
+        def factors(shape):
+            return rng.uniform(1 - scale, 1 + scale, size=shape)
+
+        if 'category' in tables:
+            scenarios.category_weights *= factors(scenarios.category_weights.shape)
+        if 'metric' in tables:
+            weights = scenarios.metric_weights * factors(scenarios.metric_weights.shape)
+            for cols in self.columns:
+                weights[:, cols] *= (self.base_metric_weights[cols].sum() /
+                                     weights[:, cols].sum(axis=1, keepdims=True))
+            scenarios.metric_weights = weights
+        if 'industry' in tables:
+            scenarios.industry_adjustments *= factors(scenarios.industry_adjustments.shape)
+
+        shares = scenarios.category_weights / scenarios.category_weights.sum(axis=1, keepdims=True)
+        scenarios.labels = pd.DataFrame(shares, columns=[f'{c.value} Weight' for c in PILLARS])
+        return scenarios
+
+    def grid(self, sweeps: Dict[str, Sequence[float]]) -> WeightScenarios:
+        """
+        Grid sweep: one scenario per combination of the given weight values
+
+        Keys name a single weight; everything not swept keeps its base value:
+            'category.Environmental'             CATEGORY_WEIGHTS entry
+            'metric.carbon_emissions_intensity'  E/S/G metric weight (weight key)
+            'industry.Oil & Gas.environmental'   INDUSTRY_ADJUSTMENTS entry
+
+        Values are used as given (metric weights are not renormalized).
+        """
+        targets = [self._grid_target(name) for name in sweeps]
+        combos = list(itertools.product(*[list(values) for values in sweeps.values()]))
+        scenarios = self._scenarios(len(combos))
+        values = np.array(combos, dtype=float).reshape(len(combos), len(targets))
+
+        for k, (table, index) in enumerate(targets):
+            if table == 'category':
+                scenarios.category_weights[:, index] = values[:, k]
+            elif table == 'metric':
+                scenarios.metric_weights[:, index] = values[:, k][:, None]
+            else:
+                scenarios.industry_adjustments[:, index[0], index[1]] = values[:, k]
+
+        scenarios.labels = pd.DataFrame(values, columns=list(sweeps))
+        return scenarios
+
+    def _grid_target(self, name: str) -> Tuple[str, object]:
+        table, _, key = name.partition('.')
+        if table == 'category':
+            names = [c.value for c in PILLARS]
+            if key in names:
+                return table, names.index(key)
+        elif table == 'metric':
+            cols = [j for j, weight_key in enumerate(self.weight_keys) if weight_key == key]
+            if cols:
+                return table, cols
+        elif table == 'industry':
+            industry, _, adjustment = key.rpartition('.')
+            if industry in self.adjustment_industries and adjustment in ADJUSTMENT_KEYS:
+                return table, (self.adjustment_industries.index(industry), ADJUSTMENT_KEYS.index(adjustment))
+        raise ValueError(f"Unknown weight: {name}")
+
+    # -------------------------------------------------------------------------
+    # SCORING
+    # -------------------------------------------------------------------------
+
+    def _overall_scores(self, scenarios: WeightScenarios, scores: Optional[np.ndarray] = None,
+                        rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """(companies, scenarios) overall ESG scores"""
+        scores = self.metric_scores if scores is None else scores
+        rows = self._adjustment_rows if rows is None else rows
+
+        # Normalized E/S/G weights per scenario per industry (_adjusted_category_weights)
+        adjusted = scenarios.category_weights[:, None, :] * scenarios.industry_adjustments
+        adjusted /= adjusted.sum(axis=2, keepdims=True)
+
+        overall = np.zeros((len(scores), len(scenarios)))
+        for p, cols in enumerate(self.columns):
+            pillar = scores[:, cols] @ scenarios.metric_weights[:, cols].T
+            overall += pillar * adjusted[:, rows, p].T
+        return overall
+
+    def scores(self, scenarios: WeightScenarios) -> pd.DataFrame:
+        """Overall scores, one column per scenario, companies in input order"""
+        return pd.DataFrame(self._overall_scores(scenarios), index=self.symbols)
+
+    # -------------------------------------------------------------------------
+    # RANK STABILITY
+    # -------------------------------------------------------------------------
+
+    def run(self, scenarios: WeightScenarios, top_n: int = 10,
+            chunk_size: int = 2000) -> SensitivityResult:
+        """
+        Rank every scenario and summarize rank stability
+
+        Args:
+            scenarios: From perturb(), grid() or built by hand
+            top_n: Size of the top list for turnover and top-N share
+            chunk_size: Scenarios scored at a time (bounds memory)
+        """
+        n = len(self._scores)
+        total = len(scenarios)
+        top_n = min(top_n, n)
+        positions = np.arange(n)[:, None]
+
+        rank_sum = np.zeros(n)
+        rank_sq_sum = np.zeros(n)
+        best = np.full(n, n, dtype=np.int64)
+        worst = np.zeros(n, dtype=np.int64)
+        in_top = np.zeros(n)
+        discordant_sum = np.zeros(n)
+        taus, turnovers = [], []
+
+        for start in range(0, total, chunk_size):
+            chunk = scenarios._slice(start, min(start + chunk_size, total))
+            overall = np.round(self._overall_scores(chunk, self._scores, self._rows), RANK_DECIMALS)
+
+            # Stable sort of rows already in baseline order: ties keep baseline order
+            order = np.argsort(-overall, axis=0, kind='stable')
+            ranks = np.empty_like(order)
+            np.put_along_axis(ranks, order, np.broadcast_to(positions, order.shape), axis=0)
+
+            # Pairs ordered differently than in the baseline, per company
+            discordant = positions + ranks - 2 * _dominance_counts(ranks)
+
+            rank_sum += ranks.sum(axis=1)
+            rank_sq_sum += (ranks.astype(float) ** 2).sum(axis=1)
+            best = np.minimum(best, ranks.min(axis=1))
+            worst = np.maximum(worst, ranks.max(axis=1))
+            in_top += (ranks < top_n).sum(axis=1)
+            discordant_sum += discordant.sum(axis=1)
+
+            pairs = n * (n - 1) / 2
+            taus.append(1 - 2 * (discordant.sum(axis=0) / 2) / pairs if n > 1 else np.ones(len(chunk)))
+            turnovers.append((ranks[:top_n] >= top_n).sum(axis=0) / top_n)
+
+        mean_rank = rank_sum / total
+        companies = pd.DataFrame({
+            'Symbol': [self.symbols[i] for i in self.order],
+            'Industry': self.industries[self.order],
+            'Base Score': np.round(self.base_overall, 2),
+            'Base Rank': np.arange(1, n + 1),
+            'Mean Rank': np.round(mean_rank + 1, 2),
+            'Rank Std': np.round(np.sqrt(np.maximum(rank_sq_sum / total - mean_rank ** 2, 0)), 2),
+            'Best Rank': best + 1,
+            'Worst Rank': worst + 1,
+            'Top-N Share': in_top / total,
+            'Kendall Tau': 1 - 2 * discordant_sum / total / max(n - 1, 1),
+        })
+
+        summary = scenarios.labels.reset_index(drop=True).copy()
+        summary['Kendall Tau'] = np.concatenate(taus)
+        summary['Top-N Turnover'] = np.concatenate(turnovers)
+        return SensitivityResult(companies=companies, scenarios=summary, top_n=top_n)
+
+
+def _dominance_counts(ranks: np.ndarray) -> np.ndarray:
+    """
+    For each row i and column s: how many earlier rows (j < i) have a lower
+    rank in column s. All columns at once with one Fenwick tree per column.
+    """
+    n, k = ranks.shape
+    steps = max(n.bit_length(), 1)
+    size = 1 << steps                       # > n; node `size` absorbs overflowing updates
+    tree = np.zeros((size + 1) * k, dtype=np.int32)     # node-major: node * k + column
+    cols = np.arange(k, dtype=np.int64)
+    counts = np.empty((n, k), dtype=np.int64)
+
+    for i in range(n):
+        rank = ranks[i].astype(np.int64)
+        # Prefix count over nodes 1..rank (node 0 is never written)
+        node = rank.copy()
+        total = np.zeros(k, dtype=np.int64)
+        for _ in range(steps):
+            total += tree[node * k + cols]
+            node &= node - 1
+        counts[i] = total
+
+        node = rank + 1
+        for _ in range(steps):
+            tree[node * k + cols] += 1
+            node = np.minimum(node + (node & -node), size)
+    return counts
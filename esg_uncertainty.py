@@ -0,0 +1,276 @@
+# ============================================================================
+# NYZTRADE - ESG SCORE UNCERTAINTY
+# Monte Carlo bands for pillar and overall scores
+# ============================================================================
+
+"""
+Monte Carlo uncertainty bands for ESG scores
+
+Scores are computed from inputs that are often not disclosed (the
+calculator falls back to defaults such as ltifr = 0.5) or extracted from
+PDFs with limited confidence. This module puts a range on the result:
+
+- Missing inputs (NaN / absent columns, and the metrics brsr_batch_ingest
+  lists in fallback_metrics because to_esg_input() filled in a fallback)
+  are drawn from the observed values of the same metric in the company's
+  industry
+- Observed inputs are redrawn the same way with probability
+  1 - extraction_confidence / 100
+- Peer groups come from an Industry / industry / Sector column. Rows
+  without one (brsr_batch_ingest output without --industry-map) all fall
+  in one group, so pools are universe-wide and overall scores use the
+  Default category weights
+- Every simulation is scored with the compiled scoring spec,
+  and P5 / P50 / P95 are reported per pillar and for the overall score
+
+Usage:
+    bands = MonteCarloScorer(pd.read_parquet('brsr_inputs.parquet')).simulate(sims=1000)
+
+    python esg_uncertainty.py brsr_inputs.parquet -o esg_bands.parquet --sims 1000
+"""
+
+import sys
+import argparse
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from esg_score_calculator import BRSRDataProcessor, ESGCategory, ESGScoreCalculator, UniverseScores
+
+
+PILLARS = list(ESGCategory)
+BAND_COLUMNS = [category.value for category in PILLARS] + ['Overall ESG']
+
+# Identifier columns carried over to the output when present
+ID_COLUMNS = ['Symbol', 'Company', 'file', 'company_name']
+GROUP_COLUMNS = ['Industry', 'industry', 'Sector']
+
+# Values BRSRExtractedData.to_esg_input() substitutes when a metric was not found
+# (only used to guess missing inputs when no fallback_metrics column is available)
+TO_ESG_INPUT_FALLBACKS = {
+    'carbon_emissions_intensity': 50,
+    'energy_consumption_intensity': 200,
+    'renewable_energy_percentage': 25,
+    'water_consumption_intensity': 300,
+    'waste_recycling_rate': 65,
+    'ltifr': 0.5,
+    'employee_turnover_rate': 15,
+    'women_workforce_percentage': 25,
+    'training_hours_per_employee': 20,
+    'csr_spending_percentage': 2,
+    'customer_complaints_resolved': 95,
+    'independent_directors_percentage': 50,
+    'women_directors_percentage': 17,
+    'audit_committee_meetings': 4,
+    'ceo_median_pay_ratio': 100,
+}
+
+
+class MonteCarloScorer:
+    """
+    Sample uncertain inputs and score all simulations in batched NumPy
+
+    Sampling pools are the observed (non-missing) values of each metric per
+    industry group. Groups with fewer than `min_group_size` observations use
+    the whole universe; metrics nobody disclosed are drawn uniformly within
+    +/- `prior_spread` of the metric default.
+    """
+
+    def __init__(self, inputs: pd.DataFrame, group_by: Optional[str] = None,
+                 confidence_column: str = 'extraction_confidence',
+                 fallback_column: str = 'fallback_metrics',
+                 fallbacks_missing: bool = False, min_group_size: int = 5,
+                 prior_spread: float = 0.25):
+        """
+        Args:
+            inputs: One row per company with BRSR input keys (score_batch /
+                score_universe inputs or brsr_batch_ingest output)
+            group_by: Column defining peer groups (default: first of
+                Industry / industry / Sector present)
+            confidence_column: 0-100 extraction confidence per row; rows
+                without it (or with NaN) count as fully confident
+            fallback_column: Comma-separated metric keys per row that hold a
+                fallback rather than a disclosed value (brsr_batch_ingest);
+                those metrics count as missing
+            fallbacks_missing: Also treat inputs equal to their
+                TO_ESG_INPUT_FALLBACKS value as missing. This catches
+                fallbacks in inputs without fallback_column, but also
+                disclosures that happen to equal the fallback.
+            min_group_size: Observations a group needs to be its own pool
+            prior_spread: Relative spread of the prior for undisclosed metrics
+        """
+        self.inputs = inputs.reset_index(drop=True)
+        self.specs = [spec for category in PILLARS for spec in BRSRDataProcessor.METRIC_SPECS[category]]
+        self.min_group_size = min_group_size
+        self.prior_spread = prior_spread
+        n = len(self.inputs)
+
+        raw = np.column_stack([
+            pd.to_numeric(self.inputs[spec.key], errors='coerce').to_numpy(dtype=float)
+            if spec.key in self.inputs.columns else np.full(n, np.nan)
+            for spec in self.specs
+        ]).reshape(n, len(self.specs))
+        self.missing = np.isnan(raw)
+        if fallback_column in self.inputs.columns:
+            recorded = [set(str(keys).split(',')) if isinstance(keys, str) else set()
+                        for keys in self.inputs[fallback_column].tolist()]
+            for j, spec in enumerate(self.specs):
+                self.missing[:, j] |= np.array([spec.key in keys for keys in recorded], dtype=bool)
+        if fallbacks_missing:
+            for j, spec in enumerate(self.specs):
+                if spec.key in TO_ESG_INPUT_FALLBACKS:
+                    self.missing[:, j] |= raw[:, j] == TO_ESG_INPUT_FALLBACKS[spec.key]
+        defaults = np.array([spec.default for spec in self.specs], dtype=float)
+        self.values = np.where(self.missing, defaults, raw)
+        self._observed = np.where(self.missing, np.nan, raw)
+
+        self.benchmarks = np.column_stack([
+            BRSRDataProcessor._column(self.inputs, spec.benchmark_key, spec.benchmark)
+            if spec.benchmark_key else np.full(n, spec.benchmark, dtype=float)
+            for spec in self.specs
+        ]).reshape(n, len(self.specs))
+
+        if confidence_column in self.inputs.columns:
+            confidence = pd.to_numeric(self.inputs[confidence_column], errors='coerce').fillna(100)
+            self.confidence = np.clip(confidence.to_numpy(dtype=float) / 100, 0, 1)
+        else:
+            self.confidence = np.ones(n)
+
+        group_by = group_by or next((c for c in GROUP_COLUMNS if c in self.inputs.columns), None)
+        groups = (self.inputs[group_by].replace('', np.nan).fillna('Default').astype(str) if group_by
+                  else pd.Series('Default', index=self.inputs.index))
+        self.groups = groups.to_numpy()
+        self._group_names, self._group_codes = np.unique(self.groups, return_inverse=True)
+        self._pools: Dict = {}
+
+        # Overall weights follow the industry adjustments, as in calculate_company_esg
+        industry_column = next((c for c in ('Industry', 'industry') if c in self.inputs.columns), None)
+        industries = (self.inputs[industry_column].replace('', np.nan).fillna('Default').astype(str).tolist()
+                      if industry_column else ['Default'] * n)
+        self.category_weights = np.array([ESGScoreCalculator._adjusted_category_weights(industry)
+                                          for industry in industries]).reshape(n, 3)
+
+    @classmethod
+    def from_universe(cls, universe: UniverseScores, **kwargs) -> 'MonteCarloScorer':
+        """Monte Carlo over the inputs of a score_universe() run"""
+        return cls(universe.inputs, **kwargs)
+
+    # -------------------------------------------------------------------------
+    # SAMPLING
+    # -------------------------------------------------------------------------
+
+    def _pool(self, group: int, j: int) -> Optional[np.ndarray]:
+        """Observed values to draw metric j from for a group (None: use the prior)"""
+        key = (group, j)
+        if key not in self._pools:
+            column = self._observed[:, j]
+            pool = column[(self._group_codes == group) & ~np.isnan(column)]
+            if len(pool) < self.min_group_size:
+                pool = column[~np.isnan(column)]
+            self._pools[key] = pool if len(pool) else None
+        return self._pools[key]
+
+    def _draw(self, rng: np.random.Generator, group: int, j: int, size: int) -> np.ndarray:
+        pool = self._pool(group, j)
+        if pool is not None:
+            return pool[rng.integers(len(pool), size=size)]
+        spec = self.specs[j]
+        if spec.transform == 'binary':
+            return np.full(size, float(spec.default))
+        return spec.default * rng.uniform(1 - self.prior_spread, 1 + self.prior_spread, size=size)
+
+    def _sample(self, rng: np.random.Generator, rows: slice, sims: int) -> np.ndarray:
+        """(companies, sims, metrics) input values for a block of companies"""
+        values = np.repeat(self.values[rows][:, None, :], sims, axis=1)
+        replace = np.broadcast_to(self.missing[rows][:, None, :], values.shape)
+        confidence = self.confidence[rows]
+        if (confidence < 1).any():
+            redraw = rng.random(values.shape) >= confidence[:, None, None]
+            replace = replace | redraw
+
+        codes = self._group_codes[rows]
+        for j in range(len(self.specs)):
+            row_idx, sim_idx = np.nonzero(replace[:, :, j])
+            if not len(row_idx):
+                continue
+            cell_groups = codes[row_idx]
+            for group in np.unique(cell_groups):
+                cells = cell_groups == group
+                values[row_idx[cells], sim_idx[cells], j] = self._draw(rng, group, j, int(cells.sum()))
+        return values
+
+    # -------------------------------------------------------------------------
+    # SIMULATION
+    # -------------------------------------------------------------------------
+
+    def simulate(self, sims: int = 1000, percentiles: Sequence[float] = (5, 50, 95),
+                 seed: Optional[int] = None, block_cells: int = 4_000_000) -> pd.DataFrame:
+        """
+        Score `sims` simulations per company and return percentile bands
+
+        Args:
+            sims: Simulations per company
+            percentiles: Percentiles to report (columns '<Pillar> P<q>')
+            seed: Random seed for reproducible bands
+            block_cells: Companies x sims x metrics held in memory at a time
+
+        Returns:
+            Identifier columns, Group, Confidence, Imputed Inputs (count of
+            missing inputs), then the bands for each pillar and Overall ESG
+        """
+        rng = np.random.default_rng(seed)
+        spec = BRSRDataProcessor.compiled_spec()
+        n, m = self.values.shape
+        block = max(1, block_cells // max(sims * m, 1))
+        bands = {column: np.empty((len(percentiles), n)) for column in BAND_COLUMNS}
+
+        for start in range(0, n, block):
+            rows = slice(start, min(start + block, n))
+            values = self._sample(rng, rows, sims)
+            scores = spec.evaluate(values, self.benchmarks[rows][:, None, :])
+            by_category = spec.pillar_scores(scores)
+            pillars = [by_category[category] for category in PILLARS]
+
+            category_weights = self.category_weights[rows]
+            overall = sum(pillar * category_weights[:, p][:, None] for p, pillar in enumerate(pillars))
+
+            for column, scores in zip(BAND_COLUMNS, pillars + [overall]):
+                bands[column][:, rows] = np.percentile(scores, percentiles, axis=1)
+
+        result = self.inputs[[c for c in ID_COLUMNS if c in self.inputs.columns]].copy()
+        result['Group'] = self.groups
+        result['Confidence'] = np.round(self.confidence * 100, 1)
+        result['Imputed Inputs'] = self.missing.sum(axis=1)
+        for column in BAND_COLUMNS:
+            for q, band in zip(percentiles, bands[column]):
+                result[f'{column} P{q:g}'] = np.round(band, 2)
+        return result
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Monte Carlo ESG score bands for a table of BRSR inputs")
+    parser.add_argument('inputs', help="Parquet or CSV of scoring inputs (e.g. brsr_batch_ingest output)")
+    parser.add_argument('-o', '--output', default='esg_bands.parquet',
+                        help="Output file; .parquet or .csv (default: esg_bands.parquet)")
+    parser.add_argument('-n', '--sims', type=int, default=1000, help="Simulations per company (default: 1000)")
+    parser.add_argument('--seed', type=int, default=None, help="Random seed")
+    parser.add_argument('--group-by', default=None, help="Peer group column (default: industry)")
+    args = parser.parse_args(argv)
+
+    if args.inputs.lower().endswith('.parquet'):
+        inputs = pd.read_parquet(args.inputs)
+    else:
+        inputs = pd.read_csv(args.inputs)
+
+    bands = MonteCarloScorer(inputs, group_by=args.group_by).simulate(sims=args.sims, seed=args.seed)
+    if args.output.lower().endswith('.parquet'):
+        bands.to_parquet(args.output, index=False)
+    else:
+        bands.to_csv(args.output, index=False)
+    print(f"💾 Wrote {args.sims}-simulation bands for {len(bands)} companies to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,122 @@
+# ============================================================================
+# NYZTRADE - SHARED NSE SESSION
+# Lazily warmed requests session with a cookie refresh policy
+# ============================================================================
+
+"""
+NSE's JSON API only answers requests that carry the cookies set by a visit
+to the home page. Instead of each fetcher doing that visit in its
+constructor, one session per process is warmed on the first real request
+and re-warmed when the cookies get old or the API starts rejecting them.
+
+Constructing fetchers (or scoring only custom data) never touches the network.
+"""
+
+import threading
+import time
+from typing import Dict, Optional
+
+import requests
+
+
+NSE_BASE_URL = "https://www.nseindia.com"
+
+NSE_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+    'Accept': 'application/json, text/plain, */*',
+    'Accept-Language': 'en-US,en;q=0.9',
+    'Referer': 'https://www.nseindia.com/',
+}
+
+
+class NSESession:
+    """
+    requests.Session wrapper that warms NSE cookies on demand
+
+    Cookie policy:
+    - Warm up on the first request, not at construction
+    - Re-warm once cookies are older than `cookie_ttl` seconds
+    - On 401/403 drop the cookies, re-warm and retry the request once
+    - After a failed warm-up wait `retry_after` seconds before trying again,
+      so an unreachable NSE does not add a timeout to every call
+
+    Usage:
+        session = NSESession.shared()
+        response = session.get(f"{NSE_BASE_URL}/api/quote-equity?symbol=TCS", timeout=10)
+    """
+
+    _shared: Dict[str, 'NSESession'] = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, base_url: str = NSE_BASE_URL,
+                 headers: Optional[Dict[str, str]] = None,
+                 cookie_ttl: float = 15 * 60,
+                 retry_after: float = 60,
+                 warmup_timeout: float = 10):
+        self.base_url = base_url
+        self.cookie_ttl = cookie_ttl
+        self.retry_after = retry_after
+        self.warmup_timeout = warmup_timeout
+        self.session = requests.Session()
+        self.session.headers.update(NSE_HEADERS if headers is None else headers)
+        self.warmed_at: Optional[float] = None
+        self._failed_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def shared(cls, base_url: str = NSE_BASE_URL) -> 'NSESession':
+        """Process-wide session for a base URL"""
+        with cls._shared_lock:
+            session = cls._shared.get(base_url)
+            if session is None:
+                session = cls._shared[base_url] = cls(base_url)
+            return session
+
+    @property
+    def headers(self):
+        return self.session.headers
+
+    def is_warm(self) -> bool:
+        return self.warmed_at is not None and time.monotonic() - self.warmed_at < self.cookie_ttl
+
+    def ensure_warm(self) -> bool:
+        """Visit the home page if cookies are missing or expired; True if warm"""
+        if self.is_warm():
+            return True
+        with self._lock:
+            if self.is_warm():
+                return True
+            if self._failed_at is not None and time.monotonic() - self._failed_at < self.retry_after:
+                return False
+            try:
+                self.session.get(self.base_url, timeout=self.warmup_timeout)
+                self.warmed_at = time.monotonic()
+                self._failed_at = None
+                print("✅ NSE session initialized")
+                return True
+            except Exception as e:
+                self._failed_at = time.monotonic()
+                print(f"⚠️ NSE session warning: {e}")
+                return False
+
+    def invalidate(self):
+        """Forget the current cookies so the next request re-warms"""
+        with self._lock:
+            self.session.cookies.clear()
+            self.warmed_at = None
+            self._failed_at = None
+
+    def cookies(self) -> Dict[str, str]:
+        """Current cookies (warming first), e.g. to seed an async client"""
+        self.ensure_warm()
+        return self.session.cookies.get_dict()
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """GET with warm cookies; re-warms and retries once if NSE rejects them"""
+        self.ensure_warm()
+        response = self.session.get(url, **kwargs)
+        if response.status_code in (401, 403):
+            self.invalidate()
+            if self.ensure_warm():
+                response = self.session.get(url, **kwargs)
+        return response
@@ -0,0 +1,345 @@
+# ============================================================================
+# NYZTRADE - HTTP RESPONSE CACHE
+# Persistent on-disk cache for NSE/BSE JSON endpoints
+# ============================================================================
+
+"""
+Response cache shared by the NSE and BSE data fetchers
+
+Responses are stored in a single SQLite file keyed by URL:
+- Per-endpoint TTLs (quote, shareholding and filing data change at most daily)
+- Conditional revalidation with ETag / Last-Modified when the server sends them
+- Size-bounded LRU eviction
+- Offline mode that serves only from cache (also used to replay recorded
+  responses in tests)
+
+SingleFlight / AsyncSingleFlight coalesce duplicate requests so callers
+asking for the same URL at (nearly) the same time share one request.
+"""
+
+import os
+import json
+import asyncio
+import sqlite3
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+import requests
+
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser('~'), '.cache', 'nyztrade', 'responses.sqlite')
+
+
+@dataclass
+class CachedResponse:
+    """A stored response body with its validators"""
+    url: str
+    body: bytes
+    etag: Optional[str]
+    last_modified: Optional[str]
+    fetched_at: float
+
+    def age(self) -> float:
+        return time.time() - self.fetched_at
+
+    def json(self) -> Any:
+        return json.loads(self.body)
+
+
+class ResponseCache:
+    """
+    SQLite-backed HTTP response cache keyed by URL
+
+    Usage:
+        cache = ResponseCache()
+        fetcher = NSEDataFetcher(cache=cache)
+    """
+
+    # Time-to-live in seconds, matched by substring against the URL (first match wins)
+    DEFAULT_TTLS = {
+        'section=trade_info': 24 * 3600,          # shareholding / trade info
+        '/api/quote-equity': 12 * 3600,           # company quote and metadata
+        'corporates-boardMeetings': 24 * 3600,
+        'corporates-corporateActions': 24 * 3600,
+        'StockReachGraph': 12 * 3600,             # BSE company info
+    }
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH,
+                 max_bytes: int = 200 * 1024 * 1024,
+                 ttls: Optional[Dict[str, float]] = None,
+                 default_ttl: float = 24 * 3600,
+                 offline: bool = False):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttls = dict(self.DEFAULT_TTLS if ttls is None else ttls)
+        self.default_ttl = default_ttl
+        self.offline = offline
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS responses (
+                url TEXT PRIMARY KEY,
+                body BLOB NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                size INTEGER NOT NULL
+            )
+        ''')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_accessed ON responses (accessed_at)')
+        self._conn.commit()
+
+    # -------------------------------------------------------------------------
+    # STORAGE
+    # -------------------------------------------------------------------------
+
+    def ttl_for(self, url: str) -> float:
+        """TTL for a URL based on the endpoint it targets"""
+        for pattern, ttl in self.ttls.items():
+            if pattern in url:
+                return ttl
+        return self.default_ttl
+
+    def get(self, url: str) -> Optional[CachedResponse]:
+        """Look up a stored response (fresh or stale) and mark it as recently used"""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT body, etag, last_modified, fetched_at FROM responses WHERE url = ?', (url,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute('UPDATE responses SET accessed_at = ? WHERE url = ?', (time.time(), url))
+            self._conn.commit()
+        body, etag, last_modified, fetched_at = row
+        return CachedResponse(url, zlib.decompress(body), etag, last_modified, fetched_at)
+
+    def put(self, url: str, body: bytes, etag: Optional[str] = None,
+            last_modified: Optional[str] = None):
+        """Store a response body and evict least recently used entries if over budget"""
+        compressed = zlib.compress(body)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (url, compressed, etag, last_modified, now, now, len(compressed))
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        """Drop least recently used entries until the cache fits in max_bytes"""
+        total = self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for url, size in self._conn.execute(
+                'SELECT url, size FROM responses ORDER BY accessed_at ASC').fetchall():
+            if total <= self.max_bytes:
+                break
+            self._conn.execute('DELETE FROM responses WHERE url = ?', (url,))
+            total -= size
+
+    def _mark_revalidated(self, url: str):
+        with self._lock:
+            self._conn.execute('UPDATE responses SET fetched_at = ? WHERE url = ?', (time.time(), url))
+            self._conn.commit()
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute('DELETE FROM responses')
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    # -------------------------------------------------------------------------
+    # FETCHING
+    # -------------------------------------------------------------------------
+
+    def lookup(self, url: str) -> Tuple[Optional[CachedResponse], bool]:
+        """Return (stored entry, whether it can be served without a request)"""
+        entry = self.get(url)
+        servable = entry is not None and (self.offline or entry.age() < self.ttl_for(url))
+        if servable:
+            self.hits += 1
+        elif self.offline:
+            self.misses += 1
+        return entry, servable
+
+    @staticmethod
+    def conditional_headers(entry: Optional[CachedResponse]) -> Dict[str, str]:
+        """Revalidation headers for a stale entry"""
+        headers = {}
+        if entry is not None:
+            if entry.etag:
+                headers['If-None-Match'] = entry.etag
+            if entry.last_modified:
+                headers['If-Modified-Since'] = entry.last_modified
+        return headers
+
+    def store_response(self, url: str, entry: Optional[CachedResponse], status: int,
+                       body: bytes, headers) -> Optional[Any]:
+        """Record a network response and return the JSON to hand back to the caller"""
+        if status == 304 and entry is not None:
+            self.revalidated += 1
+            self._mark_revalidated(url)
+            return entry.json()
+
+        self.misses += 1
+        if status == 200:
+            data = json.loads(body)
+            self.put(url, body, headers.get('ETag'), headers.get('Last-Modified'))
+            return data
+        # Errors (401/403/429/5xx) fall back to the stale entry when there is one
+        if entry is not None:
+            return entry.json()
+        return None
+
+    def fetch_json(self, session: requests.Session, url: str, timeout: float = 10) -> Optional[Any]:
+        """
+        Return parsed JSON for a URL, going to the network only when needed
+
+        Fresh entries are served directly. Stale entries are revalidated with
+        If-None-Match / If-Modified-Since when validators exist. In offline mode
+        any stored entry is served and misses return None without a request.
+        A stale entry is also served if the network request fails or returns
+        an error status.
+        """
+        entry, servable = self.lookup(url)
+        if servable:
+            return entry.json()
+        if self.offline:
+            return None
+
+        try:
+            response = session.get(url, timeout=timeout, headers=self.conditional_headers(entry))
+        except requests.RequestException:
+            if entry is not None:
+                return entry.json()
+            raise
+
+        return self.store_response(url, entry, response.status_code, response.content, response.headers)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            entries, size = self._conn.execute(
+                'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses').fetchone()
+        return {
+            'entries': entries,
+            'bytes': size,
+            'hits': self.hits,
+            'misses': self.misses,
+            'revalidated': self.revalidated,
+        }
+
+
+# ============================================================================
+# REQUEST COALESCING
+# ============================================================================
+
+class _Call:
+    """An in-flight call that followers wait on"""
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Coalesce duplicate calls by key (thread-safe)
+
+    Concurrent callers with the same key wait for the first caller's result
+    instead of issuing their own request. Non-None results are kept for
+    `ttl` seconds so back-to-back callers share them too. Shared payloads
+    are the same object for every caller and should be treated as read-only.
+    """
+
+    def __init__(self, ttl: float = 30.0, max_entries: int = 1024):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+        self._recent: 'OrderedDict[str, Tuple[float, Any]]' = OrderedDict()
+
+    def _recent_result(self, key: str):
+        recent = self._recent.get(key)
+        if recent is not None and time.monotonic() - recent[0] < self.ttl:
+            return True, recent[1]
+        return False, None
+
+    def _remember(self, key: str, result: Any):
+        if result is None or self.ttl <= 0:
+            return
+        self._recent[key] = (time.monotonic(), result)
+        self._recent.move_to_end(key)
+        while len(self._recent) > self.max_entries:
+            self._recent.popitem(last=False)
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            found, result = self._recent_result(key)
+            if found:
+                return result
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+                if call.error is None:
+                    self._remember(key, call.result)
+            call.event.set()
+        return call.result
+
+
+class AsyncSingleFlight(SingleFlight):
+    """SingleFlight for coroutines running on one event loop"""
+
+    def __init__(self, ttl: float = 30.0, max_entries: int = 1024):
+        super().__init__(ttl, max_entries)
+        self._tasks: Dict[str, asyncio.Future] = {}
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        found, result = self._recent_result(key)
+        if found:
+            return result
+
+        task = self._tasks.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._tasks[key] = task
+            task.add_done_callback(lambda t: self._finish(key, t))
+        # shield so one cancelled caller does not cancel the shared request
+        return await asyncio.shield(task)
+
+    def _finish(self, key: str, task: asyncio.Future):
+        self._tasks.pop(key, None)
+        if not task.cancelled() and task.exception() is None:
+            self._remember(key, task.result())
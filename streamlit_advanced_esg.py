@@ -7,7 +7,7 @@
 Advanced Streamlit Dashboard for ESG Analysis
 Features:
 - Sector-wise analysis
-- Historical trend simulation
+- Historical trends (stored scoring runs, simulated when none are stored)
 - Portfolio ESG scoring
 - PDF report export
 - Real-time data refresh
@@ -27,6 +27,11 @@ from typing import Dict, List, Optional
 import io
 import base64
 
+try:
+    from esg_results_store import ESGResultsStore, PYARROW_AVAILABLE as RESULTS_STORE_AVAILABLE
+except ImportError:
+    RESULTS_STORE_AVAILABLE = False
+
 # ============================================================================
 # PAGE CONFIGURATION
 # ============================================================================
@@ -288,6 +293,32 @@ def generate_historical_data(symbol: str, periods: int = 12) -> pd.DataFrame:
     return pd.DataFrame(data)
 
 
+@st.cache_data(ttl=300)
+def load_stored_history(symbols: tuple) -> pd.DataFrame:
+    """Stored scoring runs for the symbols (pillar columns only)"""
+    if not RESULTS_STORE_AVAILABLE:
+        return pd.DataFrame()
+    try:
+        return ESGResultsStore().history(
+            list(symbols), columns=['Environmental', 'Social', 'Governance', 'Overall ESG'])
+    except Exception:
+        return pd.DataFrame()
+
+
+def get_historical_data(symbol: str, periods: int = 12) -> pd.DataFrame:
+    """Historical ESG scores from the results store, simulated if fewer than 2 runs are stored"""
+    stored = load_stored_history((symbol,))
+    if len(stored) >= 2:
+        return pd.DataFrame({
+            'Date': stored['run_ts'],
+            'Environmental': stored['Environmental'].round(1),
+            'Social': stored['Social'].round(1),
+            'Governance': stored['Governance'].round(1),
+            'Overall': stored['Overall ESG'].round(1),
+        }).tail(periods).reset_index(drop=True)
+    return generate_historical_data(symbol, periods)
+
+
 def get_risk_color(risk_level: str) -> str:
     """Get color for risk level"""
     colors = {
@@ -716,7 +747,7 @@ def main():
         
         # Historical trend
         st.markdown("### 📈 Historical ESG Trend")
-        historical_df = generate_historical_data(selected_symbol)
+        historical_df = get_historical_data(selected_symbol)
         fig = create_trend_chart(historical_df, company_info['name'])
         st.plotly_chart(fig, use_container_width=True)
         
@@ -910,7 +941,7 @@ def main():
             colors = ['#27ae60', '#3498db', '#9b59b6', '#e74c3c', '#f39c12']
             
             for i, symbol in enumerate(selected_symbols):
-                hist_df = generate_historical_data(symbol)
+                hist_df = get_historical_data(symbol)
                 fig.add_trace(go.Scatter(
                     x=hist_df['Date'],
                     y=hist_df['Overall'],
@@ -935,7 +966,7 @@ def main():
             
             yoy_data = []
             for symbol in selected_symbols:
-                hist_df = generate_historical_data(symbol)
+                hist_df = get_historical_data(symbol)
                 current = hist_df.iloc[-1]['Overall']
                 previous = hist_df.iloc[0]['Overall']
                 change = current - previous
@@ -0,0 +1,106 @@
+import unittest
+
+from brsr_pdf_parser import BRSRPageLocator, EnhancedBRSRParser
+
+
+def annual_report_pages(brsr_start: int = 202, total: int = 230):
+    """Annual report with a contents page listing the BRSR sections at page 1"""
+    pages = ["Acme Industries Limited Annual Report 2023-24"]
+    pages.append(
+        "Contents\n"
+        "Business Responsibility and Sustainability Report 203\n"
+        "Section A: General Disclosures 203\n"
+        "Section B: Management and Process Disclosures 206\n"
+        "Section C: Principle Wise Performance Disclosure 208\n"
+    )
+    pages += [f"Standalone financial statements, note {i}" for i in range(2, brsr_start)]
+    pages += [
+        "Business Responsibility and Sustainability Report\nSECTION A: GENERAL DISCLOSURES\n"
+        "Corporate Identity Number L12345MH1990PLC123456",
+        "Employees and workers",
+        "Turnover: 12,345 Crore",
+        "SECTION B: MANAGEMENT AND PROCESS DISCLOSURES",
+        "Policy and management processes",
+        "SECTION C: PRINCIPLE WISE PERFORMANCE DISCLOSURE\n"
+        "PRINCIPLE 1 Businesses should conduct and govern themselves with integrity\nEssential Indicators",
+        "Essential Indicators",
+        "PRINCIPLE 6 Businesses should respect and make efforts to protect and restore the environment\n"
+        "Essential Indicators",
+        "Leadership Indicators",
+    ]
+    pages += [f"Notice of annual general meeting, page {i}" for i in range(len(pages), total)]
+    return pages
+
+
+class BRSRPageLocatorTest(unittest.TestCase):
+
+    def test_contents_page_does_not_pin_sections(self):
+        section_map = BRSRPageLocator().locate(annual_report_pages())
+
+        self.assertEqual(section_map.brsr, (202, 211))
+        self.assertEqual(section_map.spans['A'], (202, 206))
+        self.assertEqual(section_map.spans['B'], (205, 208))
+        self.assertEqual(section_map.spans['C'], (207, 211))
+        self.assertEqual(section_map.spans['P1'][0], 207)
+        self.assertEqual(section_map.spans['P6'][0], 209)
+
+    def test_standalone_brsr(self):
+        pages = annual_report_pages()[202:211]
+        section_map = BRSRPageLocator().locate(pages)
+
+        self.assertEqual(section_map.brsr, (0, 9))
+        self.assertEqual(section_map.spans['A'], (0, 4))
+
+
+
+class ScopedExtractionTest(unittest.TestCase):
+
+    def parser(self, pages):
+        """Parser holding the located BRSR pages of `pages`, as after extraction"""
+        parser = EnhancedBRSRParser()
+        parser.section_map = BRSRPageLocator().locate(pages)
+        parser.pages = [(num, pages[num], []) for num in parser.section_map.brsr_pages()]
+        return parser
+
+    def extract_counting(self, parser, category, extract):
+        texts = []
+
+        def counted():
+            texts.append(parser.text)
+            return extract()
+
+        return parser._extract_in_scope(category, counted), texts
+
+    def test_located_span_is_searched_once(self):
+        pages = annual_report_pages()
+        pages[208] += "\nNet worth: 777 Crore"    # Section C page, outside Section A
+        parser = self.parser(pages)
+
+        general, texts = self.extract_counting(parser, 'general', parser._extract_general_disclosures)
+
+        self.assertEqual(len(texts), 1)
+        self.assertNotIn("Net worth", texts[0])
+        self.assertEqual(general['turnover'], 12345)
+        self.assertEqual(general['net_worth'], 777)    # per-metric fallback outside the span
+
+    def test_metric_outside_span_found_without_rerun(self):
+        pages = annual_report_pages()
+        pages[209] += "\nBoard met 7 times"         # Principle 6 page, outside the governance span
+        parser = self.parser(pages)
+
+        governance, texts = self.extract_counting(parser, 'governance', parser._extract_governance)
+
+        self.assertEqual(len(texts), 1)
+        self.assertEqual(governance.board_meetings, 7)
+
+    def test_span_with_nothing_reruns_on_all_pages(self):
+        parser = self.parser(annual_report_pages())
+
+        _, texts = self.extract_counting(parser, 'environmental', parser._extract_environmental)
+
+        self.assertEqual(len(texts), 2)
+        self.assertIn("SECTION A", texts[1])
+
+
+if __name__ == '__main__':
+    unittest.main()
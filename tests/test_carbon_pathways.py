@@ -0,0 +1,46 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from carbon_pathways import PathwaySimulator
+
+
+def footprints():
+    """Two companies with fleet and grid electricity in their Scope 1 / Scope 2"""
+    return pd.DataFrame({
+        'scope1_tco2e': [1200.0, 300.0],
+        'scope1_fleet_diesel': [400.0, 0.0],
+        'scope1_fleet_petrol': [100.0, 50.0],
+        'scope2_tco2e': [900.0, 2000.0],
+        'scope2_grid_electricity': [700.0, 2000.0],
+        'scope3_tco2e': [5000.0, 800.0],
+    }, index=['A', 'B'])
+
+
+class PathwayCostTest(unittest.TestCase):
+
+    def simulator(self):
+        unit_costs = {'renewable': 1.0, 'efficiency': 1.0, 'fleet': 1.0}
+        return PathwaySimulator(footprints(), base_year=2024, end_year=2040, target_year=2030,
+                                lever_costs=unit_costs, discount_rate=0.0)
+
+    def test_unit_costs_equal_abated_tonnes(self):
+        simulator = self.simulator()
+        scenarios = PathwaySimulator.scenario_grid(grid_scenarios={'Flat grid': 0.0})
+
+        abated = (simulator.base_emissions[:, None, None] - simulator.project(scenarios)).sum(axis=2)
+        np.testing.assert_allclose(simulator.costs(scenarios) * 1e7, abated, rtol=1e-12, atol=1e-6)
+
+    def test_grid_decarbonization_is_free(self):
+        simulator = self.simulator()
+        scenarios = PathwaySimulator.scenario_grid(grid_scenarios={'Declining grid': 0.05})
+
+        abated = (simulator.base_emissions[:, None, None] - simulator.project(scenarios)).sum(axis=2)
+        grid = simulator.components[:, 2]
+        free = grid[:, None] * (1 - 0.95 ** (simulator.years - simulator.base_year)).sum()
+        np.testing.assert_allclose(simulator.costs(scenarios) * 1e7, abated - free, rtol=1e-12, atol=1e-6)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+import unittest
+
+import numpy as np
+
+from esg_score_calculator import BRSRDataProcessor, ESGCategory, ESGScoreCalculator, METRIC_TRANSFORMS
+
+
+class OfflineFetcher:
+    """NSE fetcher stand-in that fails on any network access"""
+
+    def __getattr__(self, name):
+        raise AssertionError(f"network access: NSEDataFetcher.{name}")
+
+
+class OfflineScoringTest(unittest.TestCase):
+
+    def setUp(self):
+        self.calculator = ESGScoreCalculator()
+        self.calculator.nse_fetcher = OfflineFetcher()
+
+    def test_custom_data_with_industry_skips_fetch(self):
+        data = {'industry': 'IT Services', 'sector': 'Information Technology',
+                'company_name': 'Acme Ltd', 'ltifr': 0.2}
+        profile = self.calculator.calculate_company_esg('ACME', data)
+
+        self.assertEqual(profile.company_name, 'Acme Ltd')
+        self.assertEqual(profile.industry, 'IT Services')
+        social, _ = BRSRDataProcessor.calculate_pillar_scores(data)[ESGCategory.SOCIAL]
+        self.assertEqual(profile.social_score, round(social, 2))
+
+    def test_fetch_info_false(self):
+        profile = self.calculator.calculate_company_esg('ACME', {'ltifr': 0.2}, fetch_info=False)
+
+        self.assertEqual(profile.industry, 'Unknown')
+        self.assertEqual(profile.company_name, 'ACME')
+
+
+
+class BenchmarkRatioTest(unittest.TestCase):
+
+    def test_non_positive_benchmark_scores_neutral(self):
+        ratio = METRIC_TRANSFORMS['benchmark_ratio']
+        scores = ratio(np.array([10.0, 10.0, 10.0, 0.0]), np.array([20.0, 0.0, -5.0, -1.0]), 1.0, 100.0)
+        np.testing.assert_array_equal(scores, [75.0, 50.0, 50.0, 50.0])
+
+    def test_zero_and_negative_benchmark_inputs(self):
+        for benchmark in (0, -10):
+            _, metrics = BRSRDataProcessor.calculate_pillar_scores(
+                {'carbon_emissions_intensity': 30, 'benchmark_carbon': benchmark})[ESGCategory.ENVIRONMENTAL]
+            carbon = next(m for m in metrics if m.name == 'Carbon Emissions Intensity')
+            self.assertEqual(carbon.benchmark, benchmark)
+            self.assertEqual(carbon.score, 50.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+import random
+import unittest
+
+from brsr_pdf_parser import BRSR_METRIC_PATTERNS, EnhancedBRSRParser
+
+
+LABELS = [
+    "Independent Directors:", "Number of independent directors", "Non-executive independent",
+    "Women Directors", "Female directors on the board", "Board meetings held", "Board met",
+    "Audit committee met", "Scope 1:", "Scope 2", "Direct GHG emissions", "Indirect emissions",
+    "LTIFR", "Lost time injury frequency rate", "Fatalities", "Total employees",
+    "Permanent employees", "Total energy consumption", "Renewable energy", "CSR spending",
+]
+VALUES = ["120", "12,345", "4", "0.35", "1,250 tCO2e", "870 MT", "45%", "6 times", "Nil"]
+FILLER = [
+    "Principle 6 Essential Indicators", "Details as per the table below",
+    "12345 independent directors were not appointed", "3 women on the board",
+    "Scope of the report covers standalone operations", "Board of directors",
+]
+
+
+def document(rng: random.Random) -> str:
+    """Labels separated from their values by blank lines, between filler text"""
+    lines = []
+    for _ in range(rng.randint(5, 25)):
+        if rng.random() < 0.3:
+            lines.append(rng.choice(FILLER))
+        label, value = rng.choice(LABELS), rng.choice(VALUES)
+        if rng.random() < 0.5:
+            lines.append(f"{label} {value}")
+        else:
+            lines.append(label)
+            lines.extend([""] * rng.randint(0, 8))
+            lines.append(value)
+    return "\n".join(lines)
+
+
+class MetricPatternParityTest(unittest.TestCase):
+
+    def test_windowed_search_matches_full_text_search(self):
+        rng = random.Random(9)
+        parser = EnhancedBRSRParser()
+        for _ in range(300):
+            parser.text = document(rng)
+            parser._windows = None
+            for key, (_, patterns) in BRSR_METRIC_PATTERNS.items():
+                self.assertEqual(parser._search_metric(key), parser._search_patterns(patterns),
+                                 (key, parser.text))
+
+    def test_value_past_the_keyword_window(self):
+        parser = EnhancedBRSRParser()
+        parser.text = "Independent Directors:\n\n\n\n\n\n120\n\n12345 independent directors"
+        self.assertEqual(parser._search_metric('independent_directors'), 120)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from carbon_sdg_tools import SDGAlignmentMapper, SDGGoal, SDGMetricMapping
+
+
+def reference_alignment(esg_data):
+    """
+    Per-company alignment as computed before the batch implementation
+
+    The one difference: goals are sorted on their score rounded to
+    RANK_DECIMALS. Goals with mathematically equal scores then keep SDGGoal
+    order instead of whatever order the summation noise gives them.
+    """
+    sdg_scores = {goal: 0.0 for goal in SDGGoal}
+    for sdg_map in (SDGMetricMapping.ENVIRONMENTAL_SDG_MAP, SDGMetricMapping.SOCIAL_SDG_MAP,
+                    SDGMetricMapping.GOVERNANCE_SDG_MAP):
+        for metric, sdgs in sdg_map.items():
+            metric_score = esg_data.get(metric, 50) / 100
+            for sdg in sdgs:
+                sdg_scores[sdg] += metric_score * 20
+
+    max_score = max(sdg_scores.values()) if max(sdg_scores.values()) > 0 else 1
+    sdg_scores = {k: min(100, v / max_score * 100) for k, v in sdg_scores.items()}
+    sorted_sdgs = sorted(sdg_scores.items(), key=lambda x: round(x[1], SDGAlignmentMapper.RANK_DECIMALS),
+                         reverse=True)
+    return {
+        'sdg_scores': sdg_scores,
+        'primary_sdgs': [sdg for sdg, score in sorted_sdgs[:3] if score > 50],
+        'secondary_sdgs': [sdg for sdg, score in sorted_sdgs[3:8] if score > 30],
+        'total_sdgs_aligned': len([s for s, v in sdg_scores.items() if v > 30]),
+    }
+
+
+class SDGAlignmentParityTest(unittest.TestCase):
+
+    def test_batch_matches_per_company_ranking(self):
+        rng = np.random.default_rng(11)
+        metrics = list(SDGMetricMapping.metric_map())
+        records = []
+        for _ in range(2000):
+            # A few shared score levels and omitted metrics (scored as 50) make
+            # ties between goals common; float levels give them summation noise
+            levels = [0, 50, 100] + rng.uniform(0, 100, 3).tolist()
+            records.append({metric: levels[rng.integers(len(levels))]
+                            for metric in metrics if rng.random() < 0.7})
+
+        mapper = SDGAlignmentMapper()
+        batch = mapper.assess_sdg_alignment_batch(pd.DataFrame(records))
+        for i, record in enumerate(records):
+            expected = reference_alignment(record)
+            row = batch.iloc[i]
+            primary = [SDGGoal[row[f'Primary SDG {k}']] for k in range(1, 4)
+                       if row[f'Primary SDG {k}'] is not None]
+            secondary = [SDGGoal[row[f'Secondary SDG {k}']] for k in range(1, 6)
+                         if row[f'Secondary SDG {k}'] is not None]
+            self.assertEqual(primary, expected['primary_sdgs'], record)
+            self.assertEqual(secondary, expected['secondary_sdgs'], record)
+            self.assertEqual(row['SDGs Aligned'], expected['total_sdgs_aligned'], record)
+            for goal in SDGGoal:
+                self.assertAlmostEqual(row[goal.name], expected['sdg_scores'][goal], places=9)
+
+    def test_single_company_matches_batch(self):
+        record = {'renewable_energy': 80, 'carbon_emissions': 70, 'transparency': 0}
+        mapper = SDGAlignmentMapper()
+        alignment = mapper.assess_sdg_alignment(record)
+        expected = reference_alignment(record)
+        self.assertEqual(alignment['primary_sdgs'], expected['primary_sdgs'])
+        self.assertEqual(alignment['secondary_sdgs'], expected['secondary_sdgs'])
+
+
+if __name__ == '__main__':
+    unittest.main()